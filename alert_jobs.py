@@ -0,0 +1,101 @@
+"""Price alert evaluation (run after each model load or data refresh).
+
+Usage (from the repository root):
+    python alert_jobs.py evaluate
+    python alert_jobs.py evaluate --commodity pepper --start-date 2025-09-01
+"""
+import argparse
+from datetime import datetime
+from flask import g
+from models import db, PriceAlert, Notification
+from src.models.price_alerts import AlertIndex
+from src.tracing import span, logger
+
+MAX_ALERT_DAYS = 90  # longest window a farmer can subscribe to
+
+
+def evaluate_price_alerts(registry, commodity=None, start_date=None):
+    """Match every active alert against its commodity's forecast in one batch.
+
+    One forecast per commodity, as long as the longest alert window, is shared
+    by all of that commodity's alerts. Triggered alerts are marked and get a
+    Notification, all in one commit. Returns the number triggered.
+    Commodities evaluated here are dropped from the deferred queue, so the
+    load hook firing for a model loaded below does not evaluate them twice.
+    """
+    start_date = (datetime.strptime(start_date, '%Y-%m-%d').date() if isinstance(start_date, str)
+                  else start_date or datetime.now().date())
+    keys = [commodity] if commodity else [c.key for c in registry.available()]
+
+    triggered = 0
+    with span('evaluate_price_alerts', commodities=len(keys)) as s:
+        for key in keys:
+            rows = (db.session.query(PriceAlert.id, PriceAlert.threshold_price, PriceAlert.within_days)
+                    .filter_by(commodity=key, status='active').all())
+            if not rows:
+                continue
+            index = AlertIndex(*zip(*rows))
+            forecast_df = registry.forecaster(key).forecast_prices(days_ahead=index.horizon, start_date=start_date)
+            g.get('pending_alert_commodities', set()).discard(key)
+            matches = index.match(forecast_df)
+            if not matches:
+                continue
+
+            # Re-checked: an alert cancelled or triggered since the read above is left alone
+            alerts = {a.id: a for a in PriceAlert.query.filter(PriceAlert.id.in_([m[0] for m in matches]),
+                                                               PriceAlert.status == 'active')}
+            now = datetime.utcnow()
+            matches = [m for m in matches if m[0] in alerts]
+            for alert_id, date, price in matches:
+                alert = alerts[alert_id]
+                alert.status = 'triggered'
+                alert.triggered_at = now
+                db.session.add(Notification(
+                    user_id=alert.user_id,
+                    alert_id=alert.id,
+                    message=(f"{key.capitalize()} is forecast at ₹{price:.0f}/kg on {date.strftime('%b %d')}, "
+                             f"above your ₹{alert.threshold_price:.0f}/kg alert")
+                ))
+            triggered += len(matches)
+            logger.info("%d of %d %s alerts triggered", len(matches), len(rows), key)
+        db.session.commit()
+        s.set(triggered=triggered)
+    return triggered
+
+
+def defer_evaluation(key):
+    """Queue a commodity for evaluation once the current app context ends (see evaluate_deferred_alerts)"""
+    g.setdefault('pending_alert_commodities', set()).add(key)
+
+
+def evaluate_deferred_alerts(registry):
+    """Evaluate the queued commodities in their own transaction, after the caller's work is done"""
+    pending = g.pop('pending_alert_commodities', set())
+    if not pending:
+        return
+    db.session.rollback()  # whatever the caller left uncommitted is discarded at teardown anyway
+    for key in sorted(pending):
+        try:
+            evaluate_price_alerts(registry, commodity=key)
+        except Exception:
+            db.session.rollback()
+            logger.exception("Deferred %s alert evaluation failed", key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Price alert jobs')
+    commands = parser.add_subparsers(dest='command', required=True)
+    evaluate = commands.add_parser('evaluate', help='match active alerts against the current forecasts')
+    evaluate.add_argument('--commodity', default=None, help='only this commodity (default: all with a model)')
+    evaluate.add_argument('--start-date', default=None, help='forecast from this date (default: today)')
+    args = parser.parse_args()
+
+    from app import create_app, commodities
+    with create_app().app_context():
+        if args.command == 'evaluate':
+            triggered = evaluate_price_alerts(commodities, commodity=args.commodity, start_date=args.start_date)
+            print(f"✅ {triggered} price alerts triggered")
+
+
+if __name__ == '__main__':
+    main()
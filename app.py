@@ -1,45 +1,101 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, has_app_context, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from models import db, User, Pool, PoolMembership, Forecast
+from models import db, User, Pool, PoolMembership, Forecast, upgrade_schema
 from config import Config
+from instrumentation import init_instrumentation, instrument_forecaster
+from identity import init_identity
+from db_routing import init_db_routing
+from sqlite_profile import init_sqlite_profile
+from fragment_cache import init_fragment_cache, seed_versions
+from assets import init_assets
+from forecast_service import create_forecast_service
+from alert_jobs import evaluate_price_alerts, defer_evaluation, evaluate_deferred_alerts
 from datetime import datetime, timedelta
 import json
-from src.models.price_forecaster import CardamomPriceForecaster
+from src.commodities import registry_from_config, DEFAULT_COMMODITY
+from src.models.model_family import family_path
+from src.eda_summary import EDASummaryEngine
+from src.tracing import configure_tracing
 
-# Instantiate and load the forecasting model ONCE
-forecaster = CardamomPriceForecaster('data/processed/clean_auction_data.csv')
-forecaster.load_model('data/models/cardamom_price_model.pkl')
+# Forecaster/cleaner spans are silent while serving unless SPICEHOLD_TRACE_LEVEL is set
+configure_tracing(serving=True)
+
+# Commodity registry: each commodity's model loads on first use, within MODEL_CACHE_MAX_MB.
+# Cardamom is loaded up front and pinned (FORECAST_BACKEND picks the Prophet or NumPy Fourier model file)
+commodities = registry_from_config(Config)
+commodities.pin(DEFAULT_COMMODITY)
+forecaster = commodities.forecaster(DEFAULT_COMMODITY)
+
+# Price alerts are matched in bulk whenever a commodity model is loaded (needs the database, so
+# not for the cardamom load above; create_app evaluates those once the tables exist). The load
+# happens mid-request or mid-job, so evaluation is queued and runs when the app context ends
+@commodities.on_load
+def evaluate_alerts_on_load(key):
+    if has_app_context():
+        defer_evaluation(key)
+
+# Request-time predictions run in a bounded worker pool, each worker with its own model copies
+# (plus the per-auctioneer cardamom family when a bundle has been trained)
+forecast_service = create_forecast_service(commodities, Config, family_path=family_path(Config.FORECAST_BACKEND))
+
+# EDA report for the admin dashboard (built lazily, cached on disk)
+eda_engine = EDASummaryEngine('data/processed/clean_auction_data.csv')
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     
-    # Initialize extensions
+    # Initialize extensions (reads from @read_only views go to the replica when one is configured)
+    init_db_routing(app)
     db.init_app(app)
     
+    # WAL and pragmas on SQLite connections, writes through one serialized writer
+    init_sqlite_profile(app, db)
+
+    # Alerts queued by model loads; registered after db.init_app so it runs before the session is removed
+    app.teardown_appcontext(lambda exc: evaluate_deferred_alerts(commodities))
+
+    # Fingerprinted static assets (immutable, precompressed) and gzip/brotli for HTML/JSON
+    init_assets(app)
+    
+    # Shared template fragments cached on data version counters
+    init_fragment_cache(app)
+    
+    # Per-request timing (wall, SQL, forecaster, templates) exposed at /metrics
+    init_instrumentation(app, db, forecaster)
+    instrument_forecaster(forecast_service, methods=('forecast',))
+    
     # Login manager setup
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     
-    @login_manager.user_loader
-    def load_user(user_id):
-        return User.query.get(int(user_id))
+    # User loader backed by the cross-request identity cache
+    init_identity(login_manager, Config)
     
     # Register blueprints
     from routes.auth import auth_bp
     from routes.dashboard import dashboard_bp
     from routes.forecast import forecast_bp
     from routes.pools import pools_bp
+    from routes.metrics import metrics_bp
+    from routes.alerts import alerts_bp
+    from routes.exports import exports_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(forecast_bp)
     app.register_blueprint(pools_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(alerts_bp)
+    app.register_blueprint(exports_bp)
     
     # Create tables
     with app.app_context():
         db.create_all()
+        upgrade_schema()
+        seed_versions()
+        evaluate_price_alerts(commodities, commodity=DEFAULT_COMMODITY)
         
         # Create demo users if they don't exist
         if not User.query.filter_by(username='raman_kumar').first():
@@ -57,6 +113,11 @@ def create_app():
             
             db.session.commit()
     
+    # Expire full and past-deadline pools in the background so the active set stays small
+    if Config.POOL_MAINTENANCE_INTERVAL_S > 0:
+        from pool_jobs import PoolMaintenanceScheduler
+        app.extensions['pool_maintenance'] = PoolMaintenanceScheduler(app, Config.POOL_MAINTENANCE_INTERVAL_S).start()
+    
     @app.route('/')
     def index():
         if current_user.is_authenticated:
@@ -0,0 +1,108 @@
+import gzip
+import json
+import mimetypes
+import os
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli  # optional: br responses when installed
+except ImportError:
+    brotli = None
+
+# Third-party assets, pinned. build_assets.py vendors them into static/vendor/; until it has been
+# run, asset_url() falls back to these URLs so pages still work
+VENDOR_ASSETS = {
+    'vendor/fonts.css': 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Poppins:wght@400;500;600;700;800&display=swap',
+    'vendor/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/plotly-basic.min.js': 'https://cdn.plot.ly/plotly-basic-2.35.2.min.js',
+    'vendor/tailwind.js': 'https://cdn.tailwindcss.com/3.4.16',
+}
+
+DIST_DIR = 'dist'  # fingerprinted copies (plus .gz/.br variants) under static/
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+COMPRESSIBLE_MIMETYPES = {'text/html', 'application/json'}
+MIN_COMPRESS_BYTES = 500
+
+
+class AssetManifest:
+    """Logical asset names -> fingerprinted files, as written by build_assets.py"""
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self.reload()
+
+    def reload(self):
+        path = os.path.join(self.static_folder, DIST_DIR, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = {}
+
+    def url(self, name):
+        if name in self.entries:
+            return url_for('static', filename=self.entries[name])
+        if name in VENDOR_ASSETS:
+            return VENDOR_ASSETS[name]
+        return url_for('static', filename=name)
+
+
+def _preferred_encoding(available):
+    """Best of `available` ('br', 'gzip') that the client accepts"""
+    for encoding in ('br', 'gzip'):
+        if encoding in available and request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def _serve_static(static_folder, filename):
+    """Static files; fingerprinted ones get immutable caching and their precompressed variant"""
+    if not filename.startswith(f'{DIST_DIR}/'):
+        return send_from_directory(static_folder, filename)
+
+    variants = {'br': '.br', 'gzip': '.gz'}
+    available = [enc for enc, ext in variants.items() if os.path.exists(os.path.join(static_folder, filename + ext))]
+    encoding = _preferred_encoding(available)
+    if encoding:
+        response = send_from_directory(static_folder, filename + variants[encoding],
+                                       mimetype=mimetypes.guess_type(filename)[0])
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(static_folder, filename)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+def compress_response(response):
+    """gzip/brotli for HTML and JSON bodies (streamed and already-encoded responses pass through)"""
+    if (response.direct_passthrough or response.is_streamed or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    encoding = _preferred_encoding(['br', 'gzip'] if brotli else ['gzip'])
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=5))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=6))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_assets(app):
+    manifest = AssetManifest(app.static_folder)
+    app.jinja_env.globals['asset_url'] = manifest.url
+    app.view_functions['static'] = lambda filename: _serve_static(app.static_folder, filename)
+    app.after_request(compress_response)
+    return manifest
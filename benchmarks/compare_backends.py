@@ -0,0 +1,111 @@
+"""Side-by-side accuracy and latency of the forecasting backends.
+
+Each backend is fitted on the same chronological 80/20 split. Accuracy comes
+from CardamomPriceForecaster.validate_model (MAE/RMSE/MAPE/R²). Latency is
+measured for the import, the fit, a 30-day forecast and a sell recommendation.
+
+Usage (from the repository root):
+    python benchmarks/compare_backends.py
+    python benchmarks/compare_backends.py --backends fourier --repeat 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.run_benchmarks import time_call
+from src.models.price_forecaster import CardamomPriceForecaster, FORECAST_BACKENDS
+
+DEFAULT_DATA = os.path.join(REPO_ROOT, 'data', 'processed', 'clean_auction_data.csv')
+DEFAULT_RESULTS = os.path.join(REPO_ROOT, 'benchmarks', 'results', 'backends.json')
+
+IMPORT_STATEMENTS = {
+    'prophet': 'from prophet import Prophet',
+    'fourier': 'from src.models.fourier_backend import FourierTrendModel',
+}
+
+
+def import_seconds(backend):
+    """Cold import time of the backend's engine, measured in a fresh interpreter"""
+    code = f"import time; t = time.perf_counter(); {IMPORT_STATEMENTS[backend]}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def benchmark_backend(backend, data_path, repeat):
+    forecaster = CardamomPriceForecaster(data_path, backend=backend)
+    data = forecaster.load_and_prepare_data()
+    train_data, test_data = forecaster.split_data(data)
+
+    start = time.perf_counter()
+    forecaster._fit(train_data)
+    fit_seconds = time.perf_counter() - start
+
+    metrics = forecaster.validate_model(test_data)
+    start_date = test_data['ds'].iloc[0]
+    return {
+        'import_seconds': import_seconds(backend),
+        'fit_seconds': fit_seconds,
+        'mae': float(metrics['mae']),
+        'rmse': float(metrics['rmse']),
+        'mape': float(metrics['mape']),
+        'r2': float(metrics['r2']),
+        'forecast_prices': time_call(lambda: forecaster.forecast_prices(days_ahead=30, start_date=start_date), repeat),
+        'get_sell_recommendation': time_call(
+            lambda: forecaster.get_sell_recommendation(days_ahead=30, start_date=start_date), repeat),
+    }
+
+
+def print_table(results):
+    backends = list(results)
+    rows = [
+        ('import (s)', lambda r: f"{r['import_seconds']:.2f}"),
+        ('fit (s)', lambda r: f"{r['fit_seconds']:.3f}"),
+        ('MAE (₹/kg)', lambda r: f"{r['mae']:.2f}"),
+        ('RMSE (₹/kg)', lambda r: f"{r['rmse']:.2f}"),
+        ('MAPE (%)', lambda r: f"{r['mape']:.2f}"),
+        ('R²', lambda r: f"{r['r2']:.3f}"),
+        ('forecast p50 (ms)', lambda r: f"{r['forecast_prices']['median_ms']:.2f}"),
+        ('recommend p50 (ms)', lambda r: f"{r['get_sell_recommendation']['median_ms']:.2f}"),
+    ]
+    print(f"{'':<20}" + ''.join(f"{b:>12}" for b in backends))
+    for label, fmt in rows:
+        print(f"{label:<20}" + ''.join(f"{fmt(results[b]):>12}" for b in backends))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare forecasting backends')
+    parser.add_argument('--backends', nargs='+', choices=FORECAST_BACKENDS, default=list(FORECAST_BACKENDS))
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', default=DEFAULT_RESULTS)
+    args = parser.parse_args()
+
+    data_path = os.path.abspath(args.data)
+    output = os.path.abspath(args.output)
+    results = {}
+    # validate_model writes its prediction CSV to the working directory; keep it out of the repo
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for backend in args.backends:
+            print(f"⏱️  Benchmarking {backend} backend...")
+            results[backend] = benchmark_backend(backend, data_path, args.repeat)
+        os.chdir(REPO_ROOT)
+
+    print()
+    print_table(results)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
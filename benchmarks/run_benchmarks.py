@@ -0,0 +1,288 @@
+"""End-to-end benchmarks for the SpiceHold forecast, pool and data pipeline hot paths.
+
+Seeds a synthetic database and auction history, times each hot path and writes
+the results as JSON. When a baseline file exists, every benchmark is compared
+against it and regressions beyond the tolerance make the run exit non-zero.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(REPO_ROOT, 'benchmarks', 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baseline.json')
+
+PROFILES = {
+    'full': {'users': 5000, 'pools': 1000, 'memberships': 50000, 'forecasts': 2000000, 'years': 40},
+    'quick': {'users': 500, 'pools': 100, 'memberships': 5000, 'forecasts': 50000, 'years': 10},
+}
+
+AUCTIONEERS = [
+    "South Indian Green Cardamom Company Ltd, Kochi",
+    "IDUKKI Dist.TRADITIONAL CARDAMOM PRODUCER COMPANY Ltd",
+    "The Cardamom Processing & Marketing Co-Operative Society Ltd, Kumily",
+    "Header Systems (India) Ltd, Kochi",
+    "Cardamom Planters' Marketing Co-Operative Society Ltd, Nedumkandam",
+    "Green House Cardamom Mktg. India Pvt Ltd",
+]
+
+
+def time_call(fn, repeat, warmup=1):
+    """Run fn repeatedly and return timing statistics in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'runs': repeat,
+        'min_ms': samples[0],
+        'median_ms': statistics.median(samples),
+        'mean_ms': statistics.fmean(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+    }
+
+
+# ---------------------------------------------------------------- synthetic data
+
+def write_synthetic_auctions(path, years, seed=7):
+    """Raw auction CSV in the Spices Board format, a few auctions per day for `years` years"""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(end=pd.Timestamp('2025-08-22'), periods=int(years * 365.25), freq='D')
+    days = days[days.dayofweek != 6]
+    n = len(days) * 2
+    dates = np.repeat(days, 2)
+
+    t = np.arange(n) / 730.0
+    trend = 900 + 60 * t + 400 * np.sin(t / 3.0)
+    seasonal = 150 * np.sin(2 * np.pi * np.asarray(dates.dayofyear) / 365.25)
+    avg_price = np.clip(trend + seasonal + rng.normal(0, 80, n), 300, None)
+    arrived = rng.gamma(6, 10000, n)
+    sold = arrived * rng.uniform(0.85, 1.0, n)
+
+    # Sprinkle in the data quality problems the cleaner handles
+    avg_price[rng.choice(n, n // 500, replace=False)] = 0
+    max_price = avg_price * rng.uniform(1.1, 1.4, n)
+    max_price[rng.choice(n, n // 400, replace=False)] = 9000
+
+    pd.DataFrame({
+        'Date of Auction': dates.strftime('%d-%m-%Y'),
+        'Auctioneer': rng.choice(AUCTIONEERS, n),
+        'No.of Lots': rng.integers(100, 500, n),
+        'Total Qty Arrived (Kgs)': arrived.round(1),
+        'Qty Sold (Kgs)': sold.round(1),
+        'MaxPrice (Rs./Kg)': max_price.round(0),
+        'Avg.Price (Rs./Kg)': avg_price.round(2),
+    }).iloc[::-1].to_csv(path, index=False)
+    return n
+
+
+def seed_database(app, sizes, seed=11):
+    """Bulk insert users, pools, memberships and forecasts with executemany batches"""
+    from models import db, User, Pool, PoolMembership, Forecast
+    from werkzeug.security import generate_password_hash
+
+    rng = np.random.default_rng(seed)
+    password_hash = generate_password_hash('password123')
+    now = datetime.utcnow()
+    batch = 50000
+
+    def insert(model, rows):
+        for i in range(0, len(rows), batch):
+            db.session.execute(db.insert(model), rows[i:i + batch])
+
+    with app.app_context():
+        first_user = db.session.query(db.func.max(User.id)).scalar() or 0
+        insert(User, [{
+            'username': f'bench_farmer_{i}', 'email': f'bench{i}@spicehold.test',
+            'name': f'Bench Farmer {i}', 'password_hash': password_hash,
+            'location': 'Kumily', 'farm_size': 2.0, 'role': 'user', 'created_at': now,
+        } for i in range(sizes['users'])])
+        user_ids = np.arange(first_user + 1, first_user + 1 + sizes['users'])
+        admin_id = User.query.filter_by(username='admin').first().id
+
+        pool_target = rng.integers(5000, 50000, sizes['pools'])
+        insert(Pool, [{
+            'name': f'Bench Pool {i}', 'target_quantity': int(pool_target[i]), 'current_quantity': 0,
+            'target_price': float(rng.uniform(2500, 3500)), 'status': 'active',
+            'deadline': date.today() + timedelta(days=int(rng.integers(1, 120))),
+            'creator_id': admin_id, 'created_at': now,
+        } for i in range(sizes['pools'])])
+        pool_ids = np.array([p for (p,) in db.session.query(Pool.id).order_by(Pool.id).all()])[-sizes['pools']:]
+
+        # Unique (user, pool) pairs; contributions stay within each pool's target
+        pairs = rng.choice(len(user_ids) * len(pool_ids), size=min(sizes['memberships'], len(user_ids) * len(pool_ids)), replace=False)
+        m_users, m_pools = user_ids[pairs // len(pool_ids)], pool_ids[pairs % len(pool_ids)]
+        quantities = rng.integers(1, 20, len(pairs))
+        insert(PoolMembership, [{
+            'user_id': int(u), 'pool_id': int(p), 'quantity_contributed': int(q),
+            'join_date': date.today(), 'status': 'active',
+        } for u, p, q in zip(m_users, m_pools, quantities)])
+        totals = pd.Series(quantities).groupby(m_pools).sum()
+        db.session.execute(db.update(Pool), [
+            {'id': int(p), 'current_quantity': int(q)} for p, q in totals.items()
+        ])
+
+        n = sizes['forecasts']
+        f_users = rng.choice(user_ids, n)
+        current = rng.uniform(2000, 3000, n)
+        optimal = current + rng.uniform(-50, 200, n)
+        offsets = rng.integers(0, 3 * 365 * 24 * 3600, n)
+        for i in range(0, n, batch):
+            sl = slice(i, i + batch)
+            db.session.execute(db.insert(Forecast), [{
+                'user_id': int(u), 'forecast_date': date.today(),
+                'current_price': float(c), 'optimal_price': float(o),
+                'action': 'HOLD' if o - c > 50 else 'SELL', 'potential_gain': float(o - c),
+                'created_at': now - timedelta(seconds=int(s)),
+            } for u, c, o, s in zip(f_users[sl], current[sl], optimal[sl], offsets[sl])])
+        db.session.commit()
+
+
+# ------------------------------------------------------------------- benchmarks
+
+def run(args):
+    sizes = dict(PROFILES['quick' if args.quick else 'full'])
+    for name in sizes:
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+
+    workdir = tempfile.mkdtemp(prefix='spicehold-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, REPO_ROOT)
+
+    results = {}
+
+    def record(name, fn, repeat):
+        print(f"⏱️  {name}...")
+        results[name] = time_call(fn, repeat)
+        print(f"   median {results[name]['median_ms']:.1f} ms")
+
+    # Data pipeline on a synthetic multi-decade history
+    from src.data_processing.data_cleaner import CardamomDataCleaner
+    from src.data_processing.feature_engineer import PriceFeatureEngineer
+
+    raw_path = os.path.join(workdir, 'auctions.csv')
+    auction_rows = write_synthetic_auctions(raw_path, sizes['years'])
+    cleaner = CardamomDataCleaner(raw_path)
+    clean = cleaner.process_data()
+    record('cleaner.process_data', cleaner.process_data, args.repeat_pipeline)
+    record('feature_engineer.create_ml_features',
+           lambda: PriceFeatureEngineer(clean).create_ml_features(), args.repeat_pipeline)
+
+    # Forecaster (loads the production model once, as app.py does)
+    from app import create_app, forecaster
+    start_date = '2025-09-01'
+    record('forecaster.forecast_prices',
+           lambda: forecaster.forecast_prices(days_ahead=30, start_date=start_date), args.repeat)
+    record('forecaster.get_sell_recommendation',
+           lambda: forecaster.get_sell_recommendation(days_ahead=30, start_date=start_date), args.repeat)
+
+    # Routes through the Flask test client against the seeded database
+    app = create_app()
+    seed_start = time.perf_counter()
+    seed_database(app, sizes)
+    seed_seconds = time.perf_counter() - seed_start
+
+    farmer = app.test_client()
+    farmer.post('/login', data={'username': 'bench_farmer_0', 'password': 'password123'})
+    admin = app.test_client()
+    admin.post('/login', data={'username': 'admin', 'password': 'password123'})
+    form = {'harvest_date': '2025-08-01', 'quantity': '100',
+            'storage_quality': 'Good (Covered, Dry)', 'forecast_from_date': start_date}
+
+    def check(response):
+        if response.status_code != 200:
+            raise RuntimeError(f'Unexpected status {response.status_code}')
+
+    record('route.GET /forecast', lambda: check(farmer.get('/forecast')), args.repeat)
+    record('route.POST /forecast', lambda: check(farmer.post('/forecast', data=form)), args.repeat)
+    record('route.GET /pools', lambda: check(farmer.get('/pools')), args.repeat)
+    record('route.GET /dashboard (farmer)', lambda: check(farmer.get('/dashboard')), args.repeat)
+    record('route.GET /dashboard (admin)', lambda: check(admin.get('/dashboard')), args.repeat)
+
+    return {
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': sizes,
+        'auction_rows': auction_rows,
+        'seed_seconds': seed_seconds,
+        'benchmarks': results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """List of (name, baseline_ms, current_ms, ratio) for benchmarks slower than tolerance allows"""
+    regressions = []
+    print("\n📊 Comparison against baseline (median):")
+    for name, stats in current['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if base is None:
+            print(f"   {name}: {stats['median_ms']:.1f} ms (new)")
+            continue
+        ratio = stats['median_ms'] / base['median_ms'] if base['median_ms'] else float('inf')
+        flag = '🔥 REGRESSION' if ratio > 1 + tolerance else '✅'
+        print(f"   {name}: {base['median_ms']:.1f} → {stats['median_ms']:.1f} ms ({ratio:.2f}x) {flag}")
+        if ratio > 1 + tolerance:
+            regressions.append((name, base['median_ms'], stats['median_ms'], ratio))
+    if current.get('sizes') != baseline.get('sizes'):
+        print("   ⚠️  Baseline was recorded with different data sizes")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SpiceHold end-to-end benchmarks')
+    parser.add_argument('--quick', action='store_true', help='Small data sizes for a fast smoke run')
+    for name in PROFILES['full']:
+        parser.add_argument(f'--{name}', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--repeat-pipeline', type=int, default=3)
+    parser.add_argument('--output', default=DEFAULT_RESULTS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help='Allowed slowdown versus baseline before flagging a regression')
+    args = parser.parse_args()
+
+    current = run(args)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
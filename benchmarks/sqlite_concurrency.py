@@ -0,0 +1,216 @@
+"""Concurrent write/read throughput of SQLite with and without the production profile.
+
+Each profile gets a fresh database. Several worker processes, each with a few
+threads, then run the same mix as the app under load: forecast inserts, pool
+joins (membership insert plus pool update) and pool list reads, one
+transaction per operation. Reports throughput, write latency and how many
+operations failed with "database is locked", then checks that every pool's
+current_quantity still equals the sum of its memberships (exit status 1 if
+any join was lost).
+
+Usage (from the repository root):
+    python benchmarks/sqlite_concurrency.py
+    python benchmarks/sqlite_concurrency.py --processes 8 --threads 4 --ops 300
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(REPO_ROOT, 'benchmarks', 'results', 'sqlite_concurrency.json')
+PROFILES = ['off', 'production']
+MIX = [('forecast_insert', 0.4), ('pool_join', 0.3), ('pool_list', 0.3)]
+
+
+def seed(app, users, pools):
+    from models import db, User, Pool
+    with app.app_context():
+        db.session.execute(db.insert(User), [{
+            'username': f'conc_farmer_{i}', 'email': f'conc{i}@spicehold.test', 'name': f'Farmer {i}',
+            'password_hash': 'x', 'role': 'user'} for i in range(users)])
+        admin_id = User.query.filter_by(username='admin').first().id
+        db.session.execute(db.insert(Pool), [{
+            'name': f'Concurrency Pool {i}', 'target_quantity': 10 ** 9, 'current_quantity': 0,
+            'target_price': 3000.0, 'status': 'active', 'deadline': date.today() + timedelta(days=60),
+            'creator_id': admin_id} for i in range(pools)])
+        db.session.commit()
+        user_ids = [u for (u,) in db.session.query(User.id).filter(User.username.like('conc_farmer_%'))]
+        pool_ids = [p for (p,) in db.session.query(Pool.id).filter(Pool.name.like('Concurrency Pool %'))]
+    return user_ids, pool_ids
+
+
+def operation(app, kind, user_id, pool_id):
+    from sqlalchemy import update
+    from models import db, Forecast, Pool, PoolMembership
+    with app.app_context():
+        try:
+            if kind == 'forecast_insert':
+                db.session.add(Forecast(user_id=user_id, forecast_date=date.today(), current_price=2500.0,
+                                        optimal_price=2600.0, action='HOLD', potential_gain=100.0))
+            elif kind == 'pool_join':
+                # Same guarded UPDATE as the /pools/join route
+                table = Pool.__table__
+                db.session.execute(update(table).where(table.c.id == pool_id,
+                                                       table.c.current_quantity + 5 <= table.c.target_quantity)
+                                   .values(current_quantity=table.c.current_quantity + 5))
+                db.session.add(PoolMembership(user_id=user_id, pool_id=pool_id, quantity_contributed=5))
+            else:
+                Pool.query.filter_by(status='active').order_by(Pool.deadline, Pool.id).limit(20).all()
+            db.session.commit()
+        finally:
+            db.session.remove()
+
+
+def worker(app, user_ids, pool_ids, threads, ops, seed_value, queue):
+    """One process: `threads` threads each running `ops` operations; sends back latencies and errors"""
+    from sqlalchemy.exc import OperationalError
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=False)  # fresh connections in this process
+    latencies = {kind: [] for kind, _ in MIX}
+    errors = {kind: 0 for kind, _ in MIX}
+    lock = threading.Lock()
+    kinds, weights = zip(*MIX)
+
+    def run(thread_seed):
+        rng = random.Random(thread_seed)
+        for _ in range(ops):
+            kind = rng.choices(kinds, weights)[0]
+            start = time.perf_counter()
+            try:
+                operation(app, kind, rng.choice(user_ids), rng.choice(pool_ids))
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies[kind].append(elapsed * 1000)
+            except OperationalError:
+                with lock:
+                    errors[kind] += 1
+
+    pool = [threading.Thread(target=run, args=(seed_value * 100 + i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    queue.put((latencies, errors))
+
+
+def lost_updates(app):
+    """Pools whose current_quantity differs from the sum of their memberships: {pool_id: (stored, summed)}"""
+    from sqlalchemy import func
+    from models import db, Pool, PoolMembership
+    with app.app_context():
+        summed = dict(db.session.query(PoolMembership.pool_id, func.sum(PoolMembership.quantity_contributed))
+                      .group_by(PoolMembership.pool_id))
+        return {pool_id: (stored, summed.get(pool_id, 0))
+                for pool_id, stored in db.session.query(Pool.id, Pool.current_quantity)
+                    .filter(Pool.name.like('Concurrency Pool %'))
+                if stored != summed.get(pool_id, 0)}
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))] if samples else None
+
+
+def run_profile(args):
+    """Child process: one profile on a fresh database, result JSON written to args.result_file"""
+    workdir = tempfile.mkdtemp(prefix='spicehold-sqlite-')
+    os.environ.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, 'bench.db'),
+        'SQLITE_PROFILE': args.profile,
+        'FORECAST_WORKERS': '0',
+        'POOL_MAINTENANCE_INTERVAL_S': '0',
+        'FORECAST_SHARED_CACHE_PATH': '',
+    })
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, REPO_ROOT)
+    from app import create_app
+
+    app = create_app()
+    user_ids, pool_ids = seed(app, args.users, args.pools)
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    processes = [context.Process(target=worker, args=(app, user_ids, pool_ids, args.threads, args.ops, i, queue))
+                 for i in range(args.processes)]
+
+    start = time.perf_counter()
+    for p in processes:
+        p.start()
+    outcomes = [queue.get() for _ in processes]
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    result = {'profile': args.profile, 'seconds': elapsed, 'operations': {}}
+    completed = 0
+    for kind, _ in MIX:
+        samples = sorted(ms for latencies, _ in outcomes for ms in latencies[kind])
+        failed = sum(errors[kind] for _, errors in outcomes)
+        completed += len(samples)
+        result['operations'][kind] = {
+            'completed': len(samples), 'locked_errors': failed,
+            'median_ms': statistics.median(samples) if samples else None,
+            'p95_ms': percentile(samples, 0.95), 'max_ms': samples[-1] if samples else None,
+        }
+    result['throughput_ops_s'] = completed / elapsed
+    result['inconsistent_pools'] = {str(pool_id): counts for pool_id, counts in lost_updates(app).items()}
+    with open(args.result_file, 'w') as f:
+        json.dump(result, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite concurrency benchmark (stock settings vs production profile)')
+    parser.add_argument('--processes', type=int, default=4, help='worker processes (like gunicorn workers)')
+    parser.add_argument('--threads', type=int, default=4, help='threads per worker process')
+    parser.add_argument('--ops', type=int, default=200, help='operations per thread')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--pools', type=int, default=50)
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=PROFILES)
+    parser.add_argument('--output', default=DEFAULT_RESULTS)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args)
+        return
+
+    results = {}
+    for profile in args.profiles:
+        print(f"⏱️  SQLite profile '{profile}': {args.processes} processes x {args.threads} threads x {args.ops} ops...")
+        with tempfile.NamedTemporaryFile(suffix='.json') as result_file:
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--profile', profile,
+                            '--result-file', result_file.name, '--processes', str(args.processes),
+                            '--threads', str(args.threads), '--ops', str(args.ops), '--users', str(args.users),
+                            '--pools', str(args.pools)],
+                           cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+            with open(result_file.name) as f:
+                results[profile] = json.load(f)
+
+        result = results[profile]
+        print(f"   {result['throughput_ops_s']:.0f} ops/s over {result['seconds']:.1f} s")
+        for kind, stats in result['operations'].items():
+            latency = f"median {stats['median_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms" if stats['completed'] else 'no successes'
+            print(f"   {kind}: {stats['completed']} ok, {stats['locked_errors']} locked, {latency}")
+        if result['inconsistent_pools']:
+            print(f"   ❌ {len(result['inconsistent_pools'])} pools lost updates "
+                  f"(current_quantity != sum of memberships)")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    if any(result['inconsistent_pools'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Vendor, fingerprint and precompress static assets.
+
+    python build_assets.py --vendor   # download the pinned third-party assets into static/vendor/
+    python build_assets.py            # rebuild static/dist/ from static/vendor/
+
+Every file under static/vendor/ is copied to static/dist/ with a content hash in
+its name (CSS url() references are rewritten to the hashed names), plus .gz
+and, when the brotli package is installed, .br variants of text files. The
+app serves static/dist/ with immutable cache headers (see assets.py).
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import urllib.request
+from assets import VENDOR_ASSETS, DIST_DIR, MANIFEST_NAME, brotli
+
+STATIC_DIR = 'static'
+SOURCE_DIRS = ('vendor',)
+TEXT_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt')
+# Google Fonts serves woff2 only to browsers it recognises
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+CSS_URL = re.compile(r'url\((["\']?)([^)"\']+)\1\)')
+
+
+def download(url):
+    req = urllib.request.Request(url, headers={'User-Agent': BROWSER_USER_AGENT})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return response.read()
+
+
+def vendor_assets():
+    """Fetch the pinned assets; font files referenced by CSS are fetched alongside"""
+    for name, url in VENDOR_ASSETS.items():
+        path = os.path.join(STATIC_DIR, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content = download(url)
+
+        if name.endswith('.css'):
+            css = content.decode('utf-8')
+            font_dir = os.path.join(os.path.dirname(path), 'fonts')
+            for _, font_url in set(CSS_URL.findall(css)):
+                if not font_url.startswith('http'):
+                    continue
+                font_name = hashlib.sha256(font_url.encode()).hexdigest()[:16] + os.path.splitext(font_url)[1]
+                os.makedirs(font_dir, exist_ok=True)
+                with open(os.path.join(font_dir, font_name), 'wb') as f:
+                    f.write(download(font_url))
+                css = css.replace(font_url, f'fonts/{font_name}')
+            content = css.encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(content)
+        print(f"📥 {name} ({len(content) / 1024:.0f} KB)")
+
+
+def fingerprinted(path, content):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:10]}{ext}"
+
+
+def build_dist():
+    """Hash every source file into static/dist/ and write the manifest; returns it"""
+    dist_root = os.path.join(STATIC_DIR, DIST_DIR)
+    shutil.rmtree(dist_root, ignore_errors=True)
+
+    sources = []
+    for source_dir in SOURCE_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(STATIC_DIR, source_dir)):
+            for filename in filenames:
+                sources.append(os.path.relpath(os.path.join(dirpath, filename), STATIC_DIR).replace(os.sep, '/'))
+
+    # CSS last, so its url() references can point at already-hashed files
+    manifest = {}
+    for name in sorted(sources, key=lambda n: n.endswith('.css')):
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            content = f.read()
+        if name.endswith('.css'):
+            css = content.decode('utf-8')
+            base = os.path.dirname(name)
+            for _, ref in set(CSS_URL.findall(css)):
+                target = os.path.normpath(os.path.join(base, ref)).replace(os.sep, '/')
+                if target in manifest:
+                    hashed_ref = os.path.relpath(manifest[target], os.path.join(DIST_DIR, base)).replace(os.sep, '/')
+                    css = css.replace(ref, hashed_ref)
+            content = css.encode('utf-8')
+
+        output = fingerprinted(f"{DIST_DIR}/{name}", content)
+        output_path = os.path.join(STATIC_DIR, output)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        if name.endswith(TEXT_EXTENSIONS):
+            with open(output_path + '.gz', 'wb') as f:
+                f.write(gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli:
+                with open(output_path + '.br', 'wb') as f:
+                    f.write(brotli.compress(content, quality=11))
+        manifest[name] = output
+
+    with open(os.path.join(dist_root, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vendor, fingerprint and precompress static assets')
+    parser.add_argument('--vendor', action='store_true', help='download the pinned third-party assets first')
+    args = parser.parse_args()
+
+    if args.vendor:
+        vendor_assets()
+    manifest = build_dist()
+    print(f"✅ {len(manifest)} assets fingerprinted into {STATIC_DIR}/{DIST_DIR}/"
+          f"{'' if brotli else ' (gzip only; install brotli for .br variants)'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,3 +4,45 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'spicehold-secret-key-2025'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///spicehold.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # SQLite deployment profile (sqlite_profile.py): WAL, busy timeout, synchronous=NORMAL, mmap and a
+    # single serialized writer. 'off' keeps SQLite's stock settings (e.g. for the concurrency benchmark)
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_MB = int(os.environ.get('SQLITE_MMAP_MB', 256))
+
+    # Optional read replica for @read_only views (see db_routing.py); after writing, a user reads
+    # from the primary for READ_YOUR_WRITES_S seconds so replication lag never hides their changes
+    SQLALCHEMY_READ_REPLICA_URI = os.environ.get('READ_REPLICA_URL')
+    READ_YOUR_WRITES_S = float(os.environ.get('READ_YOUR_WRITES_S', 10))
+    
+    # Requests slower than this (ms) are logged with a timing breakdown; None disables
+    SLOW_REQUEST_LOG_MS = float(os.environ['SLOW_REQUEST_LOG_MS']) if os.environ.get('SLOW_REQUEST_LOG_MS') else None
+
+    # Forecast worker pool: processes (0 = run inline), max distinct queued predictions, wait limit (s)
+    FORECAST_WORKERS = int(os.environ.get('FORECAST_WORKERS', 2))
+    FORECAST_MAX_PENDING = int(os.environ.get('FORECAST_MAX_PENDING', 8))
+    FORECAST_TIMEOUT_S = float(os.environ.get('FORECAST_TIMEOUT_S', 10))
+
+    # Forecast windows shared by all app processes on the host, keyed by model fingerprint ('' = off)
+    FORECAST_SHARED_CACHE_PATH = os.environ.get('FORECAST_SHARED_CACHE_PATH', 'data/cache/forecast_windows.sqlite')
+    FORECAST_SHARED_CACHE_MB = float(os.environ.get('FORECAST_SHARED_CACHE_MB', 64))
+
+    # Forecasting engine: 'prophet' or the lightweight NumPy 'fourier' backend
+    FORECAST_BACKEND = os.environ.get('FORECAST_BACKEND', 'prophet')
+
+    # Per-auctioneer models kept unpickled at once (per process); the rest load on demand
+    MODEL_FAMILY_MAX_LOADED = int(os.environ.get('MODEL_FAMILY_MAX_LOADED', 4))
+
+    # Commodity models resident per process before the least recently used are evicted (artifact MB)
+    MODEL_CACHE_MAX_MB = float(os.environ.get('MODEL_CACHE_MAX_MB', 256))
+
+    # Monte Carlo price paths per hold-vs-sell simulation on /forecast
+    SIMULATION_PATHS = int(os.environ.get('SIMULATION_PATHS', 5000))
+
+    # Seconds between in-process pool expiry runs. Off by default: every create_app() (each gunicorn
+    # worker, every CLI) would start its own scheduler; run `python pool_jobs.py expire` from cron instead
+    POOL_MAINTENANCE_INTERVAL_S = float(os.environ.get('POOL_MAINTENANCE_INTERVAL_S', 0))
+
+    # Logged-in user rows are cached across requests for this long (s); any User write (any process) invalidates them
+    IDENTITY_CACHE_TTL_S = float(os.environ.get('IDENTITY_CACHE_TTL_S', 300))
@@ -0,0 +1,101 @@
+"""Read/write splitting between the primary database and an optional read replica.
+
+With READ_REPLICA_URL set, GET/HEAD requests to views marked @read_only run
+their SELECTs on the replica; flushes and INSERT/UPDATE/DELETE statements
+always go to the primary. A request that writes stamps the user's session,
+and for READ_YOUR_WRITES_S afterwards that user reads from the primary, so
+their own changes are never hidden by replication lag.
+
+Writes must go through the ORM or DML constructs (insert/update/delete);
+a raw text() statement is treated as a read.
+
+To try it locally with two SQLite files, copy the primary to the replica:
+    READ_REPLICA_URL=sqlite:///spicehold_replica.db python db_routing.py sync
+"""
+import time
+from contextlib import contextmanager
+from flask import g, has_app_context, request, session
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """db.session class: replica for reads while routing is on, primary for everything else"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and REPLICA_BIND in self._db.engines:
+            if self._flushing or getattr(clause, 'is_dml', False):
+                g.db_wrote = True
+            elif g.get('db_replica'):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def replica_reads():
+    """Route this block's reads to the replica (for jobs and CLIs outside read-only views)"""
+    previous = g.get('db_replica', False)
+    g.db_replica = True
+    try:
+        yield
+    finally:
+        g.db_replica = previous
+
+
+def replica_enabled(app):
+    return bool(app.config.get('SQLALCHEMY_READ_REPLICA_URI'))
+
+
+def init_db_routing(app):
+    """Register the replica bind (call before db.init_app) and the per-request routing hooks"""
+    if not replica_enabled(app):
+        return
+    app.config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = app.config['SQLALCHEMY_READ_REPLICA_URI']
+    sticky_s = app.config.get('READ_YOUR_WRITES_S', 10)
+
+    @app.before_request
+    def _route_reads():
+        view = app.view_functions.get(request.endpoint)
+        g.db_replica = (request.method in ('GET', 'HEAD') and getattr(view, 'read_only', False)
+                        and time.time() - session.get('db_wrote_at', 0) > sticky_s)
+
+    @app.after_request
+    def _stick_after_write(response):
+        if g.get('db_wrote'):
+            session['db_wrote_at'] = time.time()
+        return response
+
+
+def sync_sqlite_replica(primary, replica):
+    """Copy a SQLite primary onto a SQLite replica with the online backup API"""
+    source = primary.raw_connection()
+    target = replica.raw_connection()
+    try:
+        source.driver_connection.backup(target.driver_connection)
+    finally:
+        source.close()
+        target.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Read replica helpers')
+    parser.add_argument('command', choices=['sync'], help='copy the SQLite primary onto the SQLite replica')
+    parser.parse_args()
+
+    from app import create_app
+    from models import db
+    app = create_app()
+    if not replica_enabled(app):
+        raise SystemExit("❌ READ_REPLICA_URL is not set")
+    with app.app_context():
+        primary, replica = db.engines[None], db.engines[REPLICA_BIND]
+        if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            raise SystemExit("❌ sync only copies SQLite files; use the database's own replication otherwise")
+        sync_sqlite_replica(primary, replica)
+    print(f"✅ Replica {replica.url.database} synced from {primary.url.database}")
+
+
+if __name__ == '__main__':
+    main()
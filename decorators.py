@@ -10,3 +10,8 @@ def admin_required(f):
             abort(403)  # Forbidden
         return f(*args, **kwargs)
     return decorated_function
+
+def read_only(f):
+    """Mark a view as read-only: its GET requests may be served from the read replica"""
+    f.read_only = True
+    return f
@@ -1,15 +1,23 @@
 from src.models.price_forecaster import CardamomPriceForecaster
+from src.pipeline_cache import add_cache_arguments, cache_from_args
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import pandas as pd
 import numpy as np
+import argparse
+from src.tracing import configure_tracing
 
-def comprehensive_evaluation():
+def comprehensive_evaluation(stage_cache=None):
     # Load your best tuned model
-    forecaster = CardamomPriceForecaster('data/processed/clean_auction_data.csv')
-    forecaster.load_model('data/models/tuned_cardamom_model.pkl')
+    forecaster = CardamomPriceForecaster('data/processed/clean_auction_data.csv', stage_cache=stage_cache)
     
     # Load test data
     data = forecaster.load_and_prepare_data()
+    if stage_cache is not None and stage_cache.dry_run:
+        print("🧪 Dry run - pipeline stages:")
+        print(stage_cache.report())
+        return None
+    
+    forecaster.load_model('data/models/tuned_cardamom_model.pkl')
     _, test_data = forecaster.split_data(data)
     
     # Generate predictions
@@ -68,4 +76,7 @@ def comprehensive_evaluation():
     return results
 
 # Run evaluation
-results = comprehensive_evaluation()
+if __name__ == "__main__":
+    parser = add_cache_arguments(argparse.ArgumentParser(description='Evaluate the tuned cardamom model'))
+    configure_tracing()
+    results = comprehensive_evaluation(cache_from_args(parser.parse_args()))
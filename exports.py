@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import zlib
+import pandas as pd
+from flask import Response, request, stream_with_context
+from models import db
+
+EXPORT_BATCH_ROWS = 1000
+GZIP_LEVEL = 6
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def stream_rows(statement, fmt='csv', batch_rows=EXPORT_BATCH_ROWS):
+    """Yield CSV or JSON text for `statement`, fetching `batch_rows` rows at a time.
+
+    yield_per streams from the cursor (a server-side cursor where the driver has
+    one), so memory stays flat whatever the size of the export.
+    """
+    result = db.session.execute(statement.execution_options(yield_per=batch_rows))
+    columns = list(result.keys())
+    if fmt == 'json':
+        yield '['
+        first = True
+        for batch in result.partitions():
+            chunk = ',\n'.join(json.dumps({c: _json_value(v) for c, v in zip(columns, row)}) for row in batch)
+            yield chunk if first else ',\n' + chunk
+            first = False
+        yield ']\n'
+    else:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for batch in result.partitions():
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+
+def stream_frames(frames, fmt='csv'):
+    """Yield CSV or JSON text for an iterable of DataFrame chunks (header written once)"""
+    if fmt == 'json':
+        yield '['
+        first = True
+        for frame in frames:
+            if frame.empty:
+                continue
+            records = frame.to_json(orient='records', date_format='iso')[1:-1]
+            yield records if first else ',\n' + records
+            first = False
+        yield ']\n'
+    else:
+        header = True
+        for frame in frames:
+            if frame.empty and not header:
+                continue
+            yield frame.to_csv(index=False, header=header)
+            header = False
+
+
+def auction_history(path, date_from=None, date_to=None, chunksize=EXPORT_BATCH_ROWS):
+    """Chunks of a processed auction CSV, optionally limited to [date_from, date_to]"""
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        dates = pd.to_datetime(chunk['date']).dt.date
+        if date_from:
+            chunk = chunk[dates >= date_from]
+            dates = dates[dates >= date_from]
+        if date_to:
+            chunk = chunk[dates <= date_to]
+        yield chunk
+
+
+def gzip_chunks(chunks, level=GZIP_LEVEL):
+    """Compress a text stream incrementally into one gzip member"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(chunks, name, fmt):
+    """Streamed download of `chunks`, gzip-encoded on the fly when the client accepts it"""
+    response = Response(mimetype='application/json' if fmt == 'json' else 'text/csv')
+    if request.accept_encodings['gzip']:
+        chunks = gzip_chunks(chunks)
+        response.headers['Content-Encoding'] = 'gzip'
+    response.response = stream_with_context(chunks)
+    response.vary.add('Accept-Encoding')
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.{fmt}'
+    return response
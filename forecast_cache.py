@@ -0,0 +1,151 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from src.pipeline_cache import hash_file
+from src.tracing import logger
+
+DEFAULT_SHARED_CACHE_PATH = 'data/cache/forecast_windows.sqlite'
+TOUCH_INTERVAL_S = 60  # last_used is refreshed at most this often, so reads rarely write
+
+# Forecast frames are stored as packed records and read back with np.frombuffer (no parsing)
+FRAME_DTYPE = np.dtype([('date', '<i8'), ('predicted_price', '<f8'), ('lower_bound', '<f8'), ('upper_bound', '<f8')])
+
+# Recommendations are stored as JSON (never pickle: the file is shared by every process on the host);
+# these fields hold timestamps and are written as ISO strings
+RECOMMENDATION_DATES = ('optimal_sell_date',)
+
+_fingerprints = {}
+_fingerprint_lock = threading.Lock()
+
+
+def model_fingerprint(path):
+    """Content hash of a model file, recomputed only when its size or mtime changes"""
+    stat = os.stat(path)
+    marker = (stat.st_size, stat.st_mtime_ns)
+    with _fingerprint_lock:
+        cached = _fingerprints.get(path)
+        if cached and cached[0] == marker:
+            return cached[1]
+    fingerprint = hash_file(path)[:16]
+    with _fingerprint_lock:
+        _fingerprints[path] = (marker, fingerprint)
+    return fingerprint
+
+
+def pack_frame(forecast_df):
+    records = np.empty(len(forecast_df), dtype=FRAME_DTYPE)
+    records['date'] = pd.to_datetime(forecast_df['date']).to_numpy('datetime64[ns]').view('<i8')
+    for column in FRAME_DTYPE.names[1:]:
+        records[column] = forecast_df[column].to_numpy(dtype='<f8')
+    return records.tobytes()
+
+
+def unpack_frame(blob):
+    records = np.frombuffer(blob, dtype=FRAME_DTYPE)
+    frame = pd.DataFrame({column: records[column] for column in FRAME_DTYPE.names[1:]}, copy=False)
+    frame.insert(0, 'date', records['date'].view('datetime64[ns]'))
+    return frame
+
+
+def _json_default(value):
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def pack_recommendation(recommendation):
+    return json.dumps(recommendation, default=_json_default).encode('utf-8')
+
+
+def unpack_recommendation(blob):
+    recommendation = json.loads(blob)
+    for field in RECOMMENDATION_DATES:
+        if recommendation.get(field) is not None:
+            recommendation[field] = pd.Timestamp(recommendation[field])
+    return recommendation
+
+
+class SharedForecastCache:
+    """Forecast windows and recommendations shared by every worker process on the host.
+
+    A SQLite file (WAL mode) keyed on the model fingerprint plus the window, so
+    a retrained model never serves stale entries. The first worker to compute a
+    window stores it (INSERT OR IGNORE); the others read it instead of predicting.
+    When the stored payloads exceed `max_bytes` the least recently used entries
+    are deleted. Failures are logged and treated as misses.
+    """
+
+    def __init__(self, path=DEFAULT_SHARED_CACHE_PATH, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS forecast_window (
+                key TEXT PRIMARY KEY, frame BLOB NOT NULL, recommendation BLOB NOT NULL,
+                size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_forecast_window_last_used ON forecast_window (last_used)')
+
+    def _connect(self):
+        # One connection per thread (and per process: a forked child opens its own)
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn, self.local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        """(forecast_df, recommendation) for `key`, or None"""
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT frame, recommendation, last_used FROM forecast_window WHERE key = ?',
+                               (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[2] > TOUCH_INTERVAL_S:
+                conn.execute('UPDATE forecast_window SET last_used = ? WHERE key = ?', (now, key))
+            return unpack_frame(row[0]), unpack_recommendation(row[1])
+        except (sqlite3.Error, ValueError, TypeError) as e:  # ValueError covers truncated frames and bad JSON
+            logger.warning("Shared forecast cache read failed: %s", e)
+            return None
+
+    def put(self, key, forecast_df, recommendation):
+        """Store a window unless another worker already has; then trim to max_bytes"""
+        try:
+            frame = pack_frame(forecast_df)
+            payload = pack_recommendation(recommendation)
+            now = time.time()
+            conn = self._connect()
+            inserted = conn.execute(
+                'INSERT OR IGNORE INTO forecast_window VALUES (?, ?, ?, ?, ?, ?)',
+                (key, frame, payload, len(frame) + len(payload), now, now)).rowcount
+            if inserted:
+                self._evict(conn)
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logger.warning("Shared forecast cache write failed: %s", e)
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM forecast_window').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Oldest entries whose cumulative size covers the excess
+        conn.execute('''DELETE FROM forecast_window WHERE key IN (
+            SELECT key FROM (SELECT key, size, SUM(size) OVER (ORDER BY last_used, key) AS running
+                             FROM forecast_window) WHERE running - size < ?)''', (total - self.max_bytes,))
+
+    def stats(self):
+        conn = self._connect()
+        entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM forecast_window').fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
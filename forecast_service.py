@@ -0,0 +1,255 @@
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+from src.commodities import CommodityRegistry, DEFAULT_COMMODITY
+from src.models.model_family import ModelFamily, POOLED
+from forecast_cache import SharedForecastCache, model_fingerprint
+from src.tracing import logger
+
+# Per-process commodity registry (and optional per-auctioneer family), created by the pool initializer;
+# models load lazily, so a worker only holds the commodities it has actually served
+_worker_registry = None
+_worker_family = None
+
+
+def _init_worker(commodities, backend, max_bytes, family_path=None, family_max_loaded=4):
+    global _worker_registry, _worker_family
+    _worker_registry = CommodityRegistry(commodities, backend=backend, max_bytes=max_bytes)
+    if family_path:
+        data_path = _worker_registry.get(DEFAULT_COMMODITY).processed_data_path
+        _worker_family = ModelFamily(family_path, data_path, max_loaded=family_max_loaded)
+
+
+def _member_forecaster(registry, family, commodity, member):
+    if member == POOLED or family is None:
+        return registry.forecaster(commodity)
+    return family.get(member)
+
+
+def _predict(forecaster, start_date, days_ahead):
+    """One predict call yields both the forecast frame and the recommendation"""
+    recommendation = forecaster.get_sell_recommendation(days_ahead=days_ahead, start_date=start_date)
+    return forecaster.forecast, recommendation
+
+
+def _worker_predict(start_date, days_ahead, commodity=DEFAULT_COMMODITY, member=POOLED):
+    forecaster = _member_forecaster(_worker_registry, _worker_family, commodity, member)
+    return _predict(forecaster, start_date, days_ahead)
+
+
+class ForecastBusy(Exception):
+    """Raised when the service cannot take (or finish) a forecast in time; clients should retry"""
+
+    def __init__(self, message, retry_after=5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ForecastService:
+    """Runs cache-miss forecasts in a bounded process pool.
+
+    Each worker process loads its own copy of a commodity's model the first
+    time it serves that commodity. Identical in-flight requests (same
+    commodity, start date and horizon) share one prediction, at most
+    `max_pending` distinct predictions are queued or running at once, and
+    callers wait at most `timeout` seconds. Anything beyond that raises
+    ForecastBusy straight away instead of piling up behind the pool.
+    With workers=0 predictions run inline on the shared `registry`.
+    When a model `family` is given, cardamom auctioneers with their own model
+    are served by it and everyone else by the commodity's pooled model.
+    A `shared` cache (SharedForecastCache) sits behind the per-process LRU, so
+    a window computed by one app process is reused by the others.
+    """
+
+    def __init__(self, registry, workers=2, max_pending=8, timeout=10.0, cache_size=256, family=None, shared=None):
+        self.registry = registry
+        self.family = family
+        self.shared = shared
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.inline_lock = threading.Lock()
+        self.executor = None
+        self.stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'coalesced': 0, 'rejected': 0, 'timeouts': 0}
+
+    def _executor(self):
+        # Created lazily so importing the app (scripts, benchmarks) never forks
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(list(self.registry.commodities.values()), self.registry.backend, self.registry.max_bytes,
+                          self.family.bundle_path if self.family else None,
+                          self.family.max_loaded if self.family else 4)
+            )
+        return self.executor
+
+    def _submit(self, key):
+        start_date, days_ahead, commodity, member = key
+        if self.workers <= 0:
+            future = Future()
+            with self.inline_lock:
+                try:
+                    forecaster = _member_forecaster(self.registry, self.family, commodity, member)
+                    future.set_result(_predict(forecaster, start_date, days_ahead))
+                except Exception as e:
+                    future.set_exception(e)
+            return future
+        executor = self._executor()
+        try:
+            return executor.submit(_worker_predict, start_date, days_ahead, commodity, member)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return self._executor().submit(_worker_predict, start_date, days_ahead, commodity, member)
+
+    def _restart(self, executor):
+        """Drop a broken pool (unless another thread already replaced it); the next submit starts a new one"""
+        with self.lock:
+            if executor is None or self.executor is not executor:
+                return
+            self.executor = None
+        logger.warning("Forecast worker pool broken - restarting")
+        executor.shutdown(wait=False)
+
+    def _remember(self, key, result):
+        # Caller holds self.lock
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _shared_key(self, key):
+        """Window key prefixed with the fingerprint of the model file that serves it (None without one)"""
+        start_date, days_ahead, commodity, member = key
+        if member == POOLED or self.family is None:
+            path = self.registry.get(commodity).model_path(self.registry.backend)
+        else:
+            path = self.family.bundle_path
+        try:
+            return f'{model_fingerprint(path)}:{commodity}:{member}:{start_date}:{days_ahead}'
+        except OSError:
+            return None
+
+    def _finished(self, key, future):
+        succeeded = not future.cancelled() and future.exception() is None
+        with self.lock:
+            self.in_flight.pop(key, None)
+            if succeeded:
+                self._remember(key, future.result())
+        if succeeded and self.shared is not None:
+            shared_key = self._shared_key(key)
+            if shared_key:
+                self.shared.put(shared_key, *future.result())
+
+    @property
+    def auctioneers(self):
+        """Auction houses with a dedicated model"""
+        return self.family.auctioneers if self.family else []
+
+    def forecast(self, start_date=None, days_ahead=30, auctioneer=None, commodity=DEFAULT_COMMODITY):
+        """Return (forecast_df, recommendation) for the window, raising ForecastBusy under overload"""
+        self.registry.get(commodity)  # unknown commodities fail fast with KeyError
+        start = pd.to_datetime(start_date) if start_date is not None else pd.Timestamp.now().normalize()
+        member = self.family.resolve(auctioneer) if self.family and commodity == DEFAULT_COMMODITY else POOLED
+        key = (start.strftime('%Y-%m-%d'), days_ahead, commodity, member)
+
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.stats['hits'] += 1
+                forecast_df, recommendation = self.cache[key]
+                return forecast_df.copy(), dict(recommendation)
+
+        shared_key = self._shared_key(key) if self.shared is not None else None
+        if shared_key:
+            shared = self.shared.get(shared_key)
+            if shared is not None:
+                with self.lock:
+                    self.stats['shared_hits'] += 1
+                    self._remember(key, shared)
+                forecast_df, recommendation = shared
+                return forecast_df.copy(), dict(recommendation)
+
+        owner = False
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+            elif len(self.in_flight) >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise ForecastBusy("Forecast service is busy, please retry shortly")
+            else:
+                self.stats['misses'] += 1
+                future = Future()  # placeholder so concurrent callers coalesce while we submit
+                self.in_flight[key] = future
+                owner = True
+        if owner:
+            try:
+                submitted = self._submit(key)
+            except Exception as e:
+                with self.lock:
+                    self.in_flight.pop(key, None)
+                future.set_exception(e)
+                raise
+            executor = self.executor
+            future.add_done_callback(lambda f: self._finished(key, f))
+            submitted.add_done_callback(lambda f: _chain(f, future))
+
+        try:
+            forecast_df, recommendation = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self.lock:
+                self.stats['timeouts'] += 1
+            raise ForecastBusy("Forecast took too long, please retry shortly")
+        except BrokenProcessPool:
+            # A worker died mid-prediction: restart the pool now (not at the next submit) and ask to retry
+            if owner:
+                self._restart(executor)
+            raise ForecastBusy("Forecast worker restarted, please retry shortly")
+        except CancelledError:
+            raise ForecastBusy("Forecast service is restarting, please retry shortly")
+        return forecast_df.copy(), dict(recommendation)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def _chain(source, target):
+    """Copy a finished worker future's outcome onto the placeholder future"""
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def create_forecast_service(registry, config, family_path=None):
+    family = None
+    if family_path and os.path.exists(family_path):
+        data_path = registry.get(DEFAULT_COMMODITY).processed_data_path
+        family = ModelFamily(family_path, data_path, max_loaded=config.MODEL_FAMILY_MAX_LOADED)
+    shared = None
+    if config.FORECAST_SHARED_CACHE_PATH:
+        shared = SharedForecastCache(config.FORECAST_SHARED_CACHE_PATH,
+                                     max_bytes=int(config.FORECAST_SHARED_CACHE_MB * 1024 * 1024))
+    service = ForecastService(
+        registry,
+        workers=config.FORECAST_WORKERS,
+        max_pending=config.FORECAST_MAX_PENDING,
+        timeout=config.FORECAST_TIMEOUT_S,
+        family=family,
+        shared=shared
+    )
+    atexit.register(service.shutdown)
+    return service
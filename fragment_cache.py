@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from flask import g
+from markupsafe import Markup
+from sqlalchemy import event, update
+from models import db, CacheVersion, User, Pool, PoolMembership, PoolRecommendation, Forecast
+
+# Version counter bumped by a flush that writes each model
+VERSIONED_MODELS = {
+    Pool: 'pools',
+    PoolRecommendation: 'pools',
+    PoolMembership: 'memberships',
+    User: 'users',
+    Forecast: 'forecasts',
+}
+VERSION_NAMES = sorted(set(VERSIONED_MODELS.values()))
+
+
+class FragmentCache:
+    """Rendered template fragments keyed on the versions of the data they show.
+
+    Counters live in the cache_version table and are bumped in the same
+    transaction as the write, so every process sees a change on its next
+    request. A fragment whose dependencies moved simply misses (old entries
+    age out of the LRU). Reading the counters costs one query per request.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def versions(self):
+        if 'cache_versions' not in g:
+            g.cache_versions = dict(db.session.query(CacheVersion.name, CacheVersion.version).all())
+        return g.cache_versions
+
+    def fragment(self, name, key=None, deps=(), caller=None):
+        """Jinja call block: {% call cached_fragment('pool-card', pool.id, deps=['pools']) %}...{% endcall %}"""
+        versions = self.versions()
+        cache_key = (name, key, tuple(versions.get(dep, 0) for dep in deps))
+        with self.lock:
+            html = self.entries.get(cache_key)
+            if html is not None:
+                self.entries.move_to_end(cache_key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = Markup(caller())
+        with self.lock:
+            self.entries[cache_key] = html
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return html
+
+
+fragment_cache = FragmentCache()
+
+
+def bump_versions(*names):
+    """Bump counters in the current transaction; needed after bulk UPDATE/DELETE, which skip flush events"""
+    db.session.execute(update(CacheVersion).where(CacheVersion.name.in_(names))
+                       .values(version=CacheVersion.version + 1))
+    g.pop('cache_versions', None)
+
+
+def seed_versions():
+    existing = {name for name, in db.session.query(CacheVersion.name)}
+    for name in VERSION_NAMES:
+        if name not in existing:
+            db.session.add(CacheVersion(name=name, version=0))
+    db.session.commit()
+
+
+def _bump_on_flush(session, flush_context):
+    changed = {VERSIONED_MODELS[type(obj)] for obj in (*session.new, *session.dirty, *session.deleted)
+               if type(obj) in VERSIONED_MODELS and (obj not in session.dirty or session.is_modified(obj))}
+    if changed:
+        session.connection().execute(update(CacheVersion).where(CacheVersion.name.in_(changed))
+                                     .values(version=CacheVersion.version + 1))
+        g.pop('cache_versions', None)
+
+
+def init_fragment_cache(app):
+    app.jinja_env.globals['cached_fragment'] = fragment_cache.fragment
+    if not event.contains(db.session, 'after_flush', _bump_on_flush):
+        event.listen(db.session, 'after_flush', _bump_on_flush)
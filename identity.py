@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import g
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from models import db, User, PoolMembership
+from fragment_cache import fragment_cache
+
+
+class IdentityCache:
+    """Logged-in users' profile rows, cached across requests.
+
+    Flask-Login calls the user loader on every request; a cache hit merges a
+    detached copy of the row into the request's session without a SELECT
+    (relationships still lazy-load through that session). Each entry records the
+    'users' data version it was read at; any User write in any process bumps
+    that counter, so a demoted or deleted user is reloaded on their next
+    request everywhere. Entries also expire after `ttl` seconds.
+    """
+
+    def __init__(self, ttl=300, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()  # user id -> (column values, expiry, users version)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load_user(self, user_id):
+        # Read before the row, so a write in between leaves the entry stale rather than trusted
+        version = fragment_cache.versions().get('users', 0)
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry and entry[1] > time.monotonic() and entry[2] == version:
+                self.entries.move_to_end(user_id)
+                self.hits += 1
+                values = entry[0]
+            else:
+                self.misses += 1
+                values = None
+
+        if values is None:
+            user = db.session.get(User, user_id)
+            if user is None:
+                return None
+            self.store(user, version)
+            return user
+
+        cached = User(**values)
+        make_transient_to_detached(cached)
+        return db.session.merge(cached, load=False)
+
+    def store(self, user, version):
+        values = {column.key: getattr(user, column.key) for column in User.__mapper__.column_attrs}
+        with self.lock:
+            self.entries[user.id] = (values, time.monotonic() + self.ttl, version)
+            self.entries.move_to_end(user.id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+
+identity_cache = IdentityCache()
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_user(mapper, connection, user):
+    identity_cache.invalidate(user.id)
+
+
+def user_memberships(user):
+    """The user's pool memberships with their pools, in one query memoized for the request"""
+    memo = g.setdefault('user_memberships', {})
+    if user.id not in memo:
+        memo[user.id] = (PoolMembership.query.options(joinedload(PoolMembership.pool))
+                         .filter_by(user_id=user.id).all())
+    return memo[user.id]
+
+
+def init_identity(login_manager, config):
+    identity_cache.ttl = config.IDENTITY_CACHE_TTL_S
+
+    @login_manager.user_loader
+    def load_user(user_id):
+        return identity_cache.load_user(int(user_id))
@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from functools import wraps
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+slow_request_logger = logging.getLogger('spicehold.slow_requests')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram keyed by label values"""
+
+    def __init__(self, name, help_text, buckets, label_names=('route', 'method')):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self.lock:
+            series = self.series.setdefault(labels, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, series in sorted(self.series.items()):
+                label_str = ','.join(f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, labels))
+                for bound, bucket_count in zip(self.buckets, series['buckets']):
+                    lines.append(f'{self.name}_bucket{{{label_str},le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {series["count"]}')
+                lines.append(f'{self.name}_sum{{{label_str}}} {series["sum"]}')
+                lines.append(f'{self.name}_count{{{label_str}}} {series["count"]}')
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """Per-route histograms of wall time, SQL, forecaster and template render cost"""
+
+    def __init__(self):
+        self.request_seconds = Histogram(
+            'spicehold_request_duration_seconds', 'Wall time per request', DURATION_BUCKETS)
+        self.sql_seconds = Histogram(
+            'spicehold_sql_duration_seconds', 'Time spent executing SQL per request', DURATION_BUCKETS)
+        self.sql_statements = Histogram(
+            'spicehold_sql_statements', 'SQL statements executed per request', COUNT_BUCKETS)
+        self.forecaster_seconds = Histogram(
+            'spicehold_forecaster_duration_seconds', 'Time spent in forecaster calls per request', DURATION_BUCKETS)
+        self.template_seconds = Histogram(
+            'spicehold_template_render_seconds', 'Template render time per request', DURATION_BUCKETS)
+
+    def histograms(self):
+        return [self.request_seconds, self.sql_seconds, self.sql_statements,
+                self.forecaster_seconds, self.template_seconds]
+
+    def render(self):
+        return '\n'.join(h.render() for h in self.histograms()) + '\n'
+
+
+def _breakdown():
+    """Per-request accumulator, created lazily on first use"""
+    if 'perf' not in g:
+        g.perf = {'sql_count': 0, 'sql_seconds': 0.0, 'forecaster_seconds': 0.0,
+                  'template_seconds': 0.0, 'forecaster_depth': 0, 'template_depth': 0}
+    return g.perf
+
+
+def track_forecaster(func):
+    """Wrap a forecaster call so its time is charged to the current request (outermost call only)"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not has_request_context():
+            return func(*args, **kwargs)
+        perf = _breakdown()
+        perf['forecaster_depth'] += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            perf['forecaster_depth'] -= 1
+            if perf['forecaster_depth'] == 0:
+                perf['forecaster_seconds'] += time.perf_counter() - start
+    return wrapper
+
+
+def instrument_forecaster(forecaster, methods=('forecast_prices', 'get_sell_recommendation')):
+    """Charge the forecaster's public prediction methods to the request breakdown"""
+    if getattr(forecaster, '_perf_instrumented', False):
+        return forecaster
+    for name in methods:
+        setattr(forecaster, name, track_forecaster(getattr(forecaster, name)))
+    forecaster._perf_instrumented = True
+    return forecaster
+
+
+def init_instrumentation(app, db, forecaster=None):
+    """Register request timing middleware, SQL/template hooks and the metrics registry"""
+    metrics = RequestMetrics()
+    app.extensions['request_metrics'] = metrics
+    slow_ms = app.config.get('SLOW_REQUEST_LOG_MS')
+
+    if forecaster is not None:
+        instrument_forecaster(forecaster)
+
+    with app.app_context():
+        engines = list(db.engines.values())  # primary, plus the read replica when configured
+
+    # The start time lives on the statement's execution context, so a statement that fails (and never
+    # reaches after_cursor_execute) leaves nothing behind on the pooled connection
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._perf_query_start = time.perf_counter()
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_perf_query_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if has_request_context():
+            perf = _breakdown()
+            perf['sql_count'] += 1
+            perf['sql_seconds'] += elapsed
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def _template_started(sender, template, context, **extra):
+        perf = _breakdown()
+        if perf['template_depth'] == 0:
+            perf['template_start'] = time.perf_counter()
+        perf['template_depth'] += 1
+
+    def _template_finished(sender, template, context, **extra):
+        perf = _breakdown()
+        perf['template_depth'] -= 1
+        if perf['template_depth'] == 0:
+            perf['template_seconds'] += time.perf_counter() - perf['template_start']
+
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        if 'request_start' not in g:
+            return response
+        wall = time.perf_counter() - g.request_start
+        perf = _breakdown()
+        labels = (request.url_rule.rule if request.url_rule else 'unmatched', request.method)
+
+        metrics.request_seconds.observe(labels, wall)
+        metrics.sql_seconds.observe(labels, perf['sql_seconds'])
+        metrics.sql_statements.observe(labels, perf['sql_count'])
+        metrics.forecaster_seconds.observe(labels, perf['forecaster_seconds'])
+        metrics.template_seconds.observe(labels, perf['template_seconds'])
+
+        if slow_ms is not None and wall * 1000 >= slow_ms:
+            slow_request_logger.warning(
+                "Slow request %s %s: %.1f ms total, %d SQL (%.1f ms), forecaster %.1f ms, templates %.1f ms",
+                request.method, request.path, wall * 1000, perf['sql_count'], perf['sql_seconds'] * 1000,
+                perf['forecaster_seconds'] * 1000, perf['template_seconds'] * 1000
+            )
+        return response
+
+    return metrics
@@ -2,8 +2,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import bindparam, func, inspect, select, text, update
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -21,6 +23,8 @@ class User(UserMixin, db.Model):
     pools_created = db.relationship('Pool', back_populates='creator', lazy='dynamic')
     pool_memberships = db.relationship('PoolMembership', back_populates='user', lazy='dynamic')
     forecasts = db.relationship('Forecast', back_populates='user', lazy='dynamic')
+    price_alerts = db.relationship('PriceAlert', back_populates='user', lazy='dynamic')
+    notifications = db.relationship('Notification', back_populates='user', lazy='dynamic')
 
     def is_admin(self):
         return self.role == 'admin'
@@ -32,6 +36,9 @@ class User(UserMixin, db.Model):
         return check_password_hash(self.password_hash, password)
 
 class Pool(db.Model):
+    # active -> filled (target_quantity reached) or expired (deadline passed), by pool_jobs.py expire
+    STATUSES = ('active', 'filled', 'expired')
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     target_quantity = db.Column(db.Integer, nullable=False)
@@ -41,19 +48,31 @@ class Pool(db.Model):
     deadline = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     creator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    commodity = db.Column(db.String(30), nullable=False, default='cardamom', server_default='cardamom')
+    
+    __table_args__ = (
+        db.Index('ix_pool_commodity_status', 'commodity', 'status'),
+        # Partial index: the hot /pools query (active pools by deadline) never touches closed pools
+        db.Index('ix_pool_active_deadline', 'deadline', 'id',
+                 sqlite_where=db.text("status = 'active'"), postgresql_where=db.text("status = 'active'")),
+    )
     
     # Fixed relationships - use back_populates only
     creator = db.relationship('User', back_populates='pools_created')
     memberships = db.relationship('PoolMembership', back_populates='pool', lazy='dynamic')
+    transitions = db.relationship('PoolTransition', lazy='dynamic', cascade='all, delete-orphan')
+    recommendation = db.relationship('PoolRecommendation', back_populates='pool', uselist=False, cascade='all, delete-orphan')
 
 class PoolMembership(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     pool_id = db.Column(db.Integer, db.ForeignKey('pool.id'), nullable=False)
     quantity_contributed = db.Column(db.Integer, nullable=False)
-    join_date = db.Column(db.Date, default=datetime.utcnow)
+    join_date = db.Column(db.Date, nullable=False, default=datetime.utcnow)  # keyset sort key
     status = db.Column(db.String(20), default='active')
     
+    __table_args__ = (db.Index('ix_membership_user_joined', 'user_id', 'join_date', 'id'),)
+    
     # Fixed relationships - use back_populates only
     user = db.relationship('User', back_populates='pool_memberships')
     pool = db.relationship('Pool', back_populates='memberships')
@@ -66,7 +85,118 @@ class Forecast(db.Model):
     optimal_price = db.Column(db.Float, nullable=False)
     action = db.Column(db.String(20), nullable=False)
     potential_gain = db.Column(db.Float, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # keyset sort key
+    commodity = db.Column(db.String(30), nullable=False, default='cardamom', server_default='cardamom')
+    
+    __table_args__ = (
+        db.Index('ix_forecast_commodity_user', 'commodity', 'user_id'),
+        db.Index('ix_forecast_user_created', 'user_id', 'created_at', 'id'),  # keyset pages of history
+        db.Index('ix_forecast_created', 'created_at', 'id'),
+    )
     
     # Fixed relationship - use back_populates only
     user = db.relationship('User', back_populates='forecasts')
+
+class PoolRecommendation(db.Model):
+    """Latest sale-timing result for a pool, written by the batch optimizer (pool_jobs.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    pool_id = db.Column(db.Integer, db.ForeignKey('pool.id'), nullable=False, unique=True)
+    optimal_sale_date = db.Column(db.Date, nullable=False)
+    expected_price = db.Column(db.Float, nullable=False)
+    target_price = db.Column(db.Float, nullable=False)
+    price_gap_pct = db.Column(db.Float, nullable=False)
+    prob_reach_target = db.Column(db.Float, nullable=False)
+    forecast_start = db.Column(db.Date, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    pool = db.relationship('Pool', back_populates='recommendation')
+
+class PriceAlert(db.Model):
+    """Farmer subscription: notify when the forecast price rises above threshold_price within within_days"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    commodity = db.Column(db.String(30), nullable=False, default='cardamom')
+    threshold_price = db.Column(db.Float, nullable=False)
+    within_days = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), default='active')  # active -> triggered
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    triggered_at = db.Column(db.DateTime)
+    
+    __table_args__ = (db.Index('ix_price_alert_commodity_status', 'commodity', 'status'),)
+    
+    user = db.relationship('User', back_populates='price_alerts')
+
+class Notification(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    alert_id = db.Column(db.Integer, db.ForeignKey('price_alert.id'))
+    message = db.Column(db.String(255), nullable=False)
+    is_read = db.Column(db.Boolean, default=False, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.Index('ix_notification_user_read', 'user_id', 'is_read'),)
+    
+    user = db.relationship('User', back_populates='notifications')
+
+class PoolTransition(db.Model):
+    """Audit row for each status change made by the pool maintenance job"""
+    id = db.Column(db.Integer, primary_key=True)
+    pool_id = db.Column(db.Integer, db.ForeignKey('pool.id'), nullable=False, index=True)
+    from_status = db.Column(db.String(20), nullable=False)
+    to_status = db.Column(db.String(20), nullable=False)
+    reason = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class CacheVersion(db.Model):
+    """Counter bumped whenever a cached kind of data changes (see fragment_cache.py)"""
+    name = db.Column(db.String(30), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# Indexes replaced in later versions
+DROPPED_INDEXES = ['ix_pool_status_deadline']
+
+# Columns added after the first release; create_all() creates missing tables but never alters existing ones
+ADDED_COLUMNS = [
+    (Pool, 'commodity'),
+    (Forecast, 'commodity'),
+]
+
+def upgrade_schema():
+    """Add new columns and indexes to a database created by an older version"""
+    engine = db.engine
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for model, column_name in ADDED_COLUMNS:
+            table = model.__table__
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            if column_name not in existing:
+                column = table.c[column_name]
+                ddl = f'ALTER TABLE "{table.name}" ADD COLUMN {column_name} {column.type.compile(engine.dialect)}'
+                if column.server_default is not None:
+                    ddl += f" NOT NULL DEFAULT '{column.server_default.arg}'"
+                conn.execute(text(ddl))
+    with engine.begin() as conn:
+        for name in DROPPED_INDEXES:
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    backfill_sort_keys()
+
+
+def backfill_sort_keys():
+    """Fill NULL keyset sort keys left by versions that declared them nullable (SQLite cannot add NOT NULL
+    to an existing column, so older databases keep accepting NULL; the models always set them)"""
+    memberships, forecasts = PoolMembership.__table__, Forecast.__table__
+    with db.engine.begin() as conn:
+        # A membership with no join date joined at the earliest when its pool was created
+        missing = conn.execute(select(memberships.c.id, Pool.__table__.c.created_at)
+                               .join(Pool.__table__, Pool.__table__.c.id == memberships.c.pool_id)
+                               .where(memberships.c.join_date.is_(None))).all()
+        if missing:
+            conn.execute(update(memberships).where(memberships.c.id == bindparam('mid'))
+                         .values(join_date=bindparam('joined')),
+                         [{'mid': mid, 'joined': (created or datetime.utcnow()).date()} for mid, created in missing])
+        # Forecasts with no creation time sort as the oldest
+        oldest = conn.execute(select(func.min(forecasts.c.created_at))).scalar() or datetime.utcnow()
+        conn.execute(update(forecasts).where(forecasts.c.created_at.is_(None)).values(created_at=oldest))
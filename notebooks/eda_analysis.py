@@ -1,3 +1,5 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -6,10 +8,22 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.eda_summary import EDASummaryEngine
+
 class CardamomEDA:
     def __init__(self, data_path):
         self.data_path = data_path
         self.df = None
+        self.engine = EDASummaryEngine(data_path)
+        self._summary = None
+    
+    @property
+    def summary(self):
+        """Group statistics from the single-pass summary engine (computed once per run)"""
+        if self._summary is None:
+            self._summary = self.engine.get_report()
+        return self._summary
     
     def load_data(self):
         """Load processed cardamom data"""
@@ -69,30 +83,20 @@ class CardamomEDA:
         print("🌍 SEASONAL PATTERN ANALYSIS")
         print("=" * 50)
         
-        # Add time features
-        self.df['day_of_week'] = self.df['date'].dt.day_name()
-        self.df['month_name'] = self.df['date'].dt.month_name()
-        self.df['quarter'] = self.df['date'].dt.quarter
-        
         # Weekly patterns
-        weekly_prices = self.df.groupby('day_of_week')['avg_price_rs_kg'].mean().sort_values(ascending=False)
         print("\n📅 AVERAGE PRICES BY DAY OF WEEK:")
-        for day, price in weekly_prices.items():
-            print(f"   {day}: ₹{price:.2f}")
+        for entry in self.summary['weekday']:
+            print(f"   {entry['day']}: ₹{entry['mean_price']:.2f}")
         
         # Monthly patterns
-        monthly_prices = self.df.groupby('month_name')['avg_price_rs_kg'].mean()
         print(f"\n🗓️  HIGHEST PRICE MONTHS:")
-        top_months = monthly_prices.sort_values(ascending=False).head(3)
-        for month, price in top_months.items():
-            print(f"   {month}: ₹{price:.2f}")
+        for entry in self.summary['insights']['best_months']:
+            print(f"   {entry['month']}: ₹{entry['mean_price']:.2f}")
         
         # Quarterly patterns
-        quarterly_prices = self.df.groupby('quarter')['avg_price_rs_kg'].mean()
         print(f"\n📊 QUARTERLY PRICE AVERAGES:")
-        for quarter, price in quarterly_prices.items():
-            seasons = {1: "Jan-Mar", 2: "Apr-Jun", 3: "Jul-Sep", 4: "Oct-Dec"}
-            print(f"   Q{quarter} ({seasons[quarter]}): ₹{price:.2f}")
+        for entry in self.summary['quarter']:
+            print(f"   {entry['quarter']} ({entry['season']}): ₹{entry['mean_price']:.2f}")
     
     def volume_price_relationship(self):
         """Analyze relationship between volume and prices"""
@@ -101,7 +105,7 @@ class CardamomEDA:
         print("=" * 50)
         
         # Correlation analysis
-        correlation = self.df['total_arrival_kg'].corr(self.df['avg_price_rs_kg'])
+        correlation = self.summary['volume_price_correlation']
         print(f"\n📈 Volume-Price Correlation: {correlation:.3f}")
         
         if correlation < -0.3:
@@ -112,14 +116,9 @@ class CardamomEDA:
             print("   ➡️  Weak relationship between volume and prices")
         
         # Volume categories analysis
-        self.df['volume_category'] = pd.cut(self.df['total_arrival_kg'], 
-                                          bins=3, 
-                                          labels=['Low Volume', 'Medium Volume', 'High Volume'])
-        
-        volume_price_analysis = self.df.groupby('volume_category')['avg_price_rs_kg'].agg(['mean', 'std'])
         print(f"\n📦 PRICE BY VOLUME CATEGORY:")
-        for category, data in volume_price_analysis.iterrows():
-            print(f"   {category}: ₹{data['mean']:.2f} (±₹{data['std']:.2f})")
+        for entry in self.summary['volume_category']:
+            print(f"   {entry['category']}: ₹{entry['mean_price']:.2f} (±₹{entry['std_price']:.2f})")
     
     def top_performers_analysis(self):
         """Analyze top performing auctioneers"""
@@ -127,23 +126,11 @@ class CardamomEDA:
         print("🏆 TOP PERFORMING AUCTIONEERS")
         print("=" * 50)
         
-        # Top auctioneers by average price
-        auctioneer_stats = self.df.groupby('auctioneer').agg({
-            'avg_price_rs_kg': ['mean', 'count'],
-            'total_arrival_kg': 'sum'
-        }).round(2)
-        
-        # Flatten column names
-        auctioneer_stats.columns = ['avg_price', 'auction_count', 'total_volume']
-        
-        # Filter auctioneers with at least 10 auctions
-        significant_auctioneers = auctioneer_stats[auctioneer_stats['auction_count'] >= 10]
-        top_by_price = significant_auctioneers.sort_values('avg_price', ascending=False).head(5)
-        
+        # Auctioneers with at least 10 auctions, by average price
         print("\n💰 TOP 5 AUCTIONEERS BY AVERAGE PRICE:")
-        for auctioneer, data in top_by_price.iterrows():
-            short_name = auctioneer.split(',')[0][:30]  # Truncate long names
-            print(f"   {short_name}: ₹{data['avg_price']:.2f} ({data['auction_count']} auctions)")
+        for entry in self.summary['top_auctioneers']:
+            short_name = entry['auctioneer'].split(',')[0][:30]  # Truncate long names
+            print(f"   {short_name}: ₹{entry['avg_price']:.2f} ({entry['auction_count']} auctions)")
     
     def data_quality_check(self):
         """Check data quality and completeness"""
@@ -183,36 +170,26 @@ class CardamomEDA:
         print("💡 KEY BUSINESS INSIGHTS FOR SPICEHOLD")
         print("=" * 60)
         
-        # Price volatility insights
-        daily_volatility = self.df['avg_price_rs_kg'].std()
-        avg_price = self.df['avg_price_rs_kg'].mean()
-        volatility_percent = (daily_volatility / avg_price) * 100
+        insights = self.summary['insights']
         
+        # Price volatility insights
         print(f"🎯 FARMER OPPORTUNITY:")
-        print(f"   Price volatility: {volatility_percent:.1f}% of average price")
-        print(f"   This means farmers can gain/lose ₹{daily_volatility:.2f}/kg by timing sales")
+        print(f"   Price volatility: {insights['volatility_percent']:.1f}% of average price")
+        print(f"   This means farmers can gain/lose ₹{insights['daily_volatility_rs']:.2f}/kg by timing sales")
         
         # Best selling windows
-        self.df['month'] = self.df['date'].dt.month
-        best_months = self.df.groupby('month')['avg_price_rs_kg'].mean().sort_values(ascending=False).head(3)
-        worst_months = self.df.groupby('month')['avg_price_rs_kg'].mean().sort_values(ascending=True).head(3)
-        
-        month_names = {1:'Jan', 2:'Feb', 3:'Mar', 4:'Apr', 5:'May', 6:'Jun',
-                      7:'Jul', 8:'Aug', 9:'Sep', 10:'Oct', 11:'Nov', 12:'Dec'}
-        
         print(f"\n📅 OPTIMAL SELLING PERIODS:")
-        for month, price in best_months.items():
-            print(f"   {month_names[month]}: ₹{price:.2f} (Best months to sell)")
+        for entry in insights['best_months']:
+            print(f"   {entry['month']}: ₹{entry['mean_price']:.2f} (Best months to sell)")
         
         print(f"\n❌ AVOID SELLING IN:")
-        for month, price in worst_months.items():
-            print(f"   {month_names[month]}: ₹{price:.2f} (Lowest price months)")
+        for entry in insights['worst_months']:
+            print(f"   {entry['month']}: ₹{entry['mean_price']:.2f} (Lowest price months)")
         
         # Market efficiency insight
-        avg_unsold = self.df['unsold_percentage'].mean() * 100
         print(f"\n📊 MARKET DEMAND:")
-        print(f"   Average unsold inventory: {avg_unsold:.1f}%")
-        print(f"   Market demand is {'STRONG' if avg_unsold < 10 else 'MODERATE' if avg_unsold < 20 else 'WEAK'}")
+        print(f"   Average unsold inventory: {insights['avg_unsold_pct']:.1f}%")
+        print(f"   Market demand is {insights['market_demand']}")
     
     def run_full_eda(self):
         """Run complete EDA analysis"""
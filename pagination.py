@@ -0,0 +1,111 @@
+import base64
+import json
+from datetime import date, datetime
+from flask import request, url_for
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values):
+    """Opaque URL-safe token for the sort key of the last row on a page"""
+    tagged = [['dt', v.isoformat()] if isinstance(v, datetime) else
+              ['d', v.isoformat()] if isinstance(v, date) else ['v', v] for v in values]
+    return base64.urlsafe_b64encode(json.dumps(tagged, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    padded = token + '=' * (-len(token) % 4)
+    tagged = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    return [datetime.fromisoformat(v) if kind == 'dt' else date.fromisoformat(v) if kind == 'd' else v
+            for kind, v in tagged]
+
+
+def _cursor_fits(values, columns):
+    """Whether decoded cursor values have the python types of their sort columns (date, datetime, int)"""
+    if len(values) != len(columns):
+        return False
+    for value, column in zip(values, columns):
+        try:
+            expected = column.type.python_type
+        except NotImplementedError:
+            continue
+        if type(value) is not expected:  # exact: datetime subclasses date and bool subclasses int
+            return False
+    return True
+
+
+class KeysetPage:
+    """One page of rows plus the cursor that continues after it"""
+
+    def __init__(self, items, next_cursor, limit, cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.limit = limit
+        self.cursor = cursor
+
+    def url(self, cursor):
+        """This endpoint with the current filters and another cursor (None = first page)"""
+        args = {**request.view_args, **request.args.to_dict()}
+        args.pop('cursor', None)
+        if cursor:
+            args['cursor'] = cursor
+        return url_for(request.endpoint, **args)
+
+    @property
+    def next_url(self):
+        return self.url(self.next_cursor) if self.next_cursor else None
+
+    @property
+    def first_url(self):
+        return self.url(None) if self.cursor else None
+
+    def to_dict(self, serialize):
+        return {
+            'items': [serialize(item) for item in self.items],
+            'next_cursor': self.next_cursor,
+            'limit': self.limit,
+        }
+
+
+def keyset_paginate(query, columns, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=False):
+    """Rows after `cursor` in `columns` order (last column must be unique, e.g. the id).
+
+    The position is a row-value comparison on the sort key, so with an index on
+    those columns every page costs the same however deep it is (unlike OFFSET).
+    A malformed cursor restarts from the first page.
+    """
+    try:
+        values = decode_cursor(cursor) if cursor else None
+    except (ValueError, TypeError):
+        values = None
+    if values is not None and not _cursor_fits(values, columns):
+        values = None
+    if values is not None:
+        key = tuple_(*columns)
+        after = tuple_(*[literal(v, c.type) for v, c in zip(values, columns)])
+        query = query.filter(key < after if descending else key > after)
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return KeysetPage(items, next_cursor, limit, cursor=cursor if values else None)
+
+
+def page_args():
+    """cursor and limit from the query string (limit clamped to 1..MAX_PAGE_SIZE)"""
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    return request.args.get('cursor'), max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def arg_date(name):
+    return request.args.get(name, type=lambda s: datetime.strptime(s, '%Y-%m-%d').date())
+
+
+def wants_json():
+    return request.args.get('format') == 'json' or request.accept_mimetypes.best == 'application/json'
@@ -0,0 +1,248 @@
+"""Bulk import and streaming export of pools and memberships.
+
+Usage (from the repository root):
+    python pool_io.py import pools cooperative_pools.csv --creator admin
+    python pool_io.py import memberships members.json --strict
+    python pool_io.py export memberships memberships.json
+
+Pools need name, target_quantity, target_price and deadline (YYYY-MM-DD),
+with an optional commodity. Memberships need pool_id, username (or user_id)
+and quantity_contributed, with an optional join_date. Exports use the same
+columns, so an export can be re-imported elsewhere.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import bindparam, insert, select, update
+from models import db, User, Pool, PoolMembership
+from fragment_cache import bump_versions
+from exports import stream_rows
+from db_routing import replica_reads
+from src.tracing import span
+
+
+class ImportReport:
+    """Rows accepted and per-row errors (row numbers are 1-based data rows)"""
+
+    def __init__(self, total):
+        self.total = total
+        self.errors = {}
+        self.imported = 0
+
+    def reject(self, mask, message):
+        """Record `message` for every row where the boolean Series `mask` is true"""
+        for row in mask[mask].index:
+            self.errors.setdefault(int(row) + 1, []).append(message)
+
+    def valid_mask(self, index):
+        return ~index.to_series().add(1).isin(self.errors).to_numpy()
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'imported': self.imported,
+            'rejected': len(self.errors),
+            'errors': [{'row': row, 'errors': messages} for row, messages in sorted(self.errors.items())],
+        }
+
+
+def read_rows(source, fmt):
+    """DataFrame of raw string values from a CSV or JSON (list of objects) file or stream"""
+    if fmt == 'json':
+        return pd.DataFrame.from_records(json.load(source)).astype(str)
+    return pd.read_csv(source, dtype=str, keep_default_na=False)
+
+
+def _column(df, *names):
+    for name in names:
+        if name in df.columns:
+            return df[name].astype(str).str.strip().replace({'None': '', 'nan': ''})
+    return pd.Series('', index=df.index)
+
+
+def _positive_number(values):
+    numbers = pd.to_numeric(values, errors='coerce')
+    return numbers, numbers.isna() | (numbers <= 0)
+
+
+def _dates(values):
+    return pd.to_datetime(values, format='%Y-%m-%d', errors='coerce')
+
+
+def import_pools(df, creator_id, known_commodities, strict=False):
+    """Validate every row at once, then insert the valid pools in one executemany"""
+    report = ImportReport(len(df))
+    with span('import_pools', rows=len(df)) as s:
+        name = _column(df, 'name', 'pool_name')
+        commodity = _column(df, 'commodity').replace('', 'cardamom').str.lower()
+        quantity, bad_quantity = _positive_number(_column(df, 'target_quantity'))
+        price, bad_price = _positive_number(_column(df, 'target_price'))
+        deadline = _dates(_column(df, 'deadline'))
+
+        report.reject(name == '', 'name is required')
+        report.reject(name.str.len() > 100, 'name is longer than 100 characters')
+        report.reject(~commodity.isin(known_commodities), 'unknown commodity')
+        report.reject(bad_quantity | (quantity != quantity.round()), 'target_quantity must be a positive whole number')
+        report.reject(bad_price, 'target_price must be a positive number')
+        report.reject(deadline.isna(), 'deadline must be a YYYY-MM-DD date')
+
+        valid = report.valid_mask(df.index)
+        if strict and report.errors:
+            return report
+        records = pd.DataFrame({
+            'name': name, 'commodity': commodity, 'target_quantity': quantity, 'target_price': price,
+            'deadline': deadline.dt.date,
+        })[valid]
+        records['target_quantity'] = records['target_quantity'].astype(int)
+        records = records.assign(creator_id=creator_id, current_quantity=0, status='active').to_dict('records')
+        if records:
+            db.session.execute(insert(Pool), records)
+            bump_versions('pools')  # bulk inserts skip the flush hook that versions cached fragments
+        db.session.commit()
+        report.imported = len(records)
+        s.set(imported=report.imported, rejected=len(report.errors))
+    return report
+
+
+def import_memberships(df, strict=False):
+    """Validate, check each pool's remaining capacity, then insert and update in one transaction.
+
+    Rows are taken in file order; a row that would push its pool past
+    target_quantity is rejected. Pool quantities are raised with a guarded
+    UPDATE (current + added <= target), so a concurrent join cannot overfill.
+    """
+    report = ImportReport(len(df))
+    with span('import_memberships', rows=len(df)) as s:
+        pool_id = pd.to_numeric(_column(df, 'pool_id'), errors='coerce')
+        quantity, bad_quantity = _positive_number(_column(df, 'quantity_contributed', 'quantity'))
+        join_raw = _column(df, 'join_date')
+        join_date = _dates(join_raw).fillna(pd.Timestamp(datetime.now().date()))
+
+        user_ids = pd.to_numeric(_column(df, 'user_id'), errors='coerce')
+        usernames = _column(df, 'username')
+        if usernames.ne('').any():
+            by_name = dict(db.session.execute(
+                select(User.username, User.id).where(User.username.in_(usernames.unique().tolist()))).all())
+            user_ids = user_ids.fillna(usernames.map(by_name))
+        known_users = {uid for uid, in db.session.execute(
+            select(User.id).where(User.id.in_(user_ids.dropna().astype(int).unique().tolist())))}
+        user_ids = user_ids.where(user_ids.isin(known_users))
+
+        pools = pd.DataFrame(db.session.execute(
+            select(Pool.id, Pool.status, Pool.current_quantity, Pool.target_quantity)
+            .where(Pool.id.in_(pool_id.dropna().astype(int).unique().tolist()))).all(),
+            columns=['pool_id', 'status', 'current_quantity', 'target_quantity']).set_index('pool_id')
+
+        report.reject(pool_id.isna() | ~pool_id.isin(pools.index), 'unknown pool_id')
+        report.reject(pool_id.map(pools['status']).fillna('active') != 'active', 'pool is not active')
+        report.reject(user_ids.isna(), 'unknown user')
+        report.reject(bad_quantity | (quantity != quantity.round()), 'quantity_contributed must be a positive whole number')
+        report.reject((join_raw != '') & _dates(join_raw).isna(), 'join_date must be a YYYY-MM-DD date')
+
+        pairs = pd.DataFrame({'user_id': user_ids, 'pool_id': pool_id})
+        report.reject(pairs.duplicated() & user_ids.notna(), 'duplicate of an earlier row')
+        existing = pd.DataFrame(db.session.execute(
+            select(PoolMembership.user_id, PoolMembership.pool_id)
+            .where(PoolMembership.pool_id.in_(pools.index.tolist()),
+                   PoolMembership.user_id.in_(list(known_users)))).all(), columns=['user_id', 'pool_id'])
+        already = pd.MultiIndex.from_frame(pairs).isin(pd.MultiIndex.from_frame(existing.astype(float)))
+        report.reject(pd.Series(already, index=df.index), 'user is already a member of this pool')
+
+        # Capacity: walk the otherwise-valid rows in file order, each accepted row using up its pool's
+        # remaining quantity (a row rejected here leaves the room for the rows after it)
+        valid = report.valid_mask(df.index)
+        remaining = (pools['target_quantity'] - pools['current_quantity']).to_dict()
+        over = pd.Series(False, index=df.index)
+        for row, pid, qty in zip(df.index[valid], pool_id[valid], quantity[valid]):
+            if qty > remaining[pid]:
+                over[row] = True
+            else:
+                remaining[pid] -= qty
+        report.reject(over, 'exceeds pool target quantity')
+
+        valid = report.valid_mask(df.index)
+        if strict and report.errors:
+            return report
+        accepted = pd.DataFrame({
+            'user_id': user_ids, 'pool_id': pool_id, 'quantity_contributed': quantity,
+            'join_date': join_date.dt.date,
+        })[valid].astype({'user_id': int, 'pool_id': int, 'quantity_contributed': int})
+
+        if len(accepted):
+            db.session.execute(insert(PoolMembership), accepted.assign(status='active').to_dict('records'))
+            added = accepted.groupby('pool_id')['quantity_contributed'].sum()
+            table = Pool.__table__
+            result = db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('pid'),
+                       table.c.current_quantity + bindparam('added') <= table.c.target_quantity)
+                .values(current_quantity=table.c.current_quantity + bindparam('added')),
+                [{'pid': int(pid), 'added': int(qty)} for pid, qty in added.items()])
+            if result.rowcount != len(added):
+                db.session.rollback()
+                raise RuntimeError('Pool quantities changed during import; nothing was imported')
+            bump_versions('pools', 'memberships')
+        db.session.commit()
+        report.imported = len(accepted)
+        s.set(imported=report.imported, rejected=len(report.errors))
+    return report
+
+
+def export_query(kind):
+    """Core select for an export, in import-compatible column order"""
+    if kind == 'pools':
+        return select(Pool.id, Pool.name, Pool.commodity, Pool.target_quantity, Pool.target_price, Pool.deadline,
+                      Pool.current_quantity, Pool.status).order_by(Pool.id)
+    return (select(PoolMembership.id, PoolMembership.pool_id, User.username, PoolMembership.quantity_contributed,
+                   PoolMembership.join_date, PoolMembership.status)
+            .join(User, User.id == PoolMembership.user_id).order_by(PoolMembership.id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import/export of pools and memberships')
+    commands = parser.add_subparsers(dest='command', required=True)
+    importer = commands.add_parser('import', help='load pools or memberships from CSV/JSON')
+    importer.add_argument('kind', choices=['pools', 'memberships'])
+    importer.add_argument('path')
+    importer.add_argument('--creator', default='admin', help='username recorded as creator of imported pools')
+    importer.add_argument('--strict', action='store_true', help='import nothing if any row is invalid')
+    exporter = commands.add_parser('export', help='write pools or memberships to a CSV/JSON file')
+    exporter.add_argument('kind', choices=['pools', 'memberships'])
+    exporter.add_argument('path')
+    args = parser.parse_args()
+
+    from app import create_app, commodities
+    with create_app().app_context():
+        fmt = 'json' if args.path.endswith('.json') else 'csv'
+        if args.command == 'export':
+            # Read from the replica when one is configured, off the primary's write path
+            with replica_reads(), open(args.path, 'w', encoding='utf-8', newline='') as f:
+                for chunk in stream_rows(export_query(args.kind), fmt):
+                    f.write(chunk)
+            print(f"✅ Exported {args.kind} to {args.path}")
+            return
+
+        with open(args.path, encoding='utf-8') as f:
+            df = read_rows(f, fmt)
+        start = datetime.now()
+        if args.kind == 'pools':
+            creator = User.query.filter_by(username=args.creator).first()
+            if creator is None:
+                sys.exit(f"❌ Unknown creator: {args.creator}")
+            report = import_pools(df, creator.id, list(commodities.commodities), strict=args.strict)
+        else:
+            report = import_memberships(df, strict=args.strict)
+
+        summary = report.to_dict()
+        print(f"✅ Imported {summary['imported']} of {summary['total']} {args.kind} "
+              f"in {(datetime.now() - start).total_seconds():.2f}s")
+        for error in summary['errors'][:20]:
+            print(f"   row {error['row']}: {'; '.join(error['errors'])}")
+        if summary['rejected'] > 20:
+            print(f"   ... {summary['rejected'] - 20} more rejected rows")
+
+
+if __name__ == '__main__':
+    main()
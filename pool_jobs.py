@@ -0,0 +1,143 @@
+"""Batch jobs over export pools (run by an admin or from cron).
+
+Usage (from the repository root):
+    python pool_jobs.py optimize
+    python pool_jobs.py optimize --start-date 2025-09-01
+    python pool_jobs.py expire
+    python pool_jobs.py expire --today 2026-01-01
+"""
+import argparse
+import threading
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import insert, literal, select, update
+from models import db, Pool, PoolRecommendation, PoolTransition
+from fragment_cache import bump_versions
+from src.models.pool_optimizer import PoolSaleOptimizer
+from src.tracing import span, logger
+
+
+def optimize_active_pools(registry, start_date=None, optimizer=None):
+    """Recompute the sale-timing recommendation of every active pool.
+
+    One forecast per commodity covers all its pools up to the latest deadline;
+    results are upserted into PoolRecommendation in a single commit. Pools whose
+    commodity has no trained model are skipped. Returns the number updated.
+    """
+    start_date = (datetime.strptime(start_date, '%Y-%m-%d').date() if isinstance(start_date, str)
+                  else start_date or datetime.now().date())
+    optimizer = optimizer or PoolSaleOptimizer()
+    available = {c.key for c in registry.available()}
+
+    by_commodity = defaultdict(list)
+    for pool in Pool.query.filter_by(status='active').all():
+        by_commodity[pool.commodity].append(pool)
+    existing = {rec.pool_id: rec for rec in PoolRecommendation.query.all()}
+
+    updated = 0
+    with span('optimize_active_pools', commodities=len(by_commodity)) as s:
+        for commodity, pools in by_commodity.items():
+            if commodity not in available:
+                logger.warning("No %s model; skipping %d pools", commodity, len(pools))
+                continue
+            days = PoolSaleOptimizer.horizon([p.deadline for p in pools], start_date)
+            forecast_df = registry.forecaster(commodity).forecast_prices(days_ahead=days, start_date=start_date)
+            results = optimizer.optimize(forecast_df, [p.deadline for p in pools], [p.target_price for p in pools])
+
+            for pool, result in zip(pools, results):
+                rec = existing.get(pool.id)
+                if rec is None:
+                    rec = PoolRecommendation(pool_id=pool.id)
+                    db.session.add(rec)
+                for field, value in result.items():
+                    setattr(rec, field, value)
+                rec.forecast_start = start_date
+                rec.computed_at = datetime.utcnow()
+            updated += len(pools)
+        db.session.commit()
+        s.set(pools=updated)
+    return updated
+
+
+def expire_pools(today=None):
+    """Close active pools that are full or past their deadline, in bulk.
+
+    Each transition is one INSERT ... SELECT into PoolTransition followed by one
+    UPDATE over the same condition, all in a single transaction, so the cost
+    does not grow with the number of pools touched. A full pool past its
+    deadline counts as filled. Returns {to_status: count}.
+    """
+    today = (datetime.strptime(today, '%Y-%m-%d').date() if isinstance(today, str)
+             else today or datetime.now().date())
+    now = datetime.utcnow()
+    transitions = [
+        ('filled', Pool.current_quantity >= Pool.target_quantity, 'target quantity reached'),
+        ('expired', Pool.deadline < today, 'deadline passed'),
+    ]
+
+    counts = {}
+    with span('expire_pools', today=today.isoformat()) as s:
+        for to_status, condition, reason in transitions:
+            due = (Pool.status == 'active', condition)
+            db.session.execute(insert(PoolTransition).from_select(
+                ['pool_id', 'from_status', 'to_status', 'reason', 'created_at'],
+                select(Pool.id, literal('active'), literal(to_status), literal(reason), literal(now)).where(*due)))
+            result = db.session.execute(update(Pool).where(*due).values(status=to_status)
+                                        .execution_options(synchronize_session=False))
+            counts[to_status] = result.rowcount
+        if any(counts.values()):
+            bump_versions('pools')  # bulk UPDATEs skip the flush hook that versions cached fragments
+        db.session.commit()
+        s.set(**counts)
+    return counts
+
+
+class PoolMaintenanceScheduler:
+    """Daemon thread that runs expire_pools every `interval` seconds (first run at start)"""
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='pool-maintenance', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        while not self.stopped.is_set():
+            try:
+                with self.app.app_context():
+                    counts = expire_pools()
+                if any(counts.values()):
+                    logger.info("Pool maintenance: %s", counts)
+            except Exception:
+                logger.exception("Pool maintenance failed")
+            self.stopped.wait(self.interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch jobs over export pools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    optimize = commands.add_parser('optimize', help='recompute sale timing for all active pools')
+    optimize.add_argument('--start-date', default=None, help='forecast from this date (default: today)')
+    expire = commands.add_parser('expire', help='close active pools that are full or past their deadline')
+    expire.add_argument('--today', default=None, help='treat this date as today (default: today)')
+    args = parser.parse_args()
+
+    from app import create_app, commodities
+    with create_app().app_context():
+        if args.command == 'optimize':
+            updated = optimize_active_pools(commodities, start_date=args.start_date)
+            print(f"✅ Sale timing updated for {updated} active pools")
+        elif args.command == 'expire':
+            counts = expire_pools(today=args.today)
+            print(f"✅ {counts['filled']} pools filled, {counts['expired']} expired")
+
+
+if __name__ == '__main__':
+    main()
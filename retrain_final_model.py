@@ -1,4 +1,8 @@
-from src.models.price_forecaster import CardamomPriceForecaster
+from src.models.price_forecaster import CardamomPriceForecaster, MAX_WARM_START_DRIFT
+from src.tracing import configure_tracing
+import argparse
+
+TUNED_MODEL_PATH = 'data/models/tuned_cardamom_model.pkl'
 
 def retrain_with_best_params():
     forecaster = CardamomPriceForecaster('data/processed/clean_auction_data.csv')
@@ -13,8 +17,34 @@ def retrain_with_best_params():
     forecaster.model = model
     
     # Save optimized model
-    forecaster.save_model('data/models/tuned_cardamom_model.pkl')
+    forecaster.save_model(TUNED_MODEL_PATH)
     print("✅ Final optimized model saved with MAPE: 0.263%")
 
+def retrain_warm_start(max_drift=MAX_WARM_START_DRIFT):
+    """Daily update: refit the saved tuned model on new rows, starting from its parameters"""
+    forecaster = CardamomPriceForecaster('data/processed/clean_auction_data.csv')
+    report = forecaster.retrain_incremental(TUNED_MODEL_PATH, max_drift=max_drift)
+    
+    print(f"🔁 Retrain mode: {report['mode']} ({report['new_rows']} new rows, {report['rows']} total)")
+    if report['mode'] == 'unchanged':
+        return
+    print(f"   Fit time: {report['fit_seconds']:.2f}s")
+    for name, drift in report['drift'].items():
+        print(f"   Drift {name}: {drift:.3f}")
+    
+    forecaster.save_model(TUNED_MODEL_PATH)
+    print(f"✅ Tuned model updated: {TUNED_MODEL_PATH}")
+
 if __name__ == "__main__":
-    retrain_with_best_params()
+    parser = argparse.ArgumentParser(description='Retrain the tuned cardamom model')
+    parser.add_argument('--warm-start', action='store_true',
+                        help='update the saved model with new data instead of a full cold fit')
+    parser.add_argument('--max-drift', type=float, default=MAX_WARM_START_DRIFT,
+                        help='relative parameter drift above which a warm start is refit cold')
+    args = parser.parse_args()
+    configure_tracing()
+    
+    if args.warm_start:
+        retrain_warm_start(args.max_drift)
+    else:
+        retrain_with_best_params()
@@ -0,0 +1,45 @@
+from flask import Blueprint, request, redirect, url_for, flash
+from flask_login import login_required, current_user
+from models import db, PriceAlert, Notification
+from alert_jobs import MAX_ALERT_DAYS
+
+from app import commodities  # Alerts are per commodity
+from src.commodities import DEFAULT_COMMODITY
+
+alerts_bp = Blueprint('alerts', __name__)
+
+@alerts_bp.route('/alerts/create', methods=['POST'])
+@login_required
+def create_alert():
+    """Subscribe to 'price above X within N days' - matched on the next model load or refresh"""
+    try:
+        commodity = commodities.get(request.form.get('commodity', DEFAULT_COMMODITY)).key
+        threshold = float(request.form['threshold_price'])
+        within_days = int(request.form['within_days'])
+        if threshold <= 0 or not 1 <= within_days <= MAX_ALERT_DAYS:
+            raise ValueError(f'price must be positive and days between 1 and {MAX_ALERT_DAYS}')
+        
+        db.session.add(PriceAlert(user_id=current_user.id, commodity=commodity,
+                                  threshold_price=threshold, within_days=within_days))
+        db.session.commit()
+        flash(f'Alert set: ₹{threshold:.0f}/kg within {within_days} days', 'success')
+    except Exception as e:
+        flash(f'Error creating alert: {str(e)}', 'error')
+    
+    return redirect(url_for('dashboard.dashboard'))
+
+@alerts_bp.route('/alerts/<int:alert_id>/cancel', methods=['POST'])
+@login_required
+def cancel_alert(alert_id):
+    alert = PriceAlert.query.filter_by(id=alert_id, user_id=current_user.id).first_or_404()
+    alert.status = 'cancelled'
+    db.session.commit()
+    flash('Alert cancelled', 'success')
+    return redirect(url_for('dashboard.dashboard'))
+
+@alerts_bp.route('/notifications/read', methods=['POST'])
+@login_required
+def mark_notifications_read():
+    Notification.query.filter_by(user_id=current_user.id, is_read=False).update({'is_read': True})
+    db.session.commit()
+    return redirect(url_for('dashboard.dashboard'))
@@ -1,35 +1,42 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from models import db, User, Pool, PoolMembership, Forecast
+from models import db, User, Pool, PoolMembership, Forecast, PriceAlert, Notification
+from decorators import admin_required, read_only
 from datetime import datetime, timedelta
 import json
 from sqlalchemy import func
 
+from app import eda_engine, commodities  # Shared EDA summary engine
+from alert_jobs import MAX_ALERT_DAYS
+from identity import user_memberships
+
 dashboard_bp = Blueprint('dashboard', __name__)
 
 @dashboard_bp.route('/dashboard')
 @login_required
+@read_only
 def dashboard():
     if current_user.is_admin():
-        # Fetch admin-wide stats
-        admin_stats = {
-            'total_users': db.session.query(func.count(User.id)).filter(User.role == 'user').scalar() or 0,
-            'total_pools': db.session.query(func.count(Pool.id)).scalar() or 0,
-            'total_forecasts': db.session.query(func.count(Forecast.id)).scalar() or 0,
-            'total_quantity': db.session.query(func.sum(Pool.current_quantity)).scalar() or 0
-        }
+        # Fetch admin-wide stats (called from the template only when its cached fragment is stale)
+        def load_admin_stats():
+            return {
+                'total_users': db.session.query(func.count(User.id)).filter(User.role == 'user').scalar() or 0,
+                'total_pools': db.session.query(func.count(Pool.id)).scalar() or 0,
+                'total_forecasts': db.session.query(func.count(Forecast.id)).scalar() or 0,
+                'total_quantity': db.session.query(func.sum(Pool.current_quantity)).scalar() or 0
+            }
         # You may want to also fetch all pools, forecasts, etc. for admin management UIs
         return render_template(
             'dashboard.html',
-            admin_stats=admin_stats,
+            load_admin_stats=load_admin_stats,
             stats=None,                # No personal stats in admin view
             pool_details=None,         # Populate if you want admin to see
-            recent_activity=Forecast.query.order_by(Forecast.created_at.desc()).limit(10).all(),
+            recent_activity=Forecast.query.order_by(Forecast.created_at.desc()).limit(10),  # run by the fragment
             recent_forecasts=None
         )
 
     # Normal user dashboard (your current logic):
-    user_pools = db.session.query(PoolMembership).filter_by(user_id=current_user.id).all()
+    user_pools = user_memberships(current_user)
     user_forecasts = db.session.query(Forecast).filter_by(user_id=current_user.id).order_by(Forecast.created_at.desc()).limit(5).all()
     
     total_quantity = sum([membership.quantity_contributed for membership in user_pools])
@@ -42,7 +49,7 @@ def dashboard():
     
     pool_details = []
     for membership in user_pools:
-        pool = db.session.query(Pool).filter_by(id=membership.pool_id).first()
+        pool = membership.pool
         if pool:
             pool_details.append({
                 'membership': membership,
@@ -52,6 +59,9 @@ def dashboard():
                 'extra_earnings': membership.quantity_contributed * (pool.target_price - 2800)
             })
     
+    price_alerts = PriceAlert.query.filter_by(user_id=current_user.id, status='active').order_by(PriceAlert.created_at.desc()).all()
+    notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.created_at.desc()).limit(5).all()
+    
     stats = {
         'active_pools': active_pools,
         'total_quantity': total_quantity,
@@ -64,5 +74,17 @@ def dashboard():
         stats=stats, 
         pool_details=pool_details,
         recent_forecasts=user_forecasts,
+        price_alerts=price_alerts,
+        notifications=notifications,
+        commodities=commodities.available(),
+        max_alert_days=MAX_ALERT_DAYS,
         admin_stats=None
     )
+
+@dashboard_bp.route('/dashboard/eda-report')
+@login_required
+@admin_required
+@read_only
+def eda_report():
+    """Cached market EDA report (JSON) - Admin only"""
+    return jsonify(eda_engine.get_report())
@@ -0,0 +1,58 @@
+import os
+from flask import Blueprint, request, jsonify
+from flask_login import login_required
+from sqlalchemy import select
+from models import Forecast, User
+from decorators import admin_required, read_only
+from exports import stream_rows, stream_frames, auction_history, export_response
+from pagination import arg_date
+
+from app import commodities  # Auction history is per commodity
+from src.commodities import DEFAULT_COMMODITY
+
+exports_bp = Blueprint('exports', __name__)
+
+def export_format():
+    fmt = request.args.get('format', 'csv')
+    return fmt if fmt in ('csv', 'json') else None
+
+@exports_bp.route('/exports/auctions')
+@login_required
+@admin_required
+@read_only
+def export_auctions():
+    """Stream the cleaned auction series of a commodity (CSV/JSON, optional date range) - Admin only"""
+    fmt = export_format()
+    try:
+        commodity = commodities.get(request.args.get('commodity', DEFAULT_COMMODITY))
+    except KeyError as e:
+        return jsonify({'error': str(e)}), 404
+    if fmt is None:
+        return jsonify({'error': 'format must be csv or json'}), 400
+    if not os.path.exists(commodity.processed_data_path):
+        return jsonify({'error': f'No processed data for {commodity.name}'}), 404
+
+    chunks = auction_history(commodity.processed_data_path, arg_date('date_from'), arg_date('date_to'))
+    return export_response(stream_frames(chunks, fmt), f'{commodity.key}_auctions', fmt)
+
+@exports_bp.route('/exports/forecasts')
+@login_required
+@admin_required
+@read_only
+def export_forecasts():
+    """Stream saved forecasts (CSV/JSON), filterable by commodity and forecast date - Admin only"""
+    fmt = export_format()
+    if fmt is None:
+        return jsonify({'error': 'format must be csv or json'}), 400
+
+    statement = (select(Forecast.id, User.username, Forecast.commodity, Forecast.forecast_date,
+                        Forecast.current_price, Forecast.optimal_price, Forecast.action,
+                        Forecast.potential_gain, Forecast.created_at)
+                 .join(User, User.id == Forecast.user_id).order_by(Forecast.id))
+    if request.args.get('commodity'):
+        statement = statement.where(Forecast.commodity == request.args['commodity'])
+    if arg_date('date_from'):
+        statement = statement.where(Forecast.forecast_date >= arg_date('date_from'))
+    if arg_date('date_to'):
+        statement = statement.where(Forecast.forecast_date <= arg_date('date_to'))
+    return export_response(stream_rows(statement, fmt), 'forecasts', fmt)
@@ -1,43 +1,93 @@
-from flask import Blueprint, render_template, request, flash
+from flask import Blueprint, render_template, request, flash, jsonify
 from flask_login import login_required, current_user
 from models import db, Forecast
+from decorators import read_only
 from datetime import datetime, timedelta
 import json
 
-from app import forecaster  # Import the loaded model
+from app import forecast_service, commodities  # Bounded worker pool around the commodity models
+from src.commodities import DEFAULT_COMMODITY
+from src.models.hold_simulator import HoldSellSimulator, apply_to_recommendation, STORAGE_PROFILES
+from config import Config
+from forecast_service import ForecastBusy
+from pagination import keyset_paginate, page_args, arg_date, wants_json
 
 forecast_bp = Blueprint('forecast', __name__)
 
+simulator = HoldSellSimulator(n_paths=Config.SIMULATION_PATHS)
+
+def lot_errors(harvest_date, quantity, storage_quality):
+    """Problems with the lot fields that would break the hold-vs-sell simulation"""
+    errors = []
+    try:
+        datetime.strptime(harvest_date, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        errors.append('Enter a valid harvest date')
+    if quantity is None or quantity <= 0:
+        errors.append('Quantity must be a whole number of kg greater than 0')
+    if storage_quality not in STORAGE_PROFILES:
+        errors.append('Choose one of the listed storage conditions')
+    return errors
+
 @forecast_bp.route('/forecast', methods=['GET', 'POST'])
 @login_required
 def forecast():
-    forecast_data, recommendation = None, None
+    forecast_data, recommendation, simulation = None, None, None
     
     # Default values for first visit
     default_values = {
         'harvest_date': (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d'),
         'quantity': 100,
         'storage_quality': 'Excellent (Air-tight, Cool)',
-        'forecast_from_date': datetime.utcnow().strftime('%Y-%m-%d')
+        'forecast_from_date': datetime.utcnow().strftime('%Y-%m-%d'),
+        'auctioneer': '',  # '' = all auction houses (pooled model)
+        'commodity': DEFAULT_COMMODITY
     }
+    available = commodities.available()
 
     if request.method == 'POST':
         # Get form values
         harvest_date = request.form.get('harvest_date', default_values['harvest_date'])
-        quantity = int(request.form.get('quantity', default_values['quantity']))
+        try:
+            quantity = int(request.form.get('quantity', default_values['quantity']))
+        except ValueError:
+            quantity = None
         storage_quality = request.form.get('storage_quality', default_values['storage_quality'])
         forecast_from_date = request.form.get('forecast_from_date', default_values['forecast_from_date'])
+        auctioneer = request.form.get('auctioneer', default_values['auctioneer'])
+        commodity = request.form.get('commodity', default_values['commodity'])
+        if commodity not in {c.key for c in available}:
+            commodity = DEFAULT_COMMODITY
 
         # Store submitted values to redisplay in form
         form_values = {
             'harvest_date': harvest_date,
             'quantity': quantity,
             'storage_quality': storage_quality,
-            'forecast_from_date': forecast_from_date
+            'forecast_from_date': forecast_from_date,
+            'auctioneer': auctioneer,
+            'commodity': commodity
         }
 
-        # Generate forecast using real model
-        forecast_df = forecaster.forecast_prices(days_ahead=30, start_date=forecast_from_date)
+        errors = lot_errors(harvest_date, quantity, storage_quality)
+        if errors:
+            for error in errors:
+                flash(error, 'error')
+            return render_template('forecast.html', forecast_data=None, recommendation=None,
+                                   form_values=form_values, quantity=quantity,
+                                   auctioneers=forecast_service.auctioneers, commodities=available), 400
+
+        # Generate forecast using real model (off the request thread)
+        try:
+            forecast_df, recommendation = forecast_service.forecast(start_date=forecast_from_date, days_ahead=30,
+                                                                  auctioneer=auctioneer or None, commodity=commodity)
+        except ForecastBusy as e:
+            flash(f'⏳ {e}', 'warning')
+            response = render_template('forecast.html', forecast_data=None, recommendation=None,
+                                       form_values=form_values, quantity=quantity,
+                                       auctioneers=forecast_service.auctioneers, commodities=available)
+            return response, 503, {'Retry-After': str(e.retry_after)}
+
         forecast_data = {
             'dates': [d.strftime('%Y-%m-%d') for d in forecast_df['date']],
             'prices': list(forecast_df['predicted_price']),
@@ -46,7 +96,9 @@ def forecast():
             'lower': list(forecast_df['lower_bound'])
         }
 
-        recommendation = forecaster.get_sell_recommendation(days_ahead=30, start_date=forecast_from_date)
+        # Hold-vs-sell on this lot: quantity, storage losses and holding costs since harvest
+        simulation = simulator.simulate(forecast_df, quantity, harvest_date, storage_quality)
+        recommendation = apply_to_recommendation(recommendation, simulation, quantity)
 
         # Save to database
         forecast_date = recommendation['optimal_sell_date']
@@ -59,7 +111,8 @@ def forecast():
             current_price=recommendation['current_price_estimate'],
             optimal_price=recommendation['optimal_price_estimate'],
             action=recommendation['action'],
-            potential_gain=recommendation['potential_gain_rs_per_kg']
+            potential_gain=recommendation['potential_gain_rs_per_kg'],
+            commodity=commodity
         )
         db.session.add(new_forecast)
         db.session.commit()
@@ -73,5 +126,57 @@ def forecast():
     return render_template('forecast.html',
                          forecast_data=json.dumps(forecast_data) if forecast_data else None,
                          recommendation=recommendation,
+                         simulation=simulation,
                          form_values=form_values,
+                         auctioneers=forecast_service.auctioneers,
+                         commodities=available,
                          quantity=quantity if 'quantity' in locals() else form_values['quantity'])
+
+def forecast_to_dict(forecast):
+    return {
+        'id': forecast.id,
+        'user_id': forecast.user_id,
+        'commodity': forecast.commodity,
+        'forecast_date': forecast.forecast_date.isoformat(),
+        'current_price': forecast.current_price,
+        'optimal_price': forecast.optimal_price,
+        'action': forecast.action,
+        'potential_gain': forecast.potential_gain,
+        'created_at': forecast.created_at.isoformat() if forecast.created_at else None,
+    }
+
+@forecast_bp.route('/forecast/history')
+@login_required
+@read_only
+def history():
+    """Saved forecasts, newest first (own for farmers, everyone's for admins), keyset-paginated"""
+    filters = {
+        'commodity': request.args.get('commodity', ''),
+        'action': request.args.get('action', ''),
+        'date_from': arg_date('date_from'),
+        'date_to': arg_date('date_to'),
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float),
+    }
+    query = Forecast.query
+    if not current_user.is_admin():
+        query = query.filter(Forecast.user_id == current_user.id)
+    if filters['commodity']:
+        query = query.filter(Forecast.commodity == filters['commodity'])
+    if filters['action']:
+        query = query.filter(Forecast.action == filters['action'])
+    if filters['date_from']:
+        query = query.filter(Forecast.forecast_date >= filters['date_from'])
+    if filters['date_to']:
+        query = query.filter(Forecast.forecast_date <= filters['date_to'])
+    if filters['min_price'] is not None:
+        query = query.filter(Forecast.optimal_price >= filters['min_price'])
+    if filters['max_price'] is not None:
+        query = query.filter(Forecast.optimal_price <= filters['max_price'])
+
+    cursor, limit = page_args()
+    page = keyset_paginate(query, (Forecast.created_at, Forecast.id), cursor=cursor, limit=limit, descending=True)
+    if wants_json():
+        return jsonify(page.to_dict(forecast_to_dict))
+    return render_template('forecast_history.html', page=page, filters=filters,
+                           commodities=list(commodities.commodities.values()))
@@ -0,0 +1,13 @@
+from flask import Blueprint, Response, current_app
+from flask_login import login_required
+from decorators import admin_required
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics')
+@login_required
+@admin_required
+def metrics():
+    """Per-route performance histograms in Prometheus text format - Admin only"""
+    registry = current_app.extensions['request_metrics']
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
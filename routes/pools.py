@@ -1,64 +1,167 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from models import db, Pool, PoolMembership
-from decorators import admin_required
+from models import db, Pool, PoolMembership, PoolRecommendation
+from decorators import admin_required, read_only
 from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import contains_eager
+
+from app import commodities  # Commodity registry (pools are tagged by commodity)
+from src.commodities import DEFAULT_COMMODITY
+from pool_jobs import optimize_active_pools
+from pool_io import read_rows, import_pools, import_memberships, export_query
+from exports import stream_rows, export_response
+from fragment_cache import bump_versions
+from pagination import keyset_paginate, page_args, arg_date, wants_json
 
 pools_bp = Blueprint('pools', __name__)
 
+MEMBERSHIPS_PREVIEW = 4  # memberships shown on /pools; the rest are on /pools/memberships
+
+def pool_filters():
+    """Pool filters from the query string (invalid values are ignored)"""
+    return {
+        'commodity': request.args.get('commodity', ''),
+        'status': request.args.get('status', 'active'),
+        'deadline_from': arg_date('deadline_from'),
+        'deadline_to': arg_date('deadline_to'),
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float),
+    }
+
+UNFILTERED = {'commodity': '', 'status': 'all', 'deadline_from': None, 'deadline_to': None,
+              'min_price': None, 'max_price': None}
+
+def apply_pool_filters(query, filters):
+    if filters['commodity']:
+        query = query.filter(Pool.commodity == filters['commodity'])
+    if filters['status'] != 'all':
+        query = query.filter(Pool.status == filters['status'])
+    if filters['deadline_from']:
+        query = query.filter(Pool.deadline >= filters['deadline_from'])
+    if filters['deadline_to']:
+        query = query.filter(Pool.deadline <= filters['deadline_to'])
+    if filters['min_price'] is not None:
+        query = query.filter(Pool.target_price >= filters['min_price'])
+    if filters['max_price'] is not None:
+        query = query.filter(Pool.target_price <= filters['max_price'])
+    return query
+
+def pool_to_dict(pool):
+    return {
+        'id': pool.id,
+        'name': pool.name,
+        'commodity': pool.commodity,
+        'status': pool.status,
+        'target_quantity': pool.target_quantity,
+        'current_quantity': pool.current_quantity,
+        'target_price': pool.target_price,
+        'deadline': pool.deadline.isoformat(),
+    }
+
+def membership_to_dict(membership):
+    return {
+        'id': membership.id,
+        'pool': pool_to_dict(membership.pool),
+        'quantity_contributed': membership.quantity_contributed,
+        'join_date': membership.join_date.isoformat() if membership.join_date else None,
+        'status': membership.status,
+    }
+
+def memberships_page(filters, cursor=None, limit=MEMBERSHIPS_PREVIEW):
+    """Current user's memberships, newest first; pool filters apply to the joined pool"""
+    query = (PoolMembership.query.join(PoolMembership.pool).options(contains_eager(PoolMembership.pool))
+             .filter(PoolMembership.user_id == current_user.id))
+    query = apply_pool_filters(query, filters)
+    return keyset_paginate(query, (PoolMembership.join_date, PoolMembership.id),
+                           cursor=cursor, limit=limit, descending=True)
+
 @pools_bp.route('/pools')
 @login_required
+@read_only
 def pools():
-    """Display pools based on user role"""
-    active_pools = Pool.query.filter_by(status='active').all()
+    """Display pools based on user role (keyset-paginated by deadline, filterable)"""
+    filters = pool_filters()
+    cursor, limit = page_args()
+    page = keyset_paginate(apply_pool_filters(Pool.query, filters), (Pool.deadline, Pool.id),
+                           cursor=cursor, limit=limit)
+    if wants_json():
+        return jsonify(page.to_dict(pool_to_dict))
+    
+    page_ids = [pool.id for pool in page.items]
+    # Sale timing comes from the batch optimizer's table, not computed per view
+    recommendations = {
+        rec.pool_id: rec for rec in PoolRecommendation.query.filter(PoolRecommendation.pool_id.in_(page_ids))
+    }
+    # Current user's memberships among the pools on this page
+    membership_by_pool = {
+        membership.pool_id: membership for membership in PoolMembership.query.filter(
+            PoolMembership.user_id == current_user.id, PoolMembership.pool_id.in_(page_ids))
+    }
     
     # Prepare pool data with membership info
     pool_data = []
-    for pool in active_pools:
+    for pool in page.items:
         # Check if current user is a member
-        membership = PoolMembership.query.filter_by(
-            user_id=current_user.id, 
-            pool_id=pool.id
-        ).first()
-        
-        progress = (pool.current_quantity / pool.target_quantity) * 100
+        membership = membership_by_pool.get(pool.id)
         
+        # Member count, creator and progress are read inside the cached pool-card fragment
         pool_info = {
             'pool': pool,
             'is_member': membership is not None,
             'user_contribution': membership.quantity_contributed if membership else 0,
-            'members_count': pool.memberships.count(),
-            'progress': progress,
-            'creator_name': pool.creator.name  # Now properly referenced
+            'recommendation': recommendations.get(pool.id)
         }
         pool_data.append(pool_info)
     
-    # Get user's pool memberships
+    # Latest few of the user's pool memberships (all of them on /pools/memberships)
+    memberships = memberships_page(UNFILTERED)
     user_pools = []
-    if current_user.pool_memberships:
-        for membership in current_user.pool_memberships:
-            pool = membership.pool
-            progress = (pool.current_quantity / pool.target_quantity) * 100
-            user_pools.append({
-                'pool': pool,
-                'membership': membership,
-                'progress': progress,
-                'exporters': []  # Add exporter logic if needed
-            })
+    for membership in memberships.items:
+        pool = membership.pool
+        progress = (pool.current_quantity / pool.target_quantity) * 100
+        user_pools.append({
+            'pool': pool,
+            'membership': membership,
+            'progress': progress,
+            'exporters': []  # Add exporter logic if needed
+        })
     
     return render_template('pools.html', 
                          active_pools=pool_data, 
+                         page=page,
+                         filters=filters,
                          user_pools=user_pools,
+                         more_memberships=memberships.next_cursor is not None,
+                         commodities=list(commodities.commodities.values()),
+                         selected_commodity=filters['commodity'],
                          default_deadline=(datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d'))
 
+@pools_bp.route('/pools/memberships')
+@login_required
+@read_only
+def memberships():
+    """The current user's pool memberships, newest first (keyset-paginated, filterable)"""
+    filters = pool_filters()
+    if 'status' not in request.args:
+        filters['status'] = 'all'
+    cursor, limit = page_args()
+    page = memberships_page(filters, cursor=cursor, limit=limit)
+    if wants_json():
+        return jsonify(page.to_dict(membership_to_dict))
+    return render_template('memberships.html', page=page, filters=filters,
+                           commodities=list(commodities.commodities.values()))
+
 @pools_bp.route('/pools/create', methods=['POST'])
 @login_required
 @admin_required  # NEW: Admin only
 def create_pool():
     """Create new pool - Admin only"""
     try:
+        commodity = commodities.get(request.form.get('commodity', DEFAULT_COMMODITY)).key
         pool = Pool(
             name=request.form['pool_name'],
+            commodity=commodity,
             target_quantity=float(request.form['target_quantity']),
             target_price=float(request.form['target_price']),
             deadline=datetime.strptime(request.form['deadline'], '%Y-%m-%d').date(),
@@ -74,6 +177,71 @@ def create_pool():
     
     return redirect(url_for('pools.pools'))
 
+@pools_bp.route('/pools/optimize', methods=['POST'])
+@login_required
+@admin_required
+def optimize_pools():
+    """Recompute sale timing for all active pools - Admin only"""
+    try:
+        updated = optimize_active_pools(commodities)
+        flash(f'Sale timing updated for {updated} active pools', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error optimizing pools: {str(e)}', 'error')
+    
+    return redirect(url_for('pools.pools'))
+
+@pools_bp.route('/pools/import', methods=['POST'])
+@login_required
+@admin_required
+def import_pool_data():
+    """Bulk import pools or memberships from an uploaded CSV/JSON file - Admin only"""
+    kind = request.form.get('kind', 'pools')
+    upload = request.files.get('file')
+    if kind not in ('pools', 'memberships') or upload is None or not upload.filename:
+        if wants_json():
+            return jsonify({'error': 'kind (pools|memberships) and file are required'}), 400
+        flash('Choose a CSV or JSON file to import', 'error')
+        return redirect(url_for('pools.pools'))
+    
+    try:
+        fmt = 'json' if upload.filename.lower().endswith('.json') else 'csv'
+        df = read_rows(upload.stream, fmt)
+        strict = request.form.get('strict') == 'on'
+        if kind == 'pools':
+            report = import_pools(df, current_user.id, list(commodities.commodities), strict=strict)
+        else:
+            report = import_memberships(df, strict=strict)
+    except Exception as e:
+        db.session.rollback()
+        if wants_json():
+            return jsonify({'error': str(e)}), 400
+        flash(f'Error importing {kind}: {str(e)}', 'error')
+        return redirect(url_for('pools.pools'))
+    
+    summary = report.to_dict()
+    if wants_json():
+        return jsonify(summary)
+    flash(f"Imported {summary['imported']} of {summary['total']} {kind}", 'success' if summary['imported'] else 'warning')
+    for error in summary['errors'][:5]:
+        flash(f"Row {error['row']}: {'; '.join(error['errors'])}", 'error')
+    if summary['rejected'] > 5:
+        flash(f"{summary['rejected'] - 5} more rows rejected (import with ?format=json for the full report)", 'error')
+    return redirect(url_for('pools.pools'))
+
+@pools_bp.route('/pools/export')
+@login_required
+@admin_required
+@read_only
+def export_pool_data():
+    """Stream all pools or memberships as CSV/JSON (same columns the importer reads) - Admin only"""
+    kind = request.args.get('kind', 'pools')
+    fmt = request.args.get('format', 'csv')
+    if kind not in ('pools', 'memberships') or fmt not in ('csv', 'json'):
+        return jsonify({'error': 'kind must be pools|memberships and format csv|json'}), 400
+    
+    return export_response(stream_rows(export_query(kind), fmt), kind, fmt)
+
 @pools_bp.route('/pools/<int:pool_id>/delete', methods=['POST'])
 @login_required
 @admin_required  # NEW: Admin only
@@ -116,10 +284,23 @@ def join_pool():
             flash('You are already a member of this pool', 'warning')
             return redirect(url_for('pools.pools'))
         
-        # Check if adding quantity exceeds target
-        if pool.current_quantity + quantity > pool.target_quantity:
+        if pool.status != 'active':
+            flash('This pool is no longer open', 'error')
+            return redirect(url_for('pools.pools'))
+        
+        # Add the quantity only if it still fits: one guarded UPDATE, so concurrent joins can neither
+        # lose each other's quantity nor both pass the capacity check
+        table = Pool.__table__
+        added = db.session.execute(
+            update(table)
+            .where(table.c.id == pool_id, table.c.status == 'active',
+                   table.c.current_quantity + quantity <= table.c.target_quantity)
+            .values(current_quantity=table.c.current_quantity + quantity)).rowcount
+        if not added:
+            db.session.rollback()
             flash('Quantity exceeds pool target', 'error')
             return redirect(url_for('pools.pools'))
+        bump_versions('pools')  # the bulk UPDATE skips the flush hook that versions cached fragments
         
         # Create membership
         membership = PoolMembership(
@@ -128,9 +309,6 @@ def join_pool():
             quantity_contributed=quantity
         )
         
-        # Update pool quantity
-        pool.current_quantity += quantity
-        
         db.session.add(membership)
         db.session.commit()
         
@@ -1,24 +1,52 @@
-
-from src.data_processing.data_cleaner import CardamomDataCleaner
+import argparse
+from src.commodities import CommodityRegistry, DEFAULT_COMMODITY
 from src.data_processing.feature_engineer import PriceFeatureEngineer
+from src.pipeline_cache import add_cache_arguments, cache_from_args
+from src.tracing import configure_tracing
+
+registry = CommodityRegistry()
+parser = add_cache_arguments(argparse.ArgumentParser(description='Clean and feature-engineer auction data'))
+parser.add_argument('--commodity', choices=list(registry.commodities), default=DEFAULT_COMMODITY)
+args = parser.parse_args()
+configure_tracing()
+cache = cache_from_args(args)
 
 # File paths
-raw_path = 'data/raw/cardamom_auction_data.csv'
-processed_path = 'data/processed/clean_auction_data.csv'
+commodity = registry.get(args.commodity)
+raw_path = commodity.raw_data_path
+processed_path = commodity.processed_data_path
+quarantine_path = processed_path.replace('clean_auction_data', 'quarantined_rows')
+feature_engineered_path = processed_path.replace('clean_auction_data', 'feature_engineered_data')
 
-# Step 1: Clean data
-cleaner = CardamomDataCleaner(raw_path)
-df_clean = cleaner.process_data()
-cleaner.save_processed_data(processed_path)
+# Step 1: Clean data (skipped when the raw file, column layout and validation rules are unchanged)
+cleaner = commodity.cleaner(quarantine_path=quarantine_path)
+clean_stage = cache.run(
+    'clean',
+    cleaner.process_data,
+    depends_on=[cache.file_token(raw_path)],
+    params={'rules': [repr(rule) for rule in cleaner.validator.rules],
+            'column_mapping': commodity.column_mapping,
+            'date': [commodity.date_column, commodity.date_format]}
+)
 
 # Step 2: Feature engineering
-fe = PriceFeatureEngineer(df_clean)
-df_features = fe.create_ml_features()
+feature_stage = cache.run(
+    'features',
+    lambda: PriceFeatureEngineer(clean_stage.value).create_ml_features(),
+    depends_on=[clean_stage]
+)
+
+if args.dry_run:
+    print('🧪 Dry run - pipeline stages:')
+    print(cache.report())
+else:
+    cleaner.processed_data = clean_stage.value
+    cleaner.save_processed_data(processed_path)
 
-# Save feature engineered data
-feature_engineered_path = 'data/processed/feature_engineered_data.csv'
-df_features.to_csv(feature_engineered_path, index=False)
+    # Save feature engineered data
+    feature_stage.value.to_csv(feature_engineered_path, index=False)
 
-print('✅ Data cleaning & feature engineering complete!')
-print(f'Saved cleaned data at: {processed_path}')
-print(f'Saved feature engineered data at: {feature_engineered_path}')
+    print(cache.report())
+    print('✅ Data cleaning & feature engineering complete!')
+    print(f'Saved cleaned data at: {processed_path}')
+    print(f'Saved feature engineered data at: {feature_engineered_path}')
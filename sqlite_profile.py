@@ -0,0 +1,129 @@
+"""Production profile for SQLite deployments.
+
+Every connection gets WAL journaling (readers never block the writer and vice
+versa), a busy timeout, synchronous=NORMAL (durable at checkpoints, safe with
+WAL) and a memory-mapped read window. Write transactions on db.session go
+through a SerializedWriter: a session takes it before its first flush or DML
+statement and holds it until the transaction ends, so concurrent joins and
+forecast inserts queue in order instead of polling SQLite's busy handler and
+failing with "database is locked" once the timeout runs out.
+
+WAL is persistent in the database file; switching SQLITE_PROFILE back to 'off'
+leaves an existing database in WAL mode.
+"""
+import os
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+try:
+    import fcntl  # cross-process writer lock where available (not on Windows)
+except ImportError:
+    fcntl = None
+
+POLL_INTERVAL_S = 0.002  # between non-blocking attempts at another process's writer lock
+
+
+class SerializedWriter:
+    """One write transaction at a time, across threads and (with fcntl) worker processes"""
+
+    def __init__(self, lock_path, timeout):
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.fd = None
+        self.pid = None
+
+    def _file(self):
+        # Reopened after fork: flock ownership is per open file description
+        if self.fd is None or self.pid != os.getpid():
+            self.fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.pid = os.getpid()
+        return self.fd
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        if not self.lock.acquire(timeout=self.timeout):
+            raise self._busy()
+        if fcntl is None:
+            return
+        # Polled with LOCK_NB so a stuck holder in another process costs a timeout, not a hung worker.
+        # A crashed holder's lock is released by the kernel
+        while True:
+            try:
+                fcntl.flock(self._file(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                pass
+            if time.monotonic() >= deadline:
+                self.lock.release()
+                raise self._busy()
+            time.sleep(POLL_INTERVAL_S)
+
+    @staticmethod
+    def _busy():
+        return OperationalError('acquire writer', None, Exception('database writer is busy'))
+
+    def release(self):
+        if fcntl is not None and self.fd is not None and self.pid == os.getpid():
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.lock.release()
+
+
+def set_pragmas(engine, busy_timeout_ms, mmap_bytes):
+    @event.listens_for(engine, 'connect')
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout_ms)}')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA mmap_size={int(mmap_bytes)}')
+        cursor.close()
+
+
+def _writer():
+    return current_app.extensions.get('sqlite_writer') if has_app_context() else None
+
+
+def _begin_write(session):
+    writer = _writer()
+    if writer is not None and 'sqlite_writer' not in session.info:
+        writer.acquire()
+        session.info['sqlite_writer'] = writer
+
+
+def _before_flush(session, flush_context, instances):
+    _begin_write(session)
+
+
+def _before_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _begin_write(orm_execute_state.session)
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None and 'sqlite_writer' in session.info:
+        session.info.pop('sqlite_writer').release()
+
+
+def init_sqlite_profile(app, db):
+    """Apply the profile to SQLite engines (call right after db.init_app, before any connection)"""
+    if app.config.get('SQLITE_PROFILE', 'production') != 'production':
+        return None
+    with app.app_context():
+        engines = {key: engine for key, engine in db.engines.items() if engine.dialect.name == 'sqlite'}
+    for engine in engines.values():
+        set_pragmas(engine, app.config['SQLITE_BUSY_TIMEOUT_MS'], app.config['SQLITE_MMAP_MB'] * 1024 * 1024)
+
+    primary = engines.get(None)
+    if primary is None or not primary.url.database or primary.url.database == ':memory:':
+        return None
+    writer = SerializedWriter(primary.url.database + '-writer.lock', app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+    app.extensions['sqlite_writer'] = writer
+    for name, listener in (('before_flush', _before_flush), ('do_orm_execute', _before_dml),
+                           ('after_transaction_end', _after_transaction_end)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
+    return writer
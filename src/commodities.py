@@ -0,0 +1,123 @@
+import os
+import threading
+from collections import OrderedDict
+from src.models.price_forecaster import CardamomPriceForecaster, MODEL_PATHS
+from src.tracing import span, logger
+
+DEFAULT_COMMODITY = 'cardamom'
+
+
+class Commodity:
+    """Where a commodity's data and model live, and how its raw auction export is laid out"""
+
+    def __init__(self, key, name, raw_data_path, processed_data_path, model_paths=None,
+                 column_mapping=None, date_column='Date of Auction', date_format='%d-%m-%Y'):
+        self.key = key
+        self.name = name
+        self.raw_data_path = raw_data_path
+        self.processed_data_path = processed_data_path
+        self.model_paths = model_paths or {
+            'prophet': f'data/models/{key}_price_model.pkl',
+            'fourier': f'data/models/{key}_price_model_fourier.pkl'
+        }
+        self.column_mapping = column_mapping  # raw header -> standard name; None = cardamom header rules
+        self.date_column = date_column
+        self.date_format = date_format
+
+    def model_path(self, backend='prophet'):
+        return self.model_paths[backend]
+
+    def cleaner(self, **kwargs):
+        from src.data_processing.data_cleaner import CardamomDataCleaner
+        return CardamomDataCleaner(self.raw_data_path, column_mapping=self.column_mapping,
+                                   date_column=self.date_column, date_format=self.date_format, **kwargs)
+
+
+COMMODITIES = [
+    Commodity('cardamom', 'Cardamom',
+              raw_data_path='data/raw/cardamom_auction_data.csv',
+              processed_data_path='data/processed/clean_auction_data.csv',
+              model_paths=MODEL_PATHS),
+    Commodity('pepper', 'Black Pepper',
+              raw_data_path='data/raw/pepper_auction_data.csv',
+              processed_data_path='data/processed/pepper_clean_auction_data.csv',
+              column_mapping={
+                  'Market': 'auctioneer',
+                  'Arrivals (Kgs)': 'total_arrival_kg',
+                  'Qty Sold (Kgs)': 'qty_sold_kg',
+                  'Max Price (Rs./Kg)': 'max_price_rs_kg',
+                  'Modal Price (Rs./Kg)': 'avg_price_rs_kg',
+                  'No.of Lots': 'num_lots'
+              },
+              date_column='Price Date'),
+]
+
+
+class CommodityRegistry:
+    """Commodities by key, with their forecasters loaded on first use.
+
+    Loaded models are kept in LRU order and evicted once their artifact sizes
+    (a proxy for resident memory) exceed `max_bytes`. Pinned commodities are
+    never evicted. Load listeners are called with the commodity key after
+    each model load (outside the registry lock).
+    """
+
+    def __init__(self, commodities=COMMODITIES, backend='prophet', max_bytes=256 * 1024 * 1024):
+        self.commodities = OrderedDict((c.key, c) for c in commodities)
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.loaded = OrderedDict()  # key -> (forecaster, size in bytes)
+        self.pinned = set()
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        if key not in self.commodities:
+            raise KeyError(f"Unknown commodity: {key}")
+        return self.commodities[key]
+
+    def available(self):
+        """Commodities with a trained model for the configured backend"""
+        return [c for c in self.commodities.values() if os.path.exists(c.model_path(self.backend))]
+
+    def on_load(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def pin(self, key):
+        self.pinned.add(key)
+
+    def loaded_bytes(self):
+        return sum(size for _, size in self.loaded.values())
+
+    def forecaster(self, key=DEFAULT_COMMODITY):
+        """Forecaster for the commodity, loading its model on first use"""
+        commodity = self.get(key)
+        with self.lock:
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+                return self.loaded[key][0]
+
+            model_path = commodity.model_path(self.backend)
+            with span('load_commodity', commodity=key):
+                forecaster = CardamomPriceForecaster(commodity.processed_data_path, backend=self.backend)
+                forecaster.load_model(model_path)
+            self.loaded[key] = (forecaster, os.path.getsize(model_path))
+            self._evict()
+
+        for listener in self.listeners:
+            listener(key)
+        return forecaster
+
+    def _evict(self):
+        for key in list(self.loaded):
+            if self.loaded_bytes() <= self.max_bytes or len(self.loaded) <= 1:
+                break
+            if key not in self.pinned:
+                del self.loaded[key]
+                logger.debug("Evicted %s model (memory cap %d bytes)", key, self.max_bytes)
+
+
+def registry_from_config(config):
+    return CommodityRegistry(backend=config.FORECAST_BACKEND,
+                             max_bytes=int(config.MODEL_CACHE_MAX_MB * 1024 * 1024))
@@ -1,10 +1,22 @@
 import pandas as pd
 import numpy as np
+from src.tracing import span, logger
+from src.data_processing.validation import default_auction_validator
+
+# Standardized columns that must be numeric, whatever the raw header was
+NUMERIC_COLUMNS = ['num_lots', 'total_arrival_kg', 'qty_sold_kg', 'max_price_rs_kg', 'avg_price_rs_kg']
 
 class CardamomDataCleaner:
-    def __init__(self, raw_data_path):
+    def __init__(self, raw_data_path, validator=None, quarantine_path=None,
+                 column_mapping=None, date_column='Date of Auction', date_format='%d-%m-%Y'):
         self.raw_data_path = raw_data_path
+        self.column_mapping = column_mapping  # explicit raw -> standard names (other commodities)
+        self.date_column = date_column
+        self.date_format = date_format
         self.processed_data = None
+        self.validator = validator or default_auction_validator()
+        self.quarantine_path = quarantine_path
+        self.validation_report = None
     
     def load_raw_data(self):
         """Load raw auction data from CSV with header cleaning and numeric conversion"""
@@ -21,27 +33,35 @@ class CardamomDataCleaner:
                 'No.of Lots'
             ]
             
+            if self.column_mapping:
+                numeric_cols += [raw for raw, std in self.column_mapping.items() if std in NUMERIC_COLUMNS]
+            
             for col in numeric_cols:
                 if col in df.columns:
                     df[col] = pd.to_numeric(df[col], errors='coerce')
             
-            print(f"✅ Loaded {len(df)} records from {self.raw_data_path}")
-            print(f"📋 Column names found: {list(df.columns)}")
+            logger.info("Loaded %d records from %s", len(df), self.raw_data_path)
+            logger.debug("Column names found: %s", list(df.columns))
             return df
         except FileNotFoundError:
-            print(f"❌ File not found: {self.raw_data_path}")
+            logger.error("File not found: %s", self.raw_data_path)
             return None
     
     def clean_dates(self, df):
         """Convert date column to proper datetime format"""
-        date_col = 'Date of Auction'
+        date_col = self.date_column
         if date_col in df.columns:
-            df['date'] = pd.to_datetime(df[date_col], format='%d-%m-%Y', errors='coerce')
+            df['date'] = pd.to_datetime(df[date_col], format=self.date_format, errors='coerce')
             df = df.drop(date_col, axis=1)
         return df
     
     def standardize_columns(self, df):
         """Rename columns to follow consistent naming convention"""
+        if self.column_mapping:
+            column_mapping = {raw: std for raw, std in self.column_mapping.items() if raw in df.columns}
+            logger.debug("Column mappings: %s", column_mapping)
+            return df.rename(columns=column_mapping)
+        
         column_mapping = {}
         
         for col in df.columns:
@@ -58,39 +78,30 @@ class CardamomDataCleaner:
             elif 'Avg.Price' in col or 'Avg Price' in col:
                 column_mapping[col] = 'avg_price_rs_kg'
         
-        print(f"🏷️  Column mappings: {column_mapping}")
+        logger.debug("Column mappings: %s", column_mapping)
         df = df.rename(columns=column_mapping)
         return df
     
     def clean_and_validate_data(self, df):
         """Enhanced data cleaning with quality validation"""
-        print("🧹 Performing enhanced data cleaning...")
+        # 1-3. Zero prices, unrealistic highs (>₹5000) and negative volumes,
+        #      evaluated together in one vectorized pass
+        report = self.validator.validate(df)
+        self.validation_report = report
+        actions = {'nullify': 'replacing with NaN', 'drop': 'dropping rows', 'flag': 'flagged only'}
+        for rule in report.rules:
+            count = report.counts[rule.name]
+            if count > 0:
+                logger.info("Found %d %s - %s", count, rule.description, actions[rule.action])
+        
+        if self.quarantine_path:
+            quarantined = self.validator.quarantine(df, report, self.quarantine_path)
+            if quarantined:
+                logger.info("Quarantined %d rows to %s", quarantined, self.quarantine_path)
+        
+        df = self.validator.apply(df, report)
         
-        # 1. Handle zero prices (replace with NaN)
         price_columns = ['avg_price_rs_kg', 'max_price_rs_kg']
-        for col in price_columns:
-            if col in df.columns:
-                zero_count = (df[col] == 0).sum()
-                if zero_count > 0:
-                    print(f"   ⚠️  Found {zero_count} zero values in {col} - replacing with NaN")
-                    df[col] = df[col].replace(0, np.nan)
-        
-        # 2. Remove unrealistic price outliers (>₹5000 or negative)
-        for col in price_columns:
-            if col in df.columns:
-                outlier_high = (df[col] > 5000).sum()
-                if outlier_high > 0:
-                    print(f"   🔥 Removing {outlier_high} unrealistic high prices (>₹5000) from {col}")
-                    df.loc[df[col] > 5000, col] = np.nan
-        
-        # 3. Handle volume data quality
-        volume_columns = ['total_arrival_kg', 'qty_sold_kg']
-        for col in volume_columns:
-            if col in df.columns:
-                negative_count = (df[col] < 0).sum()
-                if negative_count > 0:
-                    print(f"   📦 Removing {negative_count} negative volumes from {col}")
-                    df.loc[df[col] < 0, col] = np.nan
         
         # 4. Interpolate missing prices (use ffill/bfill instead of deprecated method)
         for col in price_columns:
@@ -99,7 +110,7 @@ class CardamomDataCleaner:
                 df[col] = df[col].ffill().bfill()  # Updated method
                 after_missing = df[col].isna().sum()
                 if before_missing > after_missing:
-                    print(f"   💉 Imputed {before_missing - after_missing} missing values in {col}")
+                    logger.info("Imputed %d missing values in %s", before_missing - after_missing, col)
         
         # 5. Remove rows where both price and volume are completely missing
         critical_columns = ['avg_price_rs_kg', 'total_arrival_kg']
@@ -108,7 +119,7 @@ class CardamomDataCleaner:
         rows_after = len(df)
         
         if rows_before - rows_after > 0:
-            print(f"   🗑️  Removed {rows_before - rows_after} rows with no useful data")
+            logger.info("Removed %d rows with no useful data", rows_before - rows_after)
         
         return df
     
@@ -128,24 +139,25 @@ class CardamomDataCleaner:
     
     def process_data(self):
         """Main processing pipeline"""
-        print("🔄 Starting data processing...")
-        
         # Load raw data
-        df = self.load_raw_data()
+        with span('load', path=self.raw_data_path) as s:
+            df = self.load_raw_data()
+            s.set(rows=len(df) if df is not None else 0)
         if df is None:
             return None
         
-        # Apply cleaning steps IN CORRECT ORDER
-        df = self.clean_dates(df)
-        df = self.standardize_columns(df)      # ✅ Rename columns FIRST
-        df = self.calculate_market_metrics(df) # ✅ Then use renamed columns
-        
-        # Sort by date and remove invalid dates
-        df = df.dropna(subset=['date'])
-        df = df.sort_values('date').reset_index(drop=True)
+        with span('clean', rows_in=len(df)) as s:
+            # Apply cleaning steps IN CORRECT ORDER
+            df = self.clean_dates(df)
+            df = self.standardize_columns(df)      # ✅ Rename columns FIRST
+            df = self.calculate_market_metrics(df) # ✅ Then use renamed columns
+            
+            # Sort by date and remove invalid dates
+            df = df.dropna(subset=['date'])
+            df = df.sort_values('date').reset_index(drop=True)
+            s.set(rows_out=len(df))
         
         self.processed_data = df
-        print(f"✅ Data processing complete. {len(df)} records processed.")
         
         return df
     
@@ -153,6 +165,6 @@ class CardamomDataCleaner:
         """Save cleaned data to CSV"""
         if self.processed_data is not None:
             self.processed_data.to_csv(output_path, index=False)
-            print(f"💾 Processed data saved to: {output_path}")
+            logger.info("Processed data saved to: %s", output_path)
         else:
-            print("❌ No processed data to save. Run process_data() first.")
+            logger.error("No processed data to save. Run process_data() first.")
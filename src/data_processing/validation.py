@@ -0,0 +1,177 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Comparison operators a rule may use. Each maps to a vectorized numpy ufunc
+# so that every rule sharing an operator is evaluated in one broadcast.
+RULE_OPERATORS = {
+    'eq': np.equal,
+    'ne': np.not_equal,
+    'gt': np.greater,
+    'ge': np.greater_equal,
+    'lt': np.less,
+    'le': np.less_equal,
+}
+
+
+class ValidationRule:
+    """A declarative check: rows where `column <op> value` holds are violations"""
+
+    def __init__(self, name, column, op, value, action='nullify', description=None):
+        if op not in RULE_OPERATORS:
+            raise ValueError(f"Unknown operator '{op}' for rule '{name}'")
+        if action not in ('nullify', 'drop', 'flag'):
+            raise ValueError(f"Unknown action '{action}' for rule '{name}'")
+        self.name = name
+        self.column = column
+        self.op = op
+        self.value = float(value)
+        self.action = action
+        self.description = description or f"{column} {op} {value}"
+
+    def __repr__(self):
+        return f"ValidationRule({self.name!r}, {self.column!r}, {self.op!r}, {self.value!r})"
+
+
+class ValidationReport:
+    """Compact result of a validation pass"""
+
+    def __init__(self, rules, violations, index, examples):
+        self.rules = rules
+        self.violations = violations      # (n_rows, n_rules) boolean matrix
+        self.index = index                # original frame index, positional
+        self.examples = examples          # rule name -> DataFrame of first N rows
+
+    @property
+    def counts(self):
+        totals = self.violations.sum(axis=0)
+        return {rule.name: int(total) for rule, total in zip(self.rules, totals)}
+
+    @property
+    def row_indices(self):
+        """Positional row indices (numpy arrays) violating each rule"""
+        return {rule.name: np.flatnonzero(self.violations[:, i])
+                for i, rule in enumerate(self.rules)}
+
+    @property
+    def any_violation(self):
+        """Boolean mask of rows violating at least one rule"""
+        return self.violations.any(axis=1)
+
+    def mask_for(self, rule_name):
+        for i, rule in enumerate(self.rules):
+            if rule.name == rule_name:
+                return self.violations[:, i]
+        raise KeyError(rule_name)
+
+    def to_dict(self):
+        """JSON-friendly summary (indices as lists, examples as records)"""
+        return {
+            'total_rows': int(self.violations.shape[0]),
+            'rows_with_violations': int(self.any_violation.sum()),
+            'counts': self.counts,
+            'row_indices': {name: idx.tolist() for name, idx in self.row_indices.items()},
+            'examples': {name: ex.to_dict(orient='records') for name, ex in self.examples.items()},
+        }
+
+
+class DataValidator:
+    """Registry of validation rules evaluated together in one vectorized pass"""
+
+    def __init__(self, rules=None, max_examples=5):
+        self.rules = []
+        self.max_examples = max_examples
+        for rule in rules or []:
+            self.register(rule)
+
+    def register(self, rule):
+        if any(existing.name == rule.name for existing in self.rules):
+            raise ValueError(f"Rule '{rule.name}' is already registered")
+        self.rules.append(rule)
+        return rule
+
+    def add_rule(self, name, column, op, value, action='nullify', description=None):
+        return self.register(ValidationRule(name, column, op, value, action, description))
+
+    def validate(self, df):
+        """Evaluate every applicable rule against df and return a ValidationReport"""
+        rules = [rule for rule in self.rules if rule.column in df.columns]
+        n_rows = len(df)
+
+        if not rules or n_rows == 0:
+            return ValidationReport(rules, np.zeros((n_rows, len(rules)), dtype=bool), df.index, {})
+
+        # Load every referenced column once as a single float matrix
+        columns = list(dict.fromkeys(rule.column for rule in rules))
+        col_pos = {col: i for i, col in enumerate(columns)}
+        values = df[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        # Gather one column per rule: (n_rows, n_rules)
+        rule_cols = np.array([col_pos[rule.column] for rule in rules])
+        thresholds = np.array([rule.value for rule in rules])
+        stacked = values[:, rule_cols]
+
+        violations = np.zeros((n_rows, len(rules)), dtype=bool)
+        ops = np.array([rule.op for rule in rules])
+        with np.errstate(invalid='ignore'):
+            for op in np.unique(ops):
+                sel = np.flatnonzero(ops == op)
+                violations[:, sel] = RULE_OPERATORS[op](stacked[:, sel], thresholds[sel])
+
+        examples = {}
+        for i, rule in enumerate(rules):
+            hits = np.flatnonzero(violations[:, i])
+            if len(hits):
+                examples[rule.name] = df.iloc[hits[:self.max_examples]]
+
+        return ValidationReport(rules, violations, df.index, examples)
+
+    def apply(self, df, report=None):
+        """Apply each rule's action (nullify offending cells, drop offending rows)"""
+        report = report if report is not None else self.validate(df)
+        df = df.copy()
+        drop_mask = np.zeros(len(df), dtype=bool)
+
+        for i, rule in enumerate(report.rules):
+            mask = report.violations[:, i]
+            if not mask.any():
+                continue
+            if rule.action == 'nullify':
+                df[rule.column] = df[rule.column].mask(mask)
+            elif rule.action == 'drop':
+                drop_mask |= mask
+
+        if drop_mask.any():
+            df = df[~drop_mask]
+        return df
+
+    def quarantine(self, df, report, output_path):
+        """Write rows violating any rule to a side file, tagged with the rules they broke"""
+        mask = report.any_violation
+        bad_rows = df[mask].copy()
+        if bad_rows.empty:
+            return 0
+
+        names = np.array([rule.name for rule in report.rules])
+        bad_matrix = report.violations[mask]
+        bad_rows['violations'] = [';'.join(names[row]) for row in bad_matrix]
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        bad_rows.to_csv(output_path, index=False)
+        return len(bad_rows)
+
+
+def default_auction_validator(max_examples=5):
+    """Validator with the auction data quality rules used by CardamomDataCleaner"""
+    validator = DataValidator(max_examples=max_examples)
+    for col in ['avg_price_rs_kg', 'max_price_rs_kg']:
+        validator.add_rule(f'{col}_zero', col, 'eq', 0,
+                           description=f'zero values in {col}')
+        validator.add_rule(f'{col}_too_high', col, 'gt', 5000,
+                           description=f'unrealistic high prices (>₹5000) in {col}')
+    for col in ['total_arrival_kg', 'qty_sold_kg']:
+        validator.add_rule(f'{col}_negative', col, 'lt', 0,
+                           description=f'negative volumes in {col}')
+    return validator
@@ -0,0 +1,291 @@
+# src/eda_summary.py
+
+import hashlib
+import io
+import json
+import os
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+DEFAULT_SUMMARY_CACHE = "data/processed/eda_summary.json"
+
+MONTH_NAMES = {1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr', 5: 'May', 6: 'Jun',
+               7: 'Jul', 8: 'Aug', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'}
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+QUARTER_SEASONS = {1: "Jan-Mar", 2: "Apr-Jun", 3: "Jul-Sep", 4: "Oct-Dec"}
+VOLUME_LABELS = ['Low Volume', 'Medium Volume', 'High Volume']
+
+CELL_KEYS = ['weekday', 'month', 'auctioneer', 'volume_bin']
+CELL_SUMS = ['price_count', 'price_sum', 'price_sumsq', 'volume_sum']
+SCALAR_SUMS = ['rows', 'corr_n', 'corr_x', 'corr_y', 'corr_xy', 'corr_xx', 'corr_yy',
+               'change_n', 'change_sum', 'change_sumsq', 'efficiency_n', 'efficiency_sum',
+               'unsold_n', 'unsold_sum']
+
+
+class EDASummaryEngine:
+    """Cardamom EDA statistics computed in one pass from mergeable partial aggregates.
+
+    Every row is folded once into a table of cells keyed by (weekday, month,
+    auctioneer, volume bin) holding counts, sums and sums of squares. Weekday,
+    month, quarter, volume-category and auctioneer statistics are roll-ups of
+    that small table, and rows appended to the processed CSV are folded in
+    without rereading the rest of the file.
+    """
+
+    def __init__(self, data_path, cache_path=DEFAULT_SUMMARY_CACHE):
+        self.data_path = data_path
+        self.cache_path = cache_path
+        self.state = None
+        self._report = None
+        self.lock = threading.Lock()  # one refresh at a time; concurrent ones would fold the same rows twice
+
+    # ---------------------------------------------------------- aggregation
+
+    def _partials(self, df, volume_edges):
+        """Partial aggregates for a chunk of rows (sorted by date)"""
+        dates = pd.to_datetime(df['date'])
+        price = pd.to_numeric(df['avg_price_rs_kg'], errors='coerce')
+        volume = pd.to_numeric(df['total_arrival_kg'], errors='coerce')
+
+        volume_bin = pd.cut(volume, bins=volume_edges, labels=False, include_lowest=True)
+        if (volume.notna() & volume_bin.isna()).any():
+            return None  # outside the stored bins; caller rebuilds from scratch
+
+        has_price = price.notna()
+        cells = pd.DataFrame({
+            'weekday': dates.dt.dayofweek,
+            'month': dates.dt.month,
+            'auctioneer': df['auctioneer'].fillna(''),
+            'volume_bin': volume_bin.fillna(-1).astype(int),
+            'price_count': has_price.astype(int),
+            'price_sum': price.fillna(0.0),
+            'price_sumsq': price.fillna(0.0) ** 2,
+            'volume_sum': volume.fillna(0.0),
+        }).groupby(CELL_KEYS, as_index=False)[CELL_SUMS].sum()
+
+        both = has_price & volume.notna()
+        x, y = volume[both], price[both]
+        clean_prices = price.dropna()
+        efficiency = pd.to_numeric(df['market_efficiency'], errors='coerce') if 'market_efficiency' in df else pd.Series(dtype=float)
+        unsold = pd.to_numeric(df['unsold_percentage'], errors='coerce') if 'unsold_percentage' in df else pd.Series(dtype=float)
+
+        return {
+            'cells': cells,
+            'scalars': {
+                'rows': len(df),
+                'corr_n': int(both.sum()), 'corr_x': float(x.sum()), 'corr_y': float(y.sum()),
+                'corr_xy': float((x * y).sum()), 'corr_xx': float((x * x).sum()), 'corr_yy': float((y * y).sum()),
+                'efficiency_n': int(efficiency.notna().sum()), 'efficiency_sum': float(efficiency.sum()),
+                'unsold_n': int(unsold.notna().sum()), 'unsold_sum': float(unsold.sum()),
+            },
+            'prices': clean_prices.to_numpy(dtype=float),
+            'date_min': dates.min(), 'date_max': dates.max(),
+            'price_min': float(price.min()) if has_price.any() else None,
+            'price_max': float(price.max()) if has_price.any() else None,
+        }
+
+    def _fold(self, partials):
+        """Merge a chunk's partial aggregates into the running state"""
+        state = self.state
+        scalars = state['scalars']
+        for name, value in partials['scalars'].items():
+            scalars[name] = scalars.get(name, 0) + value
+
+        # Daily price changes continue from the last price of the previous chunk
+        prices = partials['prices']
+        if state['last_price'] is not None and len(prices):
+            prices = np.concatenate([[state['last_price']], prices])
+        if len(prices) > 1:
+            changes = np.diff(prices) / prices[:-1] * 100
+            changes = changes[np.isfinite(changes)]
+            scalars['change_n'] = scalars.get('change_n', 0) + len(changes)
+            scalars['change_sum'] = scalars.get('change_sum', 0) + float(changes.sum())
+            scalars['change_sumsq'] = scalars.get('change_sumsq', 0) + float((changes ** 2).sum())
+        if len(prices):
+            state['last_price'] = float(prices[-1])
+
+        if len(state['cells']):
+            cells = pd.concat([state['cells'], partials['cells']], ignore_index=True)
+            state['cells'] = cells.groupby(CELL_KEYS, as_index=False)[CELL_SUMS].sum()
+        else:
+            state['cells'] = partials['cells']
+
+        for bound, pick in [('date_min', min), ('date_max', max), ('price_min', min), ('price_max', max)]:
+            new = partials[bound]
+            if new is None or pd.isna(new):
+                continue
+            new = str(new.date()) if bound.startswith('date') else new
+            state[bound] = new if state[bound] is None else pick(state[bound], new)
+
+    def build(self, df):
+        """Compute the state from a full frame"""
+        volume = pd.to_numeric(df['total_arrival_kg'], errors='coerce')
+        _, edges = pd.cut(volume, bins=3, retbins=True)
+        self.state = {
+            'cells': pd.DataFrame(columns=CELL_KEYS + CELL_SUMS),
+            'scalars': {name: 0 for name in SCALAR_SUMS},
+            'volume_edges': [float(e) for e in edges],
+            'last_price': None,
+            'date_min': None, 'date_max': None, 'price_min': None, 'price_max': None,
+        }
+        self._fold(self._partials(df, edges))
+        self._report = None
+
+    def update(self, new_rows):
+        """Fold newly appended auction rows into the summary; returns False if a rebuild is needed"""
+        if self.state is None:
+            self.build(new_rows)
+            return True
+        partials = self._partials(new_rows, self.state['volume_edges'])
+        if partials is None:
+            return False
+        self._fold(partials)
+        self._report = None
+        return True
+
+    # -------------------------------------------------------------- report
+
+    @staticmethod
+    def _rollup(cells, by):
+        grouped = cells.groupby(by)[CELL_SUMS].sum()
+        grouped = grouped[grouped['price_count'] > 0]
+        n = grouped['price_count']
+        mean = grouped['price_sum'] / n
+        var = (grouped['price_sumsq'] - grouped['price_sum'] ** 2 / n) / (n - 1)
+        grouped['mean'] = mean
+        grouped['std'] = np.sqrt(var.clip(lower=0)).where(n > 1)
+        return grouped
+
+    def report(self):
+        """JSON-serializable EDA report"""
+        if self._report is not None:
+            return self._report
+
+        state = self.state
+        cells = state['cells'].copy()
+        cells['quarter'] = (cells['month'].astype(int) - 1) // 3 + 1
+        s = state['scalars']
+
+        overall = self._rollup(cells.assign(all=0), 'all').iloc[0]
+        weekday = self._rollup(cells, 'weekday').sort_values('mean', ascending=False)
+        month = self._rollup(cells, 'month')
+        quarter = self._rollup(cells, 'quarter')
+        volume = self._rollup(cells[cells['volume_bin'] >= 0], 'volume_bin')
+        auctioneers = self._rollup(cells[cells['auctioneer'] != ''], 'auctioneer')
+        significant = auctioneers[auctioneers['price_count'] >= 10].sort_values('mean', ascending=False)
+
+        def _std(n, total, sumsq):
+            return float(np.sqrt(max(sumsq - total ** 2 / n, 0) / (n - 1))) if n > 1 else None
+
+        cov = s['corr_xy'] - s['corr_x'] * s['corr_y'] / s['corr_n'] if s['corr_n'] else 0
+        var_x = s['corr_xx'] - s['corr_x'] ** 2 / s['corr_n'] if s['corr_n'] else 0
+        var_y = s['corr_yy'] - s['corr_y'] ** 2 / s['corr_n'] if s['corr_n'] else 0
+        correlation = float(cov / np.sqrt(var_x * var_y)) if var_x > 0 and var_y > 0 else None
+
+        price_mean = float(overall['mean'])
+        price_std = float(overall['std']) if pd.notna(overall['std']) else None
+        avg_unsold = s['unsold_sum'] / s['unsold_n'] * 100 if s['unsold_n'] else None
+        by_month = month['mean'].sort_values(ascending=False)
+
+        self._report = {
+            'generated_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'rows': int(s['rows']),
+            'date_range': [state['date_min'], state['date_max']],
+            'unique_auctioneers': int(len(auctioneers)),
+            'price': {'mean': price_mean, 'std': price_std,
+                      'min': state['price_min'], 'max': state['price_max']},
+            'daily_volatility_pct': _std(s['change_n'], s['change_sum'], s['change_sumsq']),
+            'volume_price_correlation': correlation,
+            'avg_market_efficiency_pct': s['efficiency_sum'] / s['efficiency_n'] * 100 if s['efficiency_n'] else None,
+            'weekday': [{'day': WEEKDAY_NAMES[int(day)], 'mean_price': float(row['mean'])}
+                        for day, row in weekday.iterrows()],
+            'month': [{'month': MONTH_NAMES[int(m)], 'mean_price': float(row['mean'])}
+                      for m, row in month.iterrows()],
+            'quarter': [{'quarter': f"Q{int(q)}", 'season': QUARTER_SEASONS[int(q)], 'mean_price': float(row['mean'])}
+                        for q, row in quarter.iterrows()],
+            'volume_category': [{'category': VOLUME_LABELS[int(b)], 'mean_price': float(row['mean']),
+                                 'std_price': float(row['std']) if pd.notna(row['std']) else None}
+                                for b, row in volume.iterrows()],
+            'top_auctioneers': [{'auctioneer': name, 'avg_price': round(float(row['mean']), 2),
+                                 'auction_count': int(row['price_count']),
+                                 'total_volume': round(float(row['volume_sum']), 2)}
+                                for name, row in significant.head(5).iterrows()],
+            'insights': {
+                'volatility_percent': price_std / price_mean * 100 if price_std else None,
+                'daily_volatility_rs': price_std,
+                'best_months': [{'month': MONTH_NAMES[int(m)], 'mean_price': float(p)} for m, p in by_month.head(3).items()],
+                'worst_months': [{'month': MONTH_NAMES[int(m)], 'mean_price': float(p)}
+                                 for m, p in by_month.sort_values().head(3).items()],
+                'avg_unsold_pct': avg_unsold,
+                'market_demand': None if avg_unsold is None else
+                    'STRONG' if avg_unsold < 10 else 'MODERATE' if avg_unsold < 20 else 'WEAK',
+            },
+        }
+        return self._report
+
+    # ----------------------------------------------------------- caching
+
+    def _tail_digest(self, offset):
+        """Hash of the bytes just before offset, used to detect a rewritten (not appended) file"""
+        with open(self.data_path, 'rb') as f:
+            f.seek(max(0, offset - 4096))
+            return hashlib.sha256(f.read(min(offset, 4096))).hexdigest()
+
+    def save(self):
+        payload = dict(self.state)
+        payload['cells'] = self.state['cells'].to_dict(orient='records')
+        payload['report'] = self.report()
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"  # other processes save too
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def load(self):
+        if not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                payload = json.load(f)
+            report = payload.pop('report', None)
+            payload['cells'] = pd.DataFrame(payload['cells'], columns=CELL_KEYS + CELL_SUMS)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False  # corrupt cache: rebuilt from the data file
+        self._report = report
+        self.state = payload
+        return True
+
+    def get_report(self):
+        """Cached report, refreshed incrementally when rows were appended to the data file"""
+        with self.lock:
+            return self._refresh()
+
+    def _refresh(self):
+        if self.state is None:
+            self.load()
+
+        size = os.path.getsize(self.data_path)
+        state = self.state
+        if state is not None and state.get('file_offset') == size:
+            return self.report()
+
+        appended = (state is not None and state.get('file_offset')
+                    and size > state['file_offset']
+                    and self._tail_digest(state['file_offset']) == state.get('file_digest'))
+
+        if appended:
+            with open(self.data_path, 'rb') as f:
+                header = f.readline()
+                f.seek(state['file_offset'])
+                new_rows = pd.read_csv(io.BytesIO(header + f.read()))
+            if not self.update(new_rows):
+                appended = False
+
+        if not appended:
+            self.build(pd.read_csv(self.data_path))
+
+        self.state['file_offset'] = size
+        self.state['file_digest'] = self._tail_digest(size)
+        self.save()
+        return self.report()
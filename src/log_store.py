@@ -0,0 +1,258 @@
+# src/log_store.py
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _json_default(value):
+    """Serialize numpy scalars as plain numbers and anything else (dates) as text"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class FileLock:
+    """Exclusive lock on a sidecar .lock file across processes and threads (re-entrant per thread)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()  # the file lock is per process, so threads queue here first
+        self._fd = None
+        self._depth = 0  # only touched by the thread holding _thread_lock
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+            except OSError:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class LogTable:
+    """Append-only JSON-lines table with an in-memory primary and secondary index.
+
+    Every write appends one record ('put', 'update' or 'incr') to the log, so a
+    write costs O(1) regardless of table size. Reads are served from the index;
+    before serving, the table replays any records other processes appended since
+    it last looked. Once the log holds far more records than live rows it is
+    compacted into one 'put' per row.
+    """
+
+    def __init__(self, path, key_field, columns, index_fields=(), legacy_csv=None,
+                 compact_ratio=4.0, min_compact_records=1000):
+        self.path = path
+        self.key_field = key_field
+        self.columns = columns
+        self.index_fields = tuple(index_fields)
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+        self.lock = FileLock(path + '.lock')
+
+        self.rows = {}
+        self.indexes = {field: {} for field in self.index_fields}
+        self.record_count = 0
+        self.last_key = None
+        self._offset = 0
+        self._inode = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.lock:
+            if not os.path.exists(path):
+                self._create(legacy_csv)
+            self._refresh()
+
+    # ------------------------------------------------------------------ log I/O
+
+    def _create(self, legacy_csv):
+        """Start a new log, importing rows from the old CSV file if there is one"""
+        records = []
+        if legacy_csv and os.path.exists(legacy_csv):
+            legacy = pd.read_csv(legacy_csv)
+            for row in legacy.to_dict(orient='records'):
+                row = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+                records.append({'op': 'put', 'row': row})
+        self._rewrite(records)
+
+    def _rewrite(self, records):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, default=_json_default) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def _reset(self):
+        self.rows = {}
+        self.indexes = {field: {} for field in self.index_fields}
+        self.record_count = 0
+        self.last_key = None
+        self._offset = 0
+
+    def _refresh(self):
+        """Replay records appended since the last read (or everything after a compaction)"""
+        stat = os.stat(self.path)
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # partially written record; picked up on the next refresh
+                self._apply(json.loads(line))
+                self._offset += len(line.encode('utf-8'))
+
+    def _append(self, record):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            line = json.dumps(record, default=_json_default) + '\n'
+            f.write(line)
+        self._apply(json.loads(line))  # keep in-memory rows identical to a replay
+        self._offset += len(line.encode('utf-8'))
+
+    # ---------------------------------------------------------------- indexing
+
+    def _index_add(self, key, row):
+        for field in self.index_fields:
+            self.indexes[field].setdefault(row.get(field), set()).add(key)
+
+    def _index_remove(self, key, row):
+        for field in self.index_fields:
+            keys = self.indexes[field].get(row.get(field))
+            if keys is not None:
+                keys.discard(key)
+
+    def _apply(self, record):
+        self.record_count += 1
+        op = record['op']
+        if op == 'put':
+            row = record['row']
+            key = row[self.key_field]
+            if key in self.rows:
+                self._index_remove(key, self.rows[key])
+            self.rows[key] = row
+            self._index_add(key, row)
+            if self.last_key is None or key > self.last_key:
+                self.last_key = key
+            return
+
+        row = self.rows.get(record['key'])
+        if row is None:
+            return
+        self._index_remove(record['key'], row)
+        if op == 'update':
+            row.update(record['fields'])
+        elif op == 'incr':
+            row[record['field']] = (row.get(record['field']) or 0) + record['amount']
+        self._index_add(record['key'], row)
+
+    # ------------------------------------------------------------------ public
+
+    @contextmanager
+    def transaction(self):
+        """Hold the table lock with an up-to-date index (for check-then-write sequences)"""
+        with self.lock:
+            self._refresh()
+            yield self
+            self.maybe_compact()
+
+    # Reads take the lock too: a refresh mutates the index other threads are reading
+
+    def get(self, key):
+        with self.lock:
+            self._refresh()
+            row = self.rows.get(key)
+            return dict(row) if row is not None else None
+
+    def lookup(self, field, value):
+        """Rows whose indexed `field` equals value"""
+        with self.lock:
+            self._refresh()
+            return [dict(self.rows[key]) for key in self.indexes[field].get(value, ())]
+
+    def all_rows(self):
+        with self.lock:
+            self._refresh()
+            return [dict(row) for row in self.rows.values()]
+
+    def max_key(self):
+        with self.lock:
+            self._refresh()
+            return self.last_key
+
+    def put(self, row):
+        with self.lock:
+            self._refresh()
+            self._append({'op': 'put', 'row': row})
+            self.maybe_compact()
+
+    def update(self, key, **fields):
+        with self.lock:
+            self._refresh()
+            self._append({'op': 'update', 'key': key, 'fields': fields})
+            self.maybe_compact()
+
+    def increment(self, key, field, amount):
+        with self.lock:
+            self._refresh()
+            self._append({'op': 'incr', 'key': key, 'field': field, 'amount': amount})
+            self.maybe_compact()
+
+    def maybe_compact(self):
+        if (self.record_count >= self.min_compact_records
+                and self.record_count > self.compact_ratio * max(len(self.rows), 1)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log as one 'put' record per live row"""
+        with self.lock:
+            self._refresh()
+            self._rewrite({'op': 'put', 'row': row} for row in self.rows.values())
+            self._reset()
+            self._inode = None
+            self._refresh()
+
+    def to_frame(self, rows):
+        return pd.DataFrame(rows, columns=self.columns)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+# Same seasonal structure as the Prophet model: (name, period in days, fourier order)
+SEASONALITIES = [
+    ('weekly', 7.0, 3),
+    ('yearly', 365.25, 10),
+    ('quarterly', 365.25 / 4, 4),
+]
+
+
+class FourierTrendModel:
+    """Pure-NumPy stand-in for Prophet: piecewise-linear trend plus Fourier seasonality.
+
+    Fitted as a (reweighted) ridge regression with Prophet's priors: Laplace on
+    changepoint slopes (`changepoint_prior_scale`) and Normal on seasonal
+    coefficients (`seasonality_prior_scale`). predict() returns the same ds/yhat/yhat_lower/
+    yhat_upper columns. Intervals combine residual noise with closed-form trend
+    uncertainty from future changepoints, drawn at the historical rate and size.
+    """
+
+    backend_name = 'fourier'
+
+    def __init__(self, changepoint_prior_scale=0.05, seasonality_prior_scale=10.0,
+                 n_changepoints=25, changepoint_range=0.8, interval_width=0.80, seasonalities=SEASONALITIES,
+                 fit_iterations=100):
+        self.changepoint_prior_scale = changepoint_prior_scale
+        self.seasonality_prior_scale = seasonality_prior_scale
+        self.n_changepoints = n_changepoints
+        self.changepoint_range = changepoint_range
+        self.interval_width = interval_width
+        self.seasonalities = seasonalities
+        self.fit_iterations = fit_iterations
+        self.history = None
+        self.coef = None
+
+    def _scaled_time(self, ds):
+        return ((ds - self.start) / self.t_scale).to_numpy(dtype=float)
+
+    def _design(self, ds):
+        t = self._scaled_time(ds)
+        days = (ds - pd.Timestamp('1970-01-01')).dt.total_seconds().to_numpy() / 86400.0
+        columns = [np.ones_like(t), t, np.maximum(t[:, None] - self.changepoints_t[None, :], 0)]
+        for _, period, order in self.seasonalities:
+            angles = 2 * np.pi * np.arange(1, order + 1)[None, :] * days[:, None] / period
+            columns.extend([np.sin(angles), np.cos(angles)])
+        return np.column_stack(columns), t
+
+    def fit(self, df):
+        history = df[['ds', 'y']].dropna().sort_values('ds').reset_index(drop=True)
+        history['ds'] = pd.to_datetime(history['ds'])
+        self.history = history
+        self.start = history['ds'].min()
+        self.t_scale = history['ds'].max() - self.start
+        self.y_scale = float(history['y'].abs().max()) or 1.0
+
+        # Changepoints evenly spaced over the first `changepoint_range` of history
+        cp_index = np.linspace(0, int(len(history) * self.changepoint_range) - 1,
+                               self.n_changepoints + 1).round().astype(int)[1:]
+        self.changepoints_t = self._scaled_time(history['ds'].iloc[cp_index])
+
+        X, _ = self._design(history['ds'])
+        y = history['y'].to_numpy() / self.y_scale
+        cp = slice(2, 2 + self.n_changepoints)
+        seasonal = slice(2 + self.n_changepoints, X.shape[1])
+
+        # MAP fit: Laplace(changepoint_prior_scale) on changepoint slopes, as in Prophet, solved by
+        # iteratively reweighted ridge; Normal(seasonality_prior_scale) on seasonal terms. The
+        # noise variance is re-estimated each round since it sets the penalty strength.
+        gram, moment = X.T @ X, X.T @ y
+        penalty = np.zeros(X.shape[1])
+        coef = np.linalg.lstsq(X, y, rcond=None)[0]
+        for _ in range(self.fit_iterations):
+            sigma2 = float(np.mean((y - X @ coef) ** 2))
+            penalty[cp] = sigma2 / (self.changepoint_prior_scale * np.maximum(np.abs(coef[cp]), 1e-6))
+            penalty[seasonal] = sigma2 / self.seasonality_prior_scale ** 2
+            new_coef = np.linalg.solve(gram + np.diag(penalty) + 1e-10 * np.eye(len(gram)), moment)
+            converged = np.max(np.abs(new_coef - coef)) < 1e-6
+            coef = new_coef
+            if converged:
+                break
+        sigma2 = float(np.mean((y - X @ coef) ** 2))
+        self.coef = coef
+        self.sigma_obs = np.sqrt(sigma2)
+
+        # Future trend uncertainty: changepoints at the historical rate with Laplace(mean |delta|) size
+        delta = coef[2:2 + self.n_changepoints]
+        self.delta_scale = float(np.mean(np.abs(delta)))
+        self.changepoint_rate = self.n_changepoints / max(self.changepoints_t[-1], 1e-9)
+        return self
+
+    def predict(self, df):
+        ds = pd.to_datetime(pd.Series(df['ds']).reset_index(drop=True))
+        X, t = self._design(ds)
+        yhat = X @ self.coef
+
+        horizon = np.maximum(t - 1.0, 0)  # beyond the end of history (t=1)
+        trend_var = self.changepoint_rate * 2 * self.delta_scale ** 2 * horizon ** 3 / 3
+        z = ndtri(0.5 + self.interval_width / 2)
+        half_width = z * np.sqrt(self.sigma_obs ** 2 + trend_var)
+
+        return pd.DataFrame({
+            'ds': ds,
+            'trend': (X[:, :2 + self.n_changepoints] @ self.coef[:2 + self.n_changepoints]) * self.y_scale,
+            'yhat': yhat * self.y_scale,
+            'yhat_lower': (yhat - half_width) * self.y_scale,
+            'yhat_upper': (yhat + half_width) * self.y_scale,
+        })
+
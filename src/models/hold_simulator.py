@@ -0,0 +1,120 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+from src.tracing import span
+
+# Storage assumptions per form option: fraction of weight lost per day (drying/shrinkage)
+# and holding cost in ₹ per stored kg per day (rent, insurance, handling)
+STORAGE_PROFILES = {
+    'Excellent (Air-tight, Cool)': {'weight_loss_per_day': 0.0001, 'holding_cost_per_kg_day': 0.30},
+    'Good (Covered, Dry)': {'weight_loss_per_day': 0.0003, 'holding_cost_per_kg_day': 0.50},
+    'Average (Basic Storage)': {'weight_loss_per_day': 0.0008, 'holding_cost_per_kg_day': 0.80},
+}
+DEFAULT_STORAGE = 'Good (Covered, Dry)'
+
+HOLD_THRESHOLD_PCT = 2.0  # same minimum gain as get_sell_recommendation
+
+
+class HoldSellSimulator:
+    """Monte Carlo hold-vs-sell: revenue distribution for selling the lot on each forecast day.
+
+    Price paths are drawn around the forecast's yhat, with a per-day spread taken
+    from its interval (the model's uncertainty). Day-to-day shocks are AR(1)
+    correlated with `autocorrelation`, so paths wander instead of jittering.
+    Selling on day d earns price(d) times the weight left after d days of
+    storage loss since harvest, minus the holding cost accrued since harvest.
+    Everything is a (paths x days) array operation.
+    """
+
+    def __init__(self, n_paths=5000, autocorrelation=0.9, interval_width=0.80, seed=None):
+        self.n_paths = n_paths
+        self.autocorrelation = autocorrelation
+        self.interval_width = interval_width
+        self.seed = seed  # a fresh generator per call keeps the simulator safe to share across threads
+
+    def _shock_transform(self, days):
+        """Lower-triangular L with Z = eps @ L.T giving unit-variance AR(1) shocks over `days`"""
+        rho = self.autocorrelation
+        lag = np.arange(days)[:, None] - np.arange(days)[None, :]
+        weights = np.full(days, np.sqrt(1 - rho ** 2))
+        weights[0] = 1.0
+        return np.where(lag >= 0, rho ** np.clip(lag, 0, None), 0.0) * weights[None, :]
+
+    def sample_prices(self, forecast_df):
+        mean = forecast_df['predicted_price'].to_numpy(dtype=float)
+        z = ndtri(0.5 + self.interval_width / 2)
+        sigma = (forecast_df['upper_bound'].to_numpy(dtype=float)
+                 - forecast_df['lower_bound'].to_numpy(dtype=float)) / (2 * z)
+        eps = np.random.default_rng(self.seed).standard_normal((self.n_paths, len(mean)))
+        shocks = eps @ self._shock_transform(len(mean)).T
+        return np.maximum(mean[None, :] + sigma[None, :] * shocks, 0.0)
+
+    def simulate(self, forecast_df, quantity, harvest_date, storage_quality=DEFAULT_STORAGE):
+        """Expected revenue and its spread for each candidate sell day, plus the hold/sell call"""
+        start = time.perf_counter()
+        profile = STORAGE_PROFILES.get(storage_quality, STORAGE_PROFILES[DEFAULT_STORAGE])
+        dates = pd.to_datetime(forecast_df['date'])
+
+        with span('simulate', paths=self.n_paths, days=len(dates)) as s:
+            prices = self.sample_prices(forecast_df)
+
+            age_days = np.clip((dates - pd.to_datetime(harvest_date)).dt.days.to_numpy(), 0, None)
+            weight = quantity * (1 - profile['weight_loss_per_day']) ** age_days
+            holding_cost = profile['holding_cost_per_kg_day'] * quantity * age_days
+            revenue = prices * weight[None, :] - holding_cost[None, :]
+
+            expected = revenue.mean(axis=0)
+            p10, p50, p90 = np.percentile(revenue, [10, 50, 90], axis=0)
+            beats_today = (revenue > revenue[:, :1]).mean(axis=0)
+
+            best = int(np.argmax(expected))
+            gain = float(expected[best] - expected[0])
+            gain_pct = gain / expected[0] * 100 if expected[0] > 0 else 0.0
+            action = 'HOLD' if best > 0 and gain_pct > HOLD_THRESHOLD_PCT and beats_today[best] > 0.5 else 'SELL'
+            s.set(action=action, best_day=best)
+
+        return {
+            'action': action,
+            'dates': [d.strftime('%Y-%m-%d') for d in dates],
+            'expected_revenue': expected.tolist(),
+            'p10': p10.tolist(),
+            'p50': p50.tolist(),
+            'p90': p90.tolist(),
+            'prob_beats_today': beats_today.tolist(),
+            'best_day_index': best,
+            'best_date': dates.iloc[best],
+            'best_price': float(prices[:, best].mean()),
+            'sell_today_revenue': float(expected[0]),
+            'best_revenue': float(expected[best]),
+            'expected_gain': gain,
+            'expected_gain_pct': gain_pct,
+            'prob_best_beats_today': float(beats_today[best]),
+            'weight_loss_kg': float(weight[0] - weight[best]),
+            'extra_holding_cost': float(holding_cost[best] - holding_cost[0]),
+            'storage_quality': storage_quality,
+            'n_paths': self.n_paths,
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+        }
+
+
+def apply_to_recommendation(recommendation, result, quantity):
+    """Replace the argmax-of-yhat call with the simulated one (gains are net of storage, per kg held)"""
+    recommendation = dict(recommendation)
+    recommendation['action'] = result['action']
+    recommendation['optimal_sell_date'] = result['best_date']
+    recommendation['optimal_price_estimate'] = result['best_price']
+    recommendation['potential_gain_rs_per_kg'] = result['expected_gain'] / quantity
+    recommendation['potential_gain_percentage'] = result['expected_gain_pct']
+    recommendation['days_to_wait'] = result['best_day_index']
+    if result['action'] == 'HOLD':
+        recommendation['reason'] = (
+            f"Expected revenue rises by ₹{result['expected_gain']:.0f} ({result['expected_gain_pct']:.1f}%) "
+            f"after storage losses, beating selling today in {result['prob_best_beats_today']:.0%} of simulations"
+        )
+    else:
+        recommendation['reason'] = (
+            f"Holding does not pay after storage losses and costs "
+            f"(best expected gain: {result['expected_gain_pct']:.1f}%)"
+        )
+    return recommendation
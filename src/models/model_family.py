@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import pickle
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from src.models.price_forecaster import CardamomPriceForecaster, MODEL_PATHS
+from src.tracing import span, logger
+
+POOLED = '__all__'  # family member trained on every auctioneer's rows
+
+BUNDLE_MAGIC = b'SPICEHOLD-FAMILY\n'
+
+# Auctioneers with fewer rows than this are served by the pooled model
+MIN_AUCTIONEER_ROWS = 50
+
+
+def family_path(backend='prophet'):
+    """Default bundle location next to the single-model file for the backend"""
+    return MODEL_PATHS[backend].replace('.pkl', '_family.bundle')
+
+
+def _fit_member(data_path, backend, auctioneer):
+    """Pool task: fit one member and return its pickled model (the parent only stores bytes)"""
+    forecaster = CardamomPriceForecaster(data_path, backend=backend,
+                                         auctioneer=None if auctioneer == POOLED else auctioneer)
+    data = forecaster.load_and_prepare_data()
+    forecaster._fit(data)
+    return auctioneer, len(data), pickle.dumps(forecaster.model, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def train_family(data_path, output_path, backend='prophet', workers=None, min_rows=MIN_AUCTIONEER_ROWS):
+    """Fit the pooled model plus one per auctioneer across processes and write them as one bundle"""
+    counts = pd.read_csv(data_path, usecols=['auctioneer', 'avg_price_rs_kg']).dropna()['auctioneer'].value_counts()
+    auctioneers = sorted(counts[counts >= min_rows].index)
+    skipped = sorted(counts[counts < min_rows].index)
+
+    members = {}
+    with span('train_family', backend=backend, members=len(auctioneers) + 1, workers=workers) as s:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_fit_member, data_path, backend, name) for name in [POOLED] + auctioneers]
+            for future in futures:
+                name, rows, blob = future.result()
+                members[name] = {'rows': rows, 'blob': blob}
+                s.event("Fitted %s (%d rows)", name, rows, level=logging.INFO)
+        write_bundle(output_path, backend, members)
+        s.set(skipped=len(skipped))
+    return {'members': {name: m['rows'] for name, m in members.items()}, 'skipped': skipped}
+
+
+def write_bundle(path, backend, members):
+    """Bundle layout: magic, header length, JSON header (index of byte ranges), then the pickles"""
+    index, offset = {}, 0
+    for name, member in members.items():
+        index[name] = {'offset': offset, 'length': len(member['blob']), 'rows': member['rows']}
+        offset += len(member['blob'])
+    header = json.dumps({'backend': backend, 'members': index}).encode('utf-8')
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for member in members.values():
+            f.write(member['blob'])
+    os.replace(tmp_path, path)
+
+
+class ModelFamily:
+    """Read-side of a family bundle: members are unpickled on first use and LRU-evicted.
+
+    Only the JSON header is read up front, so memory is bounded by `max_loaded`
+    models however many auction houses the bundle holds. Unknown or
+    under-sampled auctioneers fall back to the pooled model.
+    """
+
+    def __init__(self, bundle_path, data_path, max_loaded=4):
+        self.bundle_path = bundle_path
+        self.data_path = data_path
+        self.max_loaded = max_loaded
+        self.loaded = OrderedDict()
+        self.lock = threading.Lock()
+        with open(bundle_path, 'rb') as f:
+            if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+                raise ValueError(f"Not a model family bundle: {bundle_path}")
+            header_length, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length))
+        self.backend = header['backend']
+        self.members = header['members']
+        self.data_offset = len(BUNDLE_MAGIC) + 8 + header_length
+
+    @property
+    def auctioneers(self):
+        return sorted(name for name in self.members if name != POOLED)
+
+    def resolve(self, auctioneer):
+        """Member name that serves `auctioneer` (the pooled model when it has none of its own)"""
+        return auctioneer if auctioneer in self.members else POOLED
+
+    def get(self, auctioneer=None):
+        """Forecaster for the auctioneer, loading its model from the bundle if needed"""
+        name = self.resolve(auctioneer)
+        with self.lock:
+            if name in self.loaded:
+                self.loaded.move_to_end(name)
+                return self.loaded[name]
+
+            entry = self.members[name]
+            with span('load_member', auctioneer=name):
+                with open(self.bundle_path, 'rb') as f:
+                    f.seek(self.data_offset + entry['offset'])
+                    model = pickle.loads(f.read(entry['length']))
+            forecaster = CardamomPriceForecaster(self.data_path, backend=self.backend,
+                                                 auctioneer=None if name == POOLED else name)
+            forecaster.model = model
+
+            self.loaded[name] = forecaster
+            while len(self.loaded) > self.max_loaded:
+                evicted, _ = self.loaded.popitem(last=False)
+                logger.debug("Evicted family member %s", evicted)
+            return forecaster
@@ -0,0 +1,55 @@
+import time
+import numpy as np
+import pandas as pd
+from src.models.hold_simulator import HoldSellSimulator
+from src.tracing import span
+
+
+class PoolSaleOptimizer:
+    """Sale timing for many pools of one commodity against a single forecast surface.
+
+    The forecast runs once from `start_date` to the latest deadline. Each pool
+    is a row of a (pools x days) mask over that surface, so the best day, the
+    expected price and the chance of hitting the target are computed for every
+    pool at once. The chance of reaching the target is the share of simulated
+    price paths (HoldSellSimulator) whose running maximum reaches it by the
+    pool's deadline.
+    """
+
+    def __init__(self, n_paths=2000, seed=None):
+        self.simulator = HoldSellSimulator(n_paths=n_paths, seed=seed)
+
+    @staticmethod
+    def horizon(deadlines, start_date):
+        """Days of forecast needed to cover every deadline (at least one)"""
+        start = pd.Timestamp(start_date)
+        return max(1, max((pd.Timestamp(d) - start).days + 1 for d in deadlines))
+
+    def optimize(self, forecast_df, deadlines, target_prices):
+        """Best sale day per pool within its deadline, as a list of dicts in input order"""
+        start = time.perf_counter()
+        dates = pd.to_datetime(forecast_df['date']).reset_index(drop=True)
+        expected = forecast_df['predicted_price'].to_numpy(dtype=float)
+        targets = np.asarray(target_prices, dtype=float)
+
+        with span('optimize_pools', pools=len(targets), days=len(dates)) as s:
+            # Last usable day per pool; pools already past their deadline can only sell today
+            offsets = (pd.to_datetime(pd.Series(deadlines)) - dates.iloc[0]).dt.days.to_numpy()
+            last_day = np.clip(offsets, 0, len(dates) - 1)
+            window = np.arange(len(dates))[None, :] <= last_day[:, None]
+
+            best = np.argmax(np.where(window, expected[None, :], -np.inf), axis=1)
+            best_price = expected[best]
+
+            paths = self.simulator.sample_prices(forecast_df)
+            running_max = np.maximum.accumulate(paths, axis=1)
+            prob_reach = (running_max[:, last_day] >= targets[None, :]).mean(axis=0)
+            s.set(elapsed_ms=round((time.perf_counter() - start) * 1000, 1))
+
+        return [{
+            'optimal_sale_date': dates.iloc[b].date(),
+            'expected_price': float(price),
+            'target_price': float(target),
+            'price_gap_pct': float((price - target) / target * 100) if target > 0 else 0.0,
+            'prob_reach_target': float(prob),
+        } for b, price, target, prob in zip(best, best_price, targets, prob_reach)]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from src.tracing import span
+
+
+class AlertIndex:
+    """Price-above alerts of one commodity, sorted by threshold for batch matching.
+
+    With thresholds sorted, the alerts a day's price satisfies are a prefix of
+    the index, found by binary search. Against the forecast's running maximum
+    those prefix lengths only grow, so each alert's first crossing day is a
+    second binary search. Matching costs O((days + alerts) log n) with no
+    per-alert Python loop.
+    """
+
+    def __init__(self, alert_ids, thresholds, within_days):
+        order = np.argsort(np.asarray(thresholds, dtype=float), kind='stable')
+        self.alert_ids = np.asarray(alert_ids)[order]
+        self.thresholds = np.asarray(thresholds, dtype=float)[order]
+        self.within_days = np.asarray(within_days, dtype=int)[order]
+
+    def __len__(self):
+        return len(self.alert_ids)
+
+    @property
+    def horizon(self):
+        """Forecast days needed to evaluate every alert"""
+        return int(self.within_days.max()) if len(self) else 0
+
+    def match(self, forecast_df):
+        """Triggered alerts as (alert_id, crossing date, forecast price that day) tuples"""
+        if not len(self):
+            return []
+        prices = forecast_df['predicted_price'].to_numpy(dtype=float)
+        dates = pd.to_datetime(forecast_df['date']).reset_index(drop=True)
+
+        with span('match_alerts', alerts=len(self), days=len(prices)) as s:
+            running_max = np.maximum.accumulate(prices)
+            met = np.searchsorted(self.thresholds, running_max, side='right')  # alerts met by day d
+            first_day = np.searchsorted(met, np.arange(len(self)), side='right')
+            hit = first_day < np.minimum(self.within_days, len(prices))
+            s.set(triggered=int(hit.sum()))
+
+        return [(int(alert_id), dates.iloc[day].date(), float(prices[day]))
+                for alert_id, day in zip(self.alert_ids[hit], first_day[hit])]
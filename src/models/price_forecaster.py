@@ -1,37 +1,84 @@
 import pandas as pd
 import numpy as np
-from prophet import Prophet
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import pickle
 import warnings
+import logging
+import time
 from datetime import datetime
+from src.tracing import span, logger
+from src.models.fourier_backend import FourierTrendModel
 warnings.filterwarnings('ignore')
 
+DEFAULT_PROPHET_PARAMS = {
+    'changepoint_prior_scale': 0.05,
+    'seasonality_prior_scale': 10.0
+}
+
+# Interchangeable model engines; both expose fit(df) / predict(df) on ds/y frames
+FORECAST_BACKENDS = ('prophet', 'fourier')
+
+MODEL_PATHS = {
+    'prophet': 'data/models/cardamom_price_model.pkl',
+    'fourier': 'data/models/cardamom_price_model_fourier.pkl'
+}
+
+def model_backend(model):
+    """Backend name of a fitted or loaded model"""
+    return getattr(model, 'backend_name', 'prophet')
+
+# Largest relative parameter change accepted from a warm-started fit before refitting cold
+MAX_WARM_START_DRIFT = 0.5
+
 class CardamomPriceForecaster:
-    def __init__(self, processed_data_path):
+    def __init__(self, processed_data_path, stage_cache=None, backend='prophet', auctioneer=None):
+        if backend not in FORECAST_BACKENDS:
+            raise ValueError(f"Unknown forecasting backend: {backend}")
         self.data_path = processed_data_path
+        self.backend = backend
+        self.auctioneer = auctioneer  # None = every auctioneer's rows as one series
+        self.stage_cache = stage_cache
+        self.data_stage = None
         self.model = None
         self.forecast = None
         self.train_data = None
         self.test_data = None
         self.metrics = {}
+        self.retrain_report = None
     
     def load_and_prepare_data(self):
-        """Load processed data and prepare for Prophet"""
-        print("📊 Loading processed cardamom data...")
-        df = pd.read_csv(self.data_path)
+        """Load processed data and prepare for Prophet (cached when a stage cache is set)"""
+        if self.stage_cache is None:
+            return self._prepare_prophet_frame()
         
-        # Prepare for Prophet (requires 'ds' and 'y' columns)
-        prophet_data = df[['date', 'avg_price_rs_kg']].copy()
-        prophet_data.columns = ['ds', 'y']
-        prophet_data['ds'] = pd.to_datetime(prophet_data['ds'])
-        
-        # Remove missing values
-        prophet_data = prophet_data.dropna()
+        self.data_stage = self.stage_cache.run(
+            'prophet_frame',
+            self._prepare_prophet_frame,
+            depends_on=[self.stage_cache.file_token(self.data_path)],
+            params={'auctioneer': self.auctioneer}
+        )
+        return self.data_stage.value
+    
+    def _prepare_prophet_frame(self):
+        with span('load', path=self.data_path) as s:
+            df = pd.read_csv(self.data_path)
+            if self.auctioneer is not None:
+                df = df[df['auctioneer'] == self.auctioneer]
+                s.set(auctioneer=self.auctioneer)
+            s.set(rows=len(df))
         
-        print(f"✅ Prepared {len(prophet_data)} records for forecasting")
-        print(f"📅 Date range: {prophet_data['ds'].min()} to {prophet_data['ds'].max()}")
-        print(f"💰 Price range: ₹{prophet_data['y'].min():.0f} - ₹{prophet_data['y'].max():.0f} per kg")
+        with span('prepare') as s:
+            # Prepare for Prophet (requires 'ds' and 'y' columns)
+            prophet_data = df[['date', 'avg_price_rs_kg']].copy()
+            prophet_data.columns = ['ds', 'y']
+            prophet_data['ds'] = pd.to_datetime(prophet_data['ds'])
+            
+            # Remove missing values
+            prophet_data = prophet_data.dropna()
+            
+            s.set(rows=len(prophet_data))
+            s.event("Date range: %s to %s", prophet_data['ds'].min(), prophet_data['ds'].max())
+            s.event("Price range: ₹%.0f - ₹%.0f per kg", prophet_data['y'].min(), prophet_data['y'].max())
         
         return prophet_data
     
@@ -41,23 +88,36 @@ class CardamomPriceForecaster:
         train_data = data.iloc[:split_idx]
         test_data = data.iloc[split_idx:]
         
-        print(f"🔄 Data split: {len(train_data)} training, {len(test_data)} testing records")
-        print(f"📅 Training period: {train_data['ds'].min()} to {train_data['ds'].max()}")
-        print(f"📅 Testing period: {test_data['ds'].min()} to {test_data['ds'].max()}")
+        logger.info("Data split: %d training, %d testing records", len(train_data), len(test_data))
+        logger.debug("Training period: %s to %s", train_data['ds'].min(), train_data['ds'].max())
+        logger.debug("Testing period: %s to %s", test_data['ds'].min(), test_data['ds'].max())
         
         self.train_data = train_data
         self.test_data = test_data
         
         return train_data, test_data
     
+    def create_model(self, tuned_params=None):
+        """Create an unfitted model for the configured backend"""
+        if self.backend == 'prophet':
+            return self.create_prophet_model(tuned_params)
+        
+        params = tuned_params if tuned_params is not None else DEFAULT_PROPHET_PARAMS
+        model = FourierTrendModel(
+            changepoint_prior_scale=params['changepoint_prior_scale'],
+            seasonality_prior_scale=params['seasonality_prior_scale'],
+            interval_width=0.80
+        )
+        self.model = model
+        return model
+    
     def create_prophet_model(self, tuned_params=None):
       """Create optimized Prophet model"""
+      from prophet import Prophet  # heavy import, only needed by the Prophet backend
+      
       if tuned_params is None:
           # Your current defaults
-          params = {
-              'changepoint_prior_scale': 0.05,
-              'seasonality_prior_scale': 10.0
-          }
+          params = DEFAULT_PROPHET_PARAMS
       else:
           params = tuned_params
       
@@ -80,62 +140,186 @@ class CardamomPriceForecaster:
     
     def train_model(self):
         """Train Prophet model on cardamom auction data"""
-        print("🎯 Training Prophet model for cardamom price forecasting...")
-        
         # Load and prepare data
         data = self.load_and_prepare_data()
+        
+        fit_params = {'test_size': 0.2, 'backend': self.backend, **DEFAULT_PROPHET_PARAMS}
+        
+        if self.stage_cache is not None and self.stage_cache.dry_run:
+            # Only register the fit stage so the dry-run report covers it
+            self.stage_cache.run('prophet_fit', None, depends_on=[self.data_stage], params=fit_params)
+            return None
+        
         train_data, test_data = self.split_data(data)
         
         # Create and train model
-        model = self.create_prophet_model()
-        model.fit(train_data)
-        
-        print("✅ Model training complete!")
+        if self.stage_cache is None:
+            model = self._fit(train_data)
+        else:
+            # Reuse the fitted model when the prepared frame and params are unchanged
+            fit_stage = self.stage_cache.run(
+                'prophet_fit',
+                lambda: self._fit(train_data),
+                depends_on=[self.data_stage],
+                params=fit_params
+            )
+            model = fit_stage.value
+            self.model = model
         
         # Validate performance
         self.validate_model(test_data)
         
         return model
     
+    def _fit(self, train_data):
+        with span('fit', rows=len(train_data), backend=self.backend):
+            model = self.create_model()
+            model.fit(train_data)
+        return model
+    
+    @staticmethod
+    def warm_start_params(model):
+        """Fitted MAP parameters of `model` in the form Prophet.fit(init=...) expects"""
+        return {
+            'k': model.params['k'][0][0],
+            'm': model.params['m'][0][0],
+            'sigma_obs': model.params['sigma_obs'][0][0],
+            'delta': model.params['delta'][0],
+            'beta': model.params['beta'][0],
+        }
+    
+    @staticmethod
+    def rescale_params(params, previous, train_data):
+        """Map fitted parameters onto the y/t scaling Prophet will use for `train_data`.
+        
+        Prophet fits in units of y / y_scale and t / t_scale; both grow as history
+        is appended, so the previous optimum is only a good starting point once
+        converted (additive model: every term is linear in y_scale, slopes in t_scale).
+        """
+        y_scale = float(train_data['y'].abs().max()) or 1.0
+        t_scale = train_data['ds'].max() - train_data['ds'].min()
+        y_ratio = previous.y_scale / y_scale
+        t_ratio = t_scale / previous.t_scale
+        return {
+            'k': params['k'] * y_ratio * t_ratio,
+            'm': params['m'] * y_ratio,
+            'sigma_obs': params['sigma_obs'] * y_ratio,
+            'delta': params['delta'] * y_ratio * t_ratio,
+            'beta': params['beta'] * y_ratio,
+        }
+    
+    @staticmethod
+    def parameter_drift(old_params, new_params):
+        """Relative change per parameter (L2 norm for the delta/beta vectors)"""
+        drift = {}
+        for name, old in old_params.items():
+            old = np.atleast_1d(old)
+            new = np.atleast_1d(new_params[name])
+            drift[name] = float(np.linalg.norm(new - old) / max(np.linalg.norm(old), 1e-3))
+        return drift
+    
+    def retrain_incremental(self, previous_model_path=None, max_drift=MAX_WARM_START_DRIFT):
+        """Refit on the previous model's history plus rows newer than it, starting from its parameters.
+        
+        The warm fit keeps the previous changepoints, so new changepoints only
+        appear after a cold fit. Falls back to a cold fit when the warm fit fails or
+        any parameter moves by more than `max_drift` (relative). The summary is
+        returned and kept in self.retrain_report.
+        """
+        if previous_model_path is not None:
+            self.load_model(previous_model_path)
+        previous = self.model
+        
+        with span('retrain') as s:
+            history = previous.history[['ds', 'y']]
+            data = self.load_and_prepare_data()
+            # Several auctions share a date, so the last training date may have later rows too
+            last_date = history['ds'].max()
+            seen_on_last = int((history['ds'] == last_date).sum())
+            new_rows = pd.concat([data[data['ds'] == last_date].iloc[seen_on_last:],
+                                  data[data['ds'] > last_date]])
+            report = {'mode': 'unchanged', 'new_rows': len(new_rows), 'rows': len(history),
+                      'fit_seconds': 0.0, 'drift': {}}
+            
+            if not new_rows.empty:
+                train_data = pd.concat([history, new_rows], ignore_index=True)
+                report['rows'] = len(train_data)
+                
+                # Same hyperparameters as the model being updated
+                tuned_params = {
+                    'changepoint_prior_scale': previous.changepoint_prior_scale,
+                    'seasonality_prior_scale': previous.seasonality_prior_scale
+                }
+                start = time.perf_counter()
+                if self.backend != 'prophet':
+                    report['mode'] = 'cold'  # only Prophet fits can warm start; other backends refit from scratch
+                else:
+                    try:
+                        old_params = self.rescale_params(self.warm_start_params(previous), previous, train_data)
+                        with span('fit', rows=len(train_data), warm=True):
+                            model = self.create_prophet_model(tuned_params)
+                            # Keep the previous changepoints so `delta` lines up with the init
+                            model.changepoints = previous.changepoints
+                            model.specified_changepoints = True
+                            model.fit(train_data, init=old_params)
+                        drift = self.parameter_drift(old_params, self.warm_start_params(model))
+                        report['mode'] = 'warm'
+                        report['drift'] = drift
+                        if max(drift.values()) > max_drift:
+                            s.event("Parameter drift %.2f exceeds %.2f - refitting cold",
+                                    max(drift.values()), max_drift, level=logging.WARNING)
+                            report['mode'] = 'cold'
+                    except Exception as e:
+                        s.event("Warm start failed (%s) - refitting cold", e, level=logging.WARNING)
+                        report['mode'] = 'cold'
+                
+                if report['mode'] == 'cold':
+                    with span('fit', rows=len(train_data), warm=False):
+                        model = self.create_model(tuned_params)
+                        model.fit(train_data)
+                report['fit_seconds'] = time.perf_counter() - start
+                self.model = model
+            
+            s.set(mode=report['mode'], new_rows=report['new_rows'], rows=report['rows'],
+                  fit_seconds=round(report['fit_seconds'], 2))
+        
+        self.retrain_report = report
+        return report
+    
     def validate_model(self, test_data):
         """Validate model performance on holdout test data"""
-        print("📈 Validating model performance...")
-        
-        # Make predictions on test set
-        test_forecast = self.model.predict(test_data[['ds']])
-        
-        # Calculate performance metrics
-        y_true = test_data['y'].values
-        y_pred = test_forecast['yhat'].values
-        
-        mae = mean_absolute_error(y_true, y_pred)
-        rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-        mape = np.mean(np.abs((y_true - y_pred) / y_true)) * 100
-        r2 = r2_score(y_true, y_pred)
-        
-        # Store metrics
-        self.metrics = {
-            'mae': mae,
-            'rmse': rmse,
-            'mape': mape,
-            'r2': r2
-        }
-        print(f"   R²: {r2:.3f}")
-        print(f"📊 Model Performance Metrics:")
-        print(f"   MAE (Mean Absolute Error): ₹{mae:.2f}/kg")
-        print(f"   RMSE (Root Mean Square Error): ₹{rmse:.2f}/kg")
-        print(f"   MAPE (Mean Absolute % Error): {mape:.2f}%")
-        
-        # Performance interpretation
-        avg_price = y_true.mean()
-        mae_percent = (mae / avg_price) * 100
-        
-        if mae_percent < 5:
-            print("   🎯 Excellent prediction accuracy!")
-        elif mae_percent < 10:
-            print("   ✅ Good prediction accuracy")
-        else:
-            print("   ⚠️  Moderate prediction accuracy - consider model tuning")
+        with span('validate', rows=len(test_data)) as s:
+            # Make predictions on test set
+            test_forecast = self.model.predict(test_data[['ds']])
+            
+            # Calculate performance metrics
+            y_true = test_data['y'].values
+            y_pred = test_forecast['yhat'].values
+            
+            mae = mean_absolute_error(y_true, y_pred)
+            rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+            mape = np.mean(np.abs((y_true - y_pred) / y_true)) * 100
+            r2 = r2_score(y_true, y_pred)
+            
+            # Store metrics
+            self.metrics = {
+                'mae': mae,
+                'rmse': rmse,
+                'mape': mape,
+                'r2': r2
+            }
+            s.set(mae=round(mae, 2), rmse=round(rmse, 2), mape=round(mape, 2), r2=round(r2, 3))
+            
+            # Performance interpretation
+            avg_price = y_true.mean()
+            mae_percent = (mae / avg_price) * 100
+            
+            if mae_percent < 5:
+                s.event("Excellent prediction accuracy!", level=logging.INFO)
+            elif mae_percent < 10:
+                s.event("Good prediction accuracy", level=logging.INFO)
+            else:
+                s.event("Moderate prediction accuracy - consider model tuning", level=logging.WARNING)
         results_df = pd.DataFrame({
             'date': test_data['ds'],
             'actual_price': y_true,
@@ -147,39 +331,39 @@ class CardamomPriceForecaster:
     
     def forecast_prices(self, days_ahead=30, start_date=None):
       """Generate future price forecasts starting from a specific date"""
-      print(f"🔮 Generating {days_ahead}-day price forecast...")
-      
       # Use today's date if no start date provided
       if start_date is None:
           start_date = pd.to_datetime(datetime.now().date())
       else:
           start_date = pd.to_datetime(start_date)
-      print(f"🗓️ DEBUG: Forecasting from {start_date.strftime('%Y-%m-%d')}")
-      
-      # Create future dataframe starting from specified date
-      future_dates = pd.date_range(start=start_date, periods=days_ahead, freq='D')
-      future = pd.DataFrame({'ds': future_dates})
-
-      print(f"🗓️ DEBUG: First forecast date: {future_dates[0].strftime('%Y-%m-%d')}")
-      print(f"🗓️ DEBUG: Last forecast date: {future_dates[-1].strftime('%Y-%m-%d')}")
-      
-      # Generate forecast
-      forecast = self.model.predict(future)
       
-      # Extract predictions
-      future_forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
-      future_forecast.columns = ['date', 'predicted_price', 'lower_bound', 'upper_bound']
-      
-      self.forecast = future_forecast
-      
-      print(f"✅ Price forecast generated for {start_date.strftime('%Y-%m-%d')} to {future_dates[-1].strftime('%Y-%m-%d')}")
-      print(f"💰 Predicted price range: ₹{future_forecast['lower_bound'].min():.0f} - ₹{future_forecast['upper_bound'].max():.0f}/kg")
+      with span('predict', days_ahead=days_ahead, start=start_date.strftime('%Y-%m-%d')) as s:
+          # Create future dataframe starting from specified date
+          future_dates = pd.date_range(start=start_date, periods=days_ahead, freq='D')
+          future = pd.DataFrame({'ds': future_dates})
+          
+          # Generate forecast
+          forecast = self.model.predict(future)
+          
+          # Extract predictions
+          future_forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].copy()
+          future_forecast.columns = ['date', 'predicted_price', 'lower_bound', 'upper_bound']
+          
+          self.forecast = future_forecast
+          s.set(rows=len(future_forecast))
       
       return future_forecast
 
     
     def get_sell_recommendation(self, current_price=None, days_ahead=30, start_date=None):
         """Generate AI-powered sell/hold recommendation"""
+        with span('recommend', days_ahead=days_ahead) as s:
+            recommendation = self._recommend(current_price, days_ahead, start_date)
+            s.set(action=recommendation['action'],
+                  gain_pct=round(float(recommendation['potential_gain_percentage']), 2))
+        return recommendation
+    
+    def _recommend(self, current_price, days_ahead, start_date):
         self.forecast_prices(days_ahead, start_date)  # ✅ Pass start_date
     
         forecast_df = self.forecast.copy()
@@ -222,12 +406,13 @@ class CardamomPriceForecaster:
     
     def save_model(self, model_path):
         """Save trained model for production use"""
-        with open(model_path, 'wb') as f:
-            pickle.dump(self.model, f)
-        print(f"💾 Model saved to: {model_path}")
+        with span('save_model', path=model_path):
+            with open(model_path, 'wb') as f:
+                pickle.dump(self.model, f)
     
     def load_model(self, model_path):
         """Load pre-trained model"""
-        with open(model_path, 'rb') as f:
-            self.model = pickle.load(f)
-        print(f"📁 Model loaded from: {model_path}")
+        with span('load_model', path=model_path):
+            with open(model_path, 'rb') as f:
+                self.model = pickle.load(f)
+        self.backend = model_backend(self.model)
@@ -0,0 +1,174 @@
+# src/pipeline_cache.py
+
+import hashlib
+import json
+import os
+import pickle
+import pandas as pd
+
+DEFAULT_CACHE_DIR = "data/cache"
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def hash_dataframe(df):
+    """Content hash of a DataFrame (values, index, column names and dtypes)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(json.dumps([str(t) for t in df.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Content hash of a file on disk"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StageResult:
+    """Handle to a pipeline stage output; the value is only loaded when accessed"""
+
+    def __init__(self, cache, name, key, hit, value=None):
+        self.cache = cache
+        self.name = name
+        self.key = key
+        self.hit = hit
+        self._value = value
+        self._loaded = value is not None
+
+    @property
+    def value(self):
+        if not self._loaded and self.hit and not self.cache.dry_run:
+            self._value = self.cache.load(self.name, self.key)
+            self._loaded = True
+        return self._value
+
+
+class StageCache:
+    """On-disk cache of pipeline stage outputs keyed on a hash of inputs and parameters.
+
+    A stage's key is derived from its name, its parameters and the tokens of
+    everything it depends on: raw input files are hashed by content and
+    upstream stages contribute their own key. Keys can therefore be computed
+    without running anything, which is what the dry-run mode reports on.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_CACHE_BYTES,
+                 dry_run=False, enabled=True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.dry_run = dry_run
+        self.enabled = enabled
+        self.plan = []
+        self._file_tokens = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def file_token(self, path):
+        """Dependency token for an input file (content hash, memoized per run)"""
+        if path not in self._file_tokens:
+            self._file_tokens[path] = 'file:' + hash_file(path)
+        return self._file_tokens[path]
+
+    def stage_key(self, name, depends_on=(), params=None):
+        parts = [name, json.dumps(params or {}, sort_keys=True, default=str)]
+        for dep in depends_on:
+            if isinstance(dep, StageResult):
+                parts.append(f'stage:{dep.name}:{dep.key}')
+            elif isinstance(dep, pd.DataFrame):
+                parts.append('frame:' + hash_dataframe(dep))
+            else:
+                parts.append(str(dep))
+        return hashlib.sha256('\n'.join(parts).encode()).hexdigest()[:32]
+
+    def _path(self, name, key):
+        return os.path.join(self.cache_dir, f'{name}-{key}.pkl')
+
+    def contains(self, name, key):
+        return os.path.exists(self._path(name, key))
+
+    def load(self, name, key):
+        path = self._path(name, key)
+        with open(path, 'rb') as f:
+            value = pickle.load(f)
+        os.utime(path)  # mark as recently used for eviction
+        return value
+
+    def store(self, name, key, value):
+        path = self._path(name, key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def run(self, name, compute, depends_on=(), params=None):
+        """Return the cached output of a stage, computing and storing it on a miss"""
+        key = self.stage_key(name, depends_on, params)
+        hit = self.enabled and self.contains(name, key)
+        self.plan.append({'stage': name, 'key': key, 'status': 'cached' if hit else 'recompute'})
+
+        if hit or self.dry_run:
+            return StageResult(self, name, key, hit)
+
+        value = compute()
+        if self.enabled:
+            self.store(name, key, value)
+        return StageResult(self, name, key, hit=False, value=value)
+
+    def entries(self):
+        """Cache files as (path, size, last_used) sorted from least to most recently used"""
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.pkl'):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            stat = os.stat(path)
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed.append(path)
+        return removed
+
+    def report(self):
+        """Summary of the stages seen in this run and whether each was cached"""
+        lines = []
+        for entry in self.plan:
+            marker = '✅' if entry['status'] == 'cached' else '🔁'
+            lines.append(f"   {marker} {entry['stage']}: {entry['status']} ({entry['key'][:12]})")
+        return '\n'.join(lines)
+
+
+def add_cache_arguments(parser):
+    """Register the shared --dry-run / --no-cache / --cache-dir flags on a script parser"""
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report which pipeline stages would be recomputed and exit')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recompute every stage without reading or writing the cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_CACHE_BYTES // (1024 * 1024))
+    return parser
+
+
+def cache_from_args(args):
+    return StageCache(
+        cache_dir=args.cache_dir,
+        max_bytes=args.cache_max_mb * 1024 * 1024,
+        dry_run=args.dry_run,
+        enabled=not args.no_cache
+    )
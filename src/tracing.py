@@ -0,0 +1,129 @@
+# src/tracing.py
+
+import atexit
+import contextvars
+import itertools
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger('spicehold.trace')
+logger.addHandler(logging.NullHandler())
+
+_current_span = contextvars.ContextVar('spicehold_current_span', default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """A named, timed unit of work with attributes such as row counts"""
+
+    def __init__(self, tracer, name, parent, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.id = next(_span_ids)
+        self.parent_id = parent.id if parent is not None else None
+        self.attrs = attrs
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def event(self, message, *args, level=logging.DEBUG):
+        """Log a message attributed to this span"""
+        if logger.isEnabledFor(level):
+            logger.log(level, f"[{self.name}] {message}", *args)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start_time,
+            'duration_ms': self.duration_ms,
+            'attrs': self.attrs,
+        }
+
+
+class Tracer:
+    """Lightweight span tracer that reports to `logging` and optionally keeps spans for JSON export.
+
+    Spans are logged at `level` (INFO by default) and span events at DEBUG unless
+    stated otherwise; nothing is emitted unless the spicehold.trace logger is
+    configured to show it. When an export path is set, finished spans are also
+    kept in a bounded buffer for export_json().
+    """
+
+    def __init__(self, level=logging.INFO, export_path=None, max_spans=10000):
+        self.level = level
+        self.export_path = export_path
+        self.spans = deque(maxlen=max_spans)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        parent = _current_span.get()
+        span = Span(self, name, parent, attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_ms = (time.perf_counter() - span._start) * 1000
+            if self.export_path:
+                self.spans.append(span.to_dict())
+            if logger.isEnabledFor(self.level):
+                details = ' '.join(f'{k}={v}' for k, v in span.attrs.items())
+                logger.log(self.level, "%s %.1f ms %s", name, span.duration_ms, details)
+
+    def export_json(self, path=None):
+        """Write the buffered spans as a JSON array; returns the number of spans written"""
+        path = path or self.export_path
+        spans = list(self.spans)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(spans, f, default=str, indent=1)
+        return len(spans)
+
+
+tracer = Tracer()
+
+
+def span(name, **attrs):
+    """Open a span on the shared tracer"""
+    return tracer.span(name, **attrs)
+
+
+def configure_tracing(level=None, span_level=None, export_path=None, serving=False):
+    """Configure trace output.
+
+    Scripts call this with level=logging.INFO to see progress on the console.
+    In serving mode the default is WARNING (silent) unless SPICEHOLD_TRACE_LEVEL
+    is set. export_path (or SPICEHOLD_TRACE_EXPORT) buffers spans and writes
+    them as JSON at exit.
+    """
+    if level is None:
+        level = os.environ.get('SPICEHOLD_TRACE_LEVEL', 'WARNING' if serving else 'INFO')
+    logger.setLevel(level)
+    if span_level is not None:
+        tracer.level = span_level
+
+    if not serving and not any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+
+    export_path = export_path or os.environ.get('SPICEHOLD_TRACE_EXPORT')
+    if export_path and not tracer.export_path:
+        tracer.export_path = export_path
+        atexit.register(tracer.export_json)
+    return tracer
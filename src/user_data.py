@@ -3,51 +3,94 @@ import pandas as pd
 import os
 from datetime import datetime, timedelta
 import streamlit as st
+from src.log_store import LogTable
 
-# File paths
+# Legacy CSV file paths (imported into the logs on first use)
 USERS_FILE = "data/users.csv"
-POOLS_FILE = "data/pools.csv" 
+POOLS_FILE = "data/pools.csv"
 MEMBERSHIPS_FILE = "data/pool_memberships.csv"
 FORECASTS_FILE = "data/user_forecasts.csv"
 BUYERS_FILE = "data/buyers.csv"
 
+# Append-only log paths
+USERS_LOG = "data/users.log"
+POOLS_LOG = "data/pools.log"
+MEMBERSHIPS_LOG = "data/pool_memberships.log"
+FORECASTS_LOG = "data/user_forecasts.log"
+
+USER_COLUMNS = ['username', 'name', 'email', 'location', 'phone', 'farm_size', 'created_date']
+POOL_COLUMNS = ['pool_id', 'pool_name', 'target_quantity', 'current_quantity', 'target_price', 'status', 'deadline', 'created_by', 'created_date']
+MEMBERSHIP_COLUMNS = ['username', 'pool_id', 'quantity_contributed', 'join_date', 'status']
+FORECAST_COLUMNS = ['username', 'forecast_date', 'current_price', 'optimal_price', 'action', 'potential_gain', 'created_at']
+
+_tables = {}
+
+def _table(name):
+    """Open (once per process) the log-backed table for users, pools, memberships or forecasts"""
+    if name not in _tables:
+        if name == 'users':
+            _tables[name] = LogTable(USERS_LOG, 'username', USER_COLUMNS, legacy_csv=USERS_FILE)
+        elif name == 'pools':
+            _tables[name] = LogTable(POOLS_LOG, 'pool_id', POOL_COLUMNS,
+                                     index_fields=['status'], legacy_csv=POOLS_FILE)
+        elif name == 'memberships':
+            _tables[name] = LogTable(MEMBERSHIPS_LOG, 'membership_key', MEMBERSHIP_COLUMNS,
+                                     index_fields=['username', 'pool_id'])
+            if not _tables[name].rows and os.path.exists(MEMBERSHIPS_FILE):
+                _import_legacy_memberships(_tables[name])
+        elif name == 'forecasts':
+            _tables[name] = LogTable(FORECASTS_LOG, 'forecast_id', FORECAST_COLUMNS,
+                                     index_fields=['username'])
+            if not _tables[name].rows and os.path.exists(FORECASTS_FILE):
+                _import_legacy_forecasts(_tables[name])
+    return _tables[name]
+
+def _membership_key(username, pool_id):
+    return f"{username}:{pool_id}"
+
+def _import_legacy_memberships(table):
+    """Memberships and forecasts have no natural single key in the old CSVs; derive one"""
+    with table.transaction():
+        if table.rows:
+            return  # another process imported first
+        for row in pd.read_csv(MEMBERSHIPS_FILE).to_dict(orient='records'):
+            row['pool_id'] = int(row['pool_id'])
+            row['membership_key'] = _membership_key(row['username'], row['pool_id'])
+            table.put(row)
+
+def _import_legacy_forecasts(table):
+    with table.transaction():
+        if table.rows:
+            return
+        for forecast_id, row in enumerate(pd.read_csv(FORECASTS_FILE).to_dict(orient='records'), start=1):
+            row['forecast_id'] = forecast_id
+            table.put(row)
+
 def ensure_data_files():
     """Ensure all data files exist"""
-    files_to_check = [USERS_FILE, POOLS_FILE, MEMBERSHIPS_FILE, FORECASTS_FILE]
-    for file_path in files_to_check:
-        if not os.path.exists(file_path):
-            # Create empty DataFrame with proper columns
-            if 'users.csv' in file_path:
-                pd.DataFrame(columns=['username', 'name', 'email', 'location', 'phone', 'farm_size', 'created_date']).to_csv(file_path, index=False)
-            elif 'pools.csv' in file_path:
-                pd.DataFrame(columns=['pool_id', 'pool_name', 'target_quantity', 'current_quantity', 'target_price', 'status', 'deadline', 'created_by', 'created_date']).to_csv(file_path, index=False)
-            elif 'memberships.csv' in file_path:
-                pd.DataFrame(columns=['username', 'pool_id', 'quantity_contributed', 'join_date', 'status']).to_csv(file_path, index=False)
-            elif 'forecasts.csv' in file_path:
-                pd.DataFrame(columns=['username', 'forecast_date', 'current_price', 'optimal_price', 'action', 'potential_gain', 'created_at']).to_csv(file_path, index=False)
+    for name in ['users', 'pools', 'memberships', 'forecasts']:
+        _table(name)
 
 def get_user_profile(username):
     """Get user profile information"""
     try:
-        users_df = pd.read_csv(USERS_FILE)
-        user_data = users_df[users_df['username'] == username]
-        if not user_data.empty:
-            return user_data.iloc[0].to_dict()
-        return None
+        return _table('users').get(username)
     except:
         return None
 
 def get_user_pools(username):
     """Get pools user has joined"""
     try:
-        memberships_df = pd.read_csv(MEMBERSHIPS_FILE)
-        pools_df = pd.read_csv(POOLS_FILE)
-        
-        user_memberships = memberships_df[memberships_df['username'] == username]
-        if user_memberships.empty:
+        memberships = _table('memberships').lookup('username', username)
+        if not memberships:
             return pd.DataFrame()
-            
+
+        pools_table = _table('pools')
+        pools = [pools_table.get(m['pool_id']) for m in memberships]
+
         # Join with pools data
+        user_memberships = _table('memberships').to_frame(memberships)
+        pools_df = pools_table.to_frame([p for p in pools if p is not None])
         user_pools = user_memberships.merge(pools_df, on='pool_id', how='left')
         return user_pools
     except:
@@ -56,89 +99,88 @@ def get_user_pools(username):
 def get_all_active_pools():
     """Get all active pools"""
     try:
-        pools_df = pd.read_csv(POOLS_FILE)
-        return pools_df[pools_df['status'] == 'active']
+        pools_table = _table('pools')
+        return pools_table.to_frame(pools_table.lookup('status', 'active'))
     except:
         return pd.DataFrame()
 
 def join_pool(username, pool_id, quantity):
     """User joins a pool"""
     try:
-        # Check if user already in pool
-        memberships_df = pd.read_csv(MEMBERSHIPS_FILE)
-        existing = memberships_df[(memberships_df['username'] == username) & (memberships_df['pool_id'] == pool_id)]
-        
-        if not existing.empty:
-            return False, "You're already in this pool!"
-        
-        # Add membership
-        new_membership = {
-            'username': username,
-            'pool_id': pool_id,
-            'quantity_contributed': quantity,
-            'join_date': datetime.now().strftime('%Y-%m-%d'),
-            'status': 'active'
-        }
-        
-        memberships_df = pd.concat([memberships_df, pd.DataFrame([new_membership])], ignore_index=True)
-        memberships_df.to_csv(MEMBERSHIPS_FILE, index=False)
-        
-        # Update pool current quantity
-        pools_df = pd.read_csv(POOLS_FILE)
-        pools_df.loc[pools_df['pool_id'] == pool_id, 'current_quantity'] += quantity
-        pools_df.to_csv(POOLS_FILE, index=False)
-        
+        pool_id = int(pool_id)
+        memberships = _table('memberships')
+        pools = _table('pools')
+        key = _membership_key(username, pool_id)
+
+        # Lock memberships, then pools, so the duplicate check and both writes are atomic
+        with memberships.transaction(), pools.transaction():
+            # Check if user already in pool
+            if memberships.get(key) is not None:
+                return False, "You're already in this pool!"
+
+            # Add membership
+            memberships.put({
+                'membership_key': key,
+                'username': username,
+                'pool_id': pool_id,
+                'quantity_contributed': quantity,
+                'join_date': datetime.now().strftime('%Y-%m-%d'),
+                'status': 'active'
+            })
+
+            # Update pool current quantity
+            pools.increment(pool_id, 'current_quantity', quantity)
+
         return True, "Successfully joined pool!"
-    
+
     except Exception as e:
         return False, f"Error joining pool: {str(e)}"
 
 def create_pool(username, pool_name, target_quantity, target_price, deadline):
     """Create a new pool"""
     try:
-        pools_df = pd.read_csv(POOLS_FILE)
-        
-        # Get next pool ID
-        next_id = pools_df['pool_id'].max() + 1 if not pools_df.empty else 1
-        
-        new_pool = {
-            'pool_id': next_id,
-            'pool_name': pool_name,
-            'target_quantity': target_quantity,
-            'current_quantity': 0,
-            'target_price': target_price,
-            'status': 'active',
-            'deadline': deadline,
-            'created_by': username,
-            'created_date': datetime.now().strftime('%Y-%m-%d')
-        }
-        
-        pools_df = pd.concat([pools_df, pd.DataFrame([new_pool])], ignore_index=True)
-        pools_df.to_csv(POOLS_FILE, index=False)
-        
+        pools = _table('pools')
+
+        with pools.transaction():
+            # Get next pool ID
+            last_id = pools.max_key()
+            next_id = last_id + 1 if last_id is not None else 1
+
+            pools.put({
+                'pool_id': next_id,
+                'pool_name': pool_name,
+                'target_quantity': target_quantity,
+                'current_quantity': 0,
+                'target_price': target_price,
+                'status': 'active',
+                'deadline': deadline,
+                'created_by': username,
+                'created_date': datetime.now().strftime('%Y-%m-%d')
+            })
+
         return True, next_id, "Pool created successfully!"
-    
+
     except Exception as e:
         return False, None, f"Error creating pool: {str(e)}"
 
 def save_user_forecast(username, forecast_data):
     """Save user's price forecast"""
     try:
-        forecasts_df = pd.read_csv(FORECASTS_FILE)
-        
-        forecast_record = {
-            'username': username,
-            'forecast_date': forecast_data['optimal_sell_date'],
-            'current_price': forecast_data['current_price_estimate'],
-            'optimal_price': forecast_data['optimal_price_estimate'],
-            'action': forecast_data['action'],
-            'potential_gain': forecast_data['potential_gain_rs_per_kg'],
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        forecasts_df = pd.concat([forecasts_df, pd.DataFrame([forecast_record])], ignore_index=True)
-        forecasts_df.to_csv(FORECASTS_FILE, index=False)
-        
+        forecasts = _table('forecasts')
+
+        with forecasts.transaction():
+            last_id = forecasts.max_key()
+            forecasts.put({
+                'forecast_id': last_id + 1 if last_id is not None else 1,
+                'username': username,
+                'forecast_date': forecast_data['optimal_sell_date'],
+                'current_price': forecast_data['current_price_estimate'],
+                'optimal_price': forecast_data['optimal_price_estimate'],
+                'action': forecast_data['action'],
+                'potential_gain': forecast_data['potential_gain_rs_per_kg'],
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
+
         return True
     except Exception as e:
         st.error(f"Error saving forecast: {str(e)}")
@@ -147,8 +189,8 @@ def save_user_forecast(username, forecast_data):
 def get_user_forecasts(username):
     """Get user's forecast history"""
     try:
-        forecasts_df = pd.read_csv(FORECASTS_FILE)
-        return forecasts_df[forecasts_df['username'] == username]
+        forecasts = _table('forecasts')
+        return forecasts.to_frame(forecasts.lookup('username', username))
     except:
         return pd.DataFrame()
 
@@ -157,7 +199,7 @@ def get_user_dashboard_stats(username):
     try:
         user_pools = get_user_pools(username)
         user_forecasts = get_user_forecasts(username)
-        
+
         stats = {
             'pools_joined': len(user_pools),
             'active_pools': len(user_pools[user_pools['status'] == 'active']),
@@ -165,12 +207,12 @@ def get_user_dashboard_stats(username):
             'forecasts_made': len(user_forecasts),
             'avg_potential_gain': user_forecasts['potential_gain'].mean() if not user_forecasts.empty else 0
         }
-        
+
         return stats
     except:
         return {
             'pools_joined': 0,
-            'active_pools': 0, 
+            'active_pools': 0,
             'total_quantity': 0,
             'forecasts_made': 0,
             'avg_potential_gain': 0
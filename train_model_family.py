@@ -0,0 +1,28 @@
+from src.models.model_family import train_family, family_path, MIN_AUCTIONEER_ROWS
+from src.models.price_forecaster import FORECAST_BACKENDS
+from src.tracing import configure_tracing
+import argparse
+import os
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the pooled model plus one model per auctioneer')
+    parser.add_argument('--backend', choices=FORECAST_BACKENDS, default='prophet')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='fitting processes (default: one per CPU)')
+    parser.add_argument('--min-rows', type=int, default=MIN_AUCTIONEER_ROWS,
+                        help='auctioneers with fewer rows are served by the pooled model')
+    parser.add_argument('--output', default=None, help='bundle path (default: next to the backend model)')
+    args = parser.parse_args()
+    configure_tracing()
+
+    output = args.output or family_path(args.backend)
+    result = train_family('data/processed/clean_auction_data.csv', output, backend=args.backend,
+                          workers=args.workers or os.cpu_count(), min_rows=args.min_rows)
+
+    print(f"\n✅ Model family saved to: {output}")
+    print(f"   Members: {len(result['members'])} (including pooled)")
+    if result['skipped']:
+        print(f"   Pooled fallback for {len(result['skipped'])} small auctioneers: {', '.join(result['skipped'])}")
+
+if __name__ == "__main__":
+    main()
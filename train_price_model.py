@@ -1,12 +1,40 @@
-from src.models.price_forecaster import CardamomPriceForecaster
+from src.models.price_forecaster import CardamomPriceForecaster, FORECAST_BACKENDS
+from src.commodities import CommodityRegistry, DEFAULT_COMMODITY
+from src.pipeline_cache import add_cache_arguments, cache_from_args
+import argparse
 import os
+from src.tracing import configure_tracing
 
 def main():
+    parser = add_cache_arguments(argparse.ArgumentParser(description='Train the cardamom price model'))
+    parser.add_argument('--warm-start', action='store_true',
+                        help='update the saved model with new data, starting from its parameters')
+    parser.add_argument('--backend', choices=FORECAST_BACKENDS, default='prophet',
+                        help='forecasting engine to train (default: prophet)')
+    registry = CommodityRegistry()
+    parser.add_argument('--commodity', choices=list(registry.commodities), default=DEFAULT_COMMODITY)
+    args = parser.parse_args()
+    configure_tracing()
+    cache = cache_from_args(args)
+    
     # Initialize forecaster
-    forecaster = CardamomPriceForecaster('data/processed/clean_auction_data.csv')
+    commodity = registry.get(args.commodity)
+    forecaster = CardamomPriceForecaster(commodity.processed_data_path, stage_cache=cache, backend=args.backend)
+    model_path = commodity.model_path(args.backend)
+    
+    if args.warm_start and os.path.exists(model_path):
+        # Daily update: previous history plus new rows, cold refit only on large drift
+        report = forecaster.retrain_incremental(model_path)
+        print(f"🔁 Retrain mode: {report['mode']} ({report['new_rows']} new rows, "
+              f"fit {report['fit_seconds']:.2f}s)")
+    else:
+        # Train model (prepared frame and fit are reused when inputs are unchanged)
+        model = forecaster.train_model()
     
-    # Train model
-    model = forecaster.train_model()
+    if args.dry_run:
+        print("🧪 Dry run - pipeline stages:")
+        print(cache.report())
+        return
     
     # Generate 30-day forecast
     forecast = forecaster.forecast_prices(days_ahead=30)
@@ -27,7 +55,7 @@ def main():
     os.makedirs('data/models', exist_ok=True)
     
     # Save model (now will work)
-    forecaster.save_model('data/models/cardamom_price_model.pkl')
+    forecaster.save_model(model_path)
     
     print(f"\n✅ SpiceHold Price Forecasting Model Ready!")
     